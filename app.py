@@ -1,14 +1,33 @@
+import time
+IMPORT_STARTED = time.perf_counter()
+
 from flask import Flask
 from flask_cors import CORS
 from config.settings import Config
-from services.database_service import init_db
+from services.database_service import init_db, migrate_db, sync_db, maintenance_lock, has_data_tables
+from services.index_service import load_search_indexes
+from services.suggest_service import load_suggest_indexes
 from routes.main_routes import main_bp
 from routes.api_routes import api_bp
 from routes.preview_routes import preview_bp
+from routes.job_routes import job_bp
+from routes.metrics_routes import metrics_bp
+from services.job_service import resume_jobs
 import os
 
+IMPORT_SECONDS = time.perf_counter() - IMPORT_STARTED
+
 def create_app():
     """Application factory pattern"""
+    phases = {"imports": IMPORT_SECONDS}
+    phase_started = time.perf_counter()
+    
+    def end_phase(name):
+        nonlocal phase_started
+        now = time.perf_counter()
+        phases[name] = now - phase_started
+        phase_started = now
+    
     app = Flask(__name__)
     CORS(app)  # Enable CORS for OpenRefine
     
@@ -18,18 +37,47 @@ def create_app():
     # Ensure `data` directory exists
     os.makedirs("data", exist_ok=True)
 
-    # Initialize database only if it does not exist
-    db_path = os.path.join("data", "museum_reconciliation.db")
-    if not os.path.exists(db_path):
-        print(f"Database not found. Creating new DB at {db_path}...")
-        init_db()
-    else:
-        print(f"Using existing database at {db_path}")
+    # Initialize database only if it does not exist or holds no data tables (e.g. an empty file);
+    # workers starting together take turns
+    db_path = Config.DATABASE_PATH
+    with maintenance_lock():
+        if not has_data_tables(db_path):
+            if not Config.BUILD_DB_ON_STARTUP:
+                raise FileNotFoundError(f"Database {db_path} not found; build it with `python manage.py build`")
+            print(f"Database not found or empty. Creating new DB at {db_path}...")
+            init_db()
+        else:
+            print(f"Using existing database at {db_path}")
+            # Add normalized search columns to databases built by older versions
+            migrate_db()
+            # Apply edits to the CSV files incrementally instead of rebuilding
+            if Config.SYNC_ON_STARTUP:
+                sync_db()
+    end_phase("database")
+    
+    # Build the in-memory candidate and suggest indexes once at startup
+    load_search_indexes()
+    end_phase("search_indexes")
+    load_suggest_indexes()
+    end_phase("suggest_indexes")
     
     # Register blueprints
     app.register_blueprint(main_bp)
     app.register_blueprint(api_bp)
     app.register_blueprint(preview_bp)
+    app.register_blueprint(metrics_bp)
+    
+    # Asynchronous jobs for very large query sets; pick up any a previous run left unfinished
+    if Config.JOBS_ENABLED:
+        app.register_blueprint(job_bp)
+        resume_jobs()
+    end_phase("routes_and_jobs")
+    
+    report = {name: round(seconds, 3) for name, seconds in phases.items()}
+    report["total"] = round(sum(phases.values()), 3)
+    app.config['STARTUP_REPORT'] = report
+    print(f"Started in {report['total']}s (" +
+          ", ".join(f"{name} {seconds}s" for name, seconds in report.items() if name != "total") + ")")
     
     return app
 
@@ -0,0 +1,182 @@
+"""ASGI entry point: serve the app with an asyncio server, e.g. `uvicorn asgi:app`
+
+Flask views stay synchronous; each request runs on a thread pool while the event loop keeps
+accepting connections. Requests that may run a long fuzzy search (reconciliation batches and
+data extension) get their own bounded pool, so metadata, suggest, previews and metrics never
+queue behind them, and searches beyond the queue limit are turned away with 503.
+"""
+import io
+import sys
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Optional
+from config.settings import Config
+from app import create_app
+
+# (method, path) of the requests served from the search pool
+SEARCH_ROUTES = {
+    ('POST', '/'),
+    ('GET', '/extend'),
+    ('POST', '/extend')
+}
+
+# Response chunks buffered between a pool thread and the event loop
+STREAM_QUEUE_CHUNKS = 8
+
+# Ends the queue in place of None when the app raised
+FAILED = object()
+
+# Answer to a search request arriving while the search pool's queue is full
+BUSY_RESPONSE = (503, [(b'content-type', b'application/json'), (b'retry-after', b'1')],
+                 b'{"error": "Too many reconciliation requests in progress, retry shortly"}')
+
+class ReconciliationASGI:
+    """ASGI application running a WSGI app on a request pool and a bounded search pool"""
+
+    def __init__(self, wsgi_app, request_threads: Optional[int] = None, search_threads: Optional[int] = None,
+                 max_pending_searches: Optional[int] = None):
+        self.wsgi_app = wsgi_app
+        self.request_executor = ThreadPoolExecutor(request_threads or Config.ASGI_REQUEST_THREADS,
+                                                   thread_name_prefix='asgi-request')
+        self.search_executor = ThreadPoolExecutor(search_threads or Config.ASGI_SEARCH_THREADS,
+                                                  thread_name_prefix='asgi-search')
+        self.max_pending_searches = max_pending_searches or Config.ASGI_MAX_PENDING_SEARCHES
+        # Only touched from the event loop, so no lock is needed
+        self.pending_searches = 0
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            await self.lifespan(receive, send)
+            return
+        if scope['type'] != 'http':
+            return
+
+        body = await read_body(receive)
+        environ = build_environ(scope, body)
+
+        if (scope['method'], scope['path']) not in SEARCH_ROUTES:
+            await self.respond(self.request_executor, environ, send)
+        elif self.pending_searches >= self.max_pending_searches:
+            status, headers, body = BUSY_RESPONSE
+            await send({'type': 'http.response.start', 'status': status, 'headers': headers})
+            await send({'type': 'http.response.body', 'body': body})
+        else:
+            self.pending_searches += 1
+            try:
+                await self.respond(self.search_executor, environ, send)
+            finally:
+                self.pending_searches -= 1
+
+    async def respond(self, executor: ThreadPoolExecutor, environ: Dict, send):
+        """Run the WSGI app on a pool thread and send its response as the chunks are produced"""
+        loop = asyncio.get_running_loop()
+        # A few chunks of slack; a slow client holds the producing thread back instead of piling up memory
+        queue = asyncio.Queue(maxsize=STREAM_QUEUE_CHUNKS)
+
+        def put(item):
+            asyncio.run_coroutine_threadsafe(queue.put(item), loop).result()
+
+        produced = loop.run_in_executor(executor, self.run_wsgi, environ, put)
+        item = finished = None
+        try:
+            item = await queue.get()
+            finished = item is None or item is FAILED
+            if not finished:
+                status, headers = item
+                await send({'type': 'http.response.start', 'status': status, 'headers': headers})
+                while not finished:
+                    item = await queue.get()
+                    finished = item is None or item is FAILED
+                    if item is not FAILED:
+                        await send({'type': 'http.response.body', 'body': item or b'', 'more_body': not finished})
+        finally:
+            # Let the producer finish even when the client went away mid-response
+            while not finished:
+                item = await queue.get()
+                finished = item is None or item is FAILED
+        # Re-raise anything the app raised: before its response started, the server answers 500;
+        # after, the body is left unfinished and the server drops the connection
+        await produced
+
+    def run_wsgi(self, environ: Dict, put: Callable):
+        """Run the WSGI app for one request on a pool thread, handing (status, headers) and then
+        each body chunk to put, followed by None (or FAILED if the app raised)"""
+        response = {}
+
+        def start_response(status, headers, exc_info=None):
+            response['status'] = int(status.split(' ', 1)[0])
+            response['headers'] = [(name.lower().encode('latin-1'), value.encode('latin-1'))
+                                   for name, value in headers]
+
+        try:
+            result = self.wsgi_app(environ, start_response)
+            try:
+                put((response['status'], response['headers']))
+                for chunk in result:
+                    if chunk:
+                        put(chunk)
+            finally:
+                if hasattr(result, 'close'):
+                    result.close()
+        except BaseException:
+            put(FAILED)
+            raise
+        put(None)
+
+    async def lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                self.request_executor.shutdown(wait=False)
+                self.search_executor.shutdown(wait=False)
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+async def read_body(receive) -> bytes:
+    """The full request body of an ASGI http request"""
+    parts = []
+    more_body = True
+    while more_body:
+        message = await receive()
+        if message['type'] == 'http.disconnect':
+            break
+        parts.append(message.get('body', b''))
+        more_body = message.get('more_body', False)
+    return b''.join(parts)
+
+def build_environ(scope, body: bytes) -> Dict:
+    """WSGI environ for an ASGI http scope (PEP 3333 strings are latin-1 decoded bytes)"""
+    server = scope.get('server') or ('localhost', 80)
+    client = scope.get('client') or ('', 0)
+    environ = {
+        'REQUEST_METHOD': scope['method'],
+        'SCRIPT_NAME': scope.get('root_path', '').encode('utf-8').decode('latin-1'),
+        'PATH_INFO': scope['path'].encode('utf-8').decode('latin-1'),
+        'QUERY_STRING': scope.get('query_string', b'').decode('latin-1'),
+        'SERVER_NAME': str(server[0]),
+        'SERVER_PORT': str(server[1] or 80),
+        'SERVER_PROTOCOL': f"HTTP/{scope.get('http_version', '1.1')}",
+        'REMOTE_ADDR': client[0],
+        'REMOTE_PORT': str(client[1]),
+        'CONTENT_LENGTH': str(len(body)),
+        'wsgi.version': (1, 0),
+        'wsgi.url_scheme': scope.get('scheme', 'http'),
+        'wsgi.input': io.BytesIO(body),
+        'wsgi.errors': sys.stderr,
+        'wsgi.multithread': True,
+        'wsgi.multiprocess': False,
+        'wsgi.run_once': False
+    }
+    for name, value in scope.get('headers', []):
+        name = name.decode('latin-1').upper().replace('-', '_')
+        value = value.decode('latin-1')
+        if name == 'CONTENT_TYPE':
+            environ['CONTENT_TYPE'] = value
+        elif name != 'CONTENT_LENGTH':
+            key = f'HTTP_{name}'
+            environ[key] = f"{environ[key]},{value}" if key in environ else value
+    return environ
+
+app = ReconciliationASGI(create_app())
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Compare per-query and batched reconciliation throughput on the bundled CSVs
+
+Usage: python benchmarks/bench_batch.py [batch_size] [batches]
+"""
+
+import sys
+import json
+
+from common import use_benchmark_database, sample_names, misspell, timed
+
+def build_batches(batch_size, batches):
+    """Build OpenRefine-style query batches with some repeated values"""
+    names = sample_names('artists', 'name', batch_size * batches)
+    queries = []
+    for i, name in enumerate(names):
+        # Every third query is misspelled and every fifth repeats its neighbour
+        text = misspell(name) if i % 3 == 0 else name
+        if i % 5 == 4:
+            text = queries[-1]['query']
+        queries.append({"query": text, "type": "person", "limit": 10})
+    
+    return [
+        {f"q{j}": query for j, query in enumerate(queries[start:start + batch_size])}
+        for start in range(0, len(queries), batch_size)
+    ]
+
+def run_per_query(batches):
+    """Reconcile every query with its own search_entities call"""
+    from services.search_service import search_entities
+    from services.reconciliation_service import parse_query
+    
+    results = []
+    for batch in batches:
+        results.append({
+            query_id: {"result": search_entities(*parse_query(query))}
+            for query_id, query in batch.items()
+        })
+    return results
+
+def run_batched(batches):
+    """Reconcile each batch through the batched engine"""
+    from services.reconciliation_service import process_reconciliation_queries
+    
+    return [process_reconciliation_queries(json.dumps(batch)) for batch in batches]
+
+def main():
+    batch_size = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    batch_count = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+    
+    print("=" * 60)
+    print("Per-query vs batched reconciliation")
+    print("=" * 60)
+    
+    use_benchmark_database()
+    from services.index_service import load_search_indexes
+    load_search_indexes()
+    
+    batches = build_batches(batch_size, batch_count)
+    total = sum(len(batch) for batch in batches)
+    
+    per_query_time, per_query_results = timed(run_per_query, batches)
+    batched_time, batched_results = timed(run_batched, batches)
+    
+    print(f"Queries:            {total} in {len(batches)} batches of {batch_size}")
+    print(f"Per-query:          {per_query_time:.3f}s ({total / per_query_time:.1f} queries/s)")
+    print(f"Batched:            {batched_time:.3f}s ({total / batched_time:.1f} queries/s)")
+    print(f"Speedup:            {per_query_time / batched_time:.2f}x")
+    print(f"Identical results:  {per_query_results == batched_results}")
+    print("=" * 60)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Time a W3C data extension request for many ids against per-entity lookups
+
+Usage: python benchmarks/bench_extend.py [id_count]
+"""
+
+import sys
+import sqlite3
+
+from common import use_benchmark_database, timed
+from config.settings import Config
+
+PROPERTIES = ['name', 'date', 'nationality', 'creator', 'location', 'medium']
+
+def sample_ids(count):
+    """Take ids from every table, artists first since the bundled CSVs have the most of them"""
+    conn = sqlite3.connect(Config.DATABASE_PATH)
+    ids = []
+    for table in ('artists', 'artifacts', 'museums'):
+        ids.extend(row[0] for row in conn.execute(f'SELECT id FROM {table} ORDER BY rowid LIMIT ?',
+                                                  (count - len(ids),)))
+    conn.close()
+    return ids
+
+def run_per_entity(ids):
+    """Look every id up on its own, as preview scraping does"""
+    from services.search_service import get_entity_by_id
+    
+    return [get_entity_by_id(entity_id)[0] for entity_id in ids]
+
+def main():
+    id_count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    
+    print("=" * 60)
+    print("Data extension")
+    print("=" * 60)
+    
+    use_benchmark_database()
+    from services.extension_service import extend_entities
+    
+    ids = sample_ids(id_count)
+    extend_time, response = timed(extend_entities, ids, PROPERTIES, repeat=3)
+    per_entity_time, entities = timed(run_per_entity, ids)
+    
+    filled = sum(1 for row in response['rows'].values() if any(row.values()))
+    print(f"Ids:                {len(ids)} ({filled} with values, {len(PROPERTIES)} properties)")
+    print(f"Batched extension:  {extend_time:.3f}s ({len(ids) / extend_time:.0f} ids/s)")
+    print(f"Per-entity lookups: {per_entity_time:.3f}s ({len(ids) / per_entity_time:.0f} ids/s)")
+    print(f"Speedup:            {per_entity_time / extend_time:.2f}x")
+    print(f"All ids found:      {filled == len(ids) and all(entities)}")
+    print("=" * 60)
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+Report wall time and peak RSS of building the database from CSV files
+
+Usage: python benchmarks/bench_load.py [artworks.csv] [artists.csv] [museums.csv]
+
+Pass the full MoMA Artworks.csv to measure the streaming loader at scale;
+without arguments the bundled CSVs are used.
+"""
+
+import os
+import sys
+import json
+
+from common import BUNDLED_CSV_FILES, BENCHMARK_DATABASE_PATH
+
+def main():
+    csv_files = dict(BUNDLED_CSV_FILES)
+    for name, path in zip(('artifacts', 'artists', 'museums'), sys.argv[1:]):
+        if not os.path.exists(path):
+            print(f"{path} not found")
+            sys.exit(1)
+        csv_files[name] = path
+    
+    print("=" * 60)
+    print("Streaming CSV load")
+    print("=" * 60)
+    for name, path in csv_files.items():
+        size_mb = os.path.getsize(path) / (1024 * 1024) if os.path.exists(path) else 0
+        print(f"{name:<10} {path} ({size_mb:.1f} MB)")
+    print("-" * 60)
+    
+    from config.settings import Config
+    from services.database_service import init_db
+    
+    Config.CSV_FILES = csv_files
+    Config.DATABASE_PATH = BENCHMARK_DATABASE_PATH
+    report = init_db()
+    
+    print("-" * 60)
+    print(json.dumps(report, indent=2))
+    print(f"Database size: {os.path.getsize(Config.DATABASE_PATH) / (1024 * 1024):.1f} MB")
+    print("=" * 60)
+
+if __name__ == '__main__':
+    main()
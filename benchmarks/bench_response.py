@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Compare building a reconciliation response with jsonify against the streamed response
+
+Usage: python benchmarks/bench_response.py [batch_size ...]
+"""
+
+import sys
+import json
+import tracemalloc
+
+from common import use_benchmark_database, sample_names, misspell, timed
+from config.settings import Config
+
+LIMIT = 100
+
+def make_batch(names, size):
+    """W3C query batch of misspelled artist names asking for the maximum number of results"""
+    return json.dumps({f"q{i}": {"query": misspell(names[i % len(names)]), "limit": LIMIT} for i in range(size)})
+
+def run_jsonify(app, queries):
+    """The previous path: search the whole batch, then serialize the complete dict at once"""
+    from flask import jsonify
+    from services.reconciliation_service import process_reconciliation_queries
+    
+    with app.test_request_context('/', method='POST'):
+        return len(jsonify(process_reconciliation_queries(queries)).get_data())
+
+def run_streamed(client, queries, accept_encoding=''):
+    """The streamed path, consuming chunks as a client would"""
+    response = client.post('/', data={'queries': queries}, headers={'Accept-Encoding': accept_encoding},
+                           buffered=False)
+    size = sum(len(chunk) for chunk in response.response)
+    response.close()
+    return size
+
+def peak_memory(func, *args):
+    """(seconds, peak traced MB, result) of one call"""
+    tracemalloc.start()
+    seconds, result = timed(func, *args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return seconds, peak / (1024 * 1024), result
+
+def main():
+    batch_sizes = [int(arg) for arg in sys.argv[1:]] or [10, 50, 200]
+    
+    print("=" * 60)
+    print(f"Reconciliation response encoding (limit {LIMIT})")
+    print("=" * 60)
+    
+    use_benchmark_database()
+    Config.JOBS_ENABLED = False
+    Config.FUZZY_SEARCH_THRESHOLD = 0
+    Config.MAX_RESULTS_LIMIT = LIMIT
+    from app import create_app
+    
+    app = create_app()
+    client = app.test_client()
+    names = sample_names('artists', 'name', 500)
+    
+    for size in batch_sizes:
+        queries = make_batch(names, size)
+        # Warm the indexes and caches so both paths measure encoding and search alike
+        run_jsonify(app, queries)
+        
+        jsonify_time, jsonify_peak, jsonify_size = peak_memory(run_jsonify, app, queries)
+        stream_time, stream_peak, stream_size = peak_memory(run_streamed, client, queries)
+        gzip_time, gzip_peak, gzip_size = peak_memory(run_streamed, client, queries, 'gzip')
+        
+        print(f"Batch of {size} queries")
+        print(f"  jsonify:          {jsonify_time:.3f}s, peak {jsonify_peak:7.1f} MB, {jsonify_size / 1024:8.0f} KB")
+        print(f"  streamed:         {stream_time:.3f}s, peak {stream_peak:7.1f} MB, {stream_size / 1024:8.0f} KB")
+        print(f"  streamed + gzip:  {gzip_time:.3f}s, peak {gzip_peak:7.1f} MB, {gzip_size / 1024:8.0f} KB")
+    print("=" * 60)
+
+if __name__ == '__main__':
+    main()
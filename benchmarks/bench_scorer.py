@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Check that the fuzzy scoring backends agree with fuzz.ratio and compare their speed
+
+Usage: python benchmarks/bench_scorer.py [query_count]
+"""
+
+import sys
+
+from common import use_benchmark_database, sample_names, misspell, timed
+
+def main():
+    query_count = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    
+    print("=" * 60)
+    print("Fuzzy scoring backend compatibility")
+    print("=" * 60)
+    
+    use_benchmark_database()
+    from utils.text_utils import normalize_text
+    from services.index_service import load_search_indexes
+    from services.search_service import SCORERS, rapid_process, search_entities, set_scorer
+    
+    indexes = load_search_indexes()
+    choices = [value for values in indexes['artists'].values for value in values if value]
+    queries = [normalize_text(misspell(name)) for name in sample_names('artists', 'name', query_count)]
+    
+    backends = [name for name in SCORERS if name != 'rapidfuzz' or rapid_process is not None]
+    if 'rapidfuzz' not in backends:
+        print("rapidfuzz is not installed; only the fuzzywuzzy backend is available")
+    
+    scores = {}
+    for name in backends:
+        scorer = SCORERS[name]()
+        elapsed, scores[name] = timed(lambda: [scorer.score_many(query, choices) for query in queries])
+        comparisons = len(queries) * len(choices)
+        print(f"{name:<12} {elapsed:.3f}s for {comparisons} comparisons ({comparisons / elapsed:,.0f}/s)")
+    
+    reference = scores['fuzzywuzzy']
+    for name in backends:
+        if name == 'fuzzywuzzy':
+            continue
+        mismatches = sum(a != b for ref, other in zip(reference, scores[name]) for a, b in zip(ref, other))
+        print(f"{name} score mismatches vs fuzz.ratio: {mismatches}")
+        
+        rankings = {}
+        for backend in ('fuzzywuzzy', name):
+            set_scorer(backend)
+            rankings[backend] = [[r['id'] for r in search_entities(query, 10, 'person')] for query in queries]
+        print(f"{name} rankings identical to fuzz.ratio: {rankings['fuzzywuzzy'] == rankings[name]}")
+    
+    set_scorer('auto')
+    print("=" * 60)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+"""
+Latency, throughput, memory and result-quality suite for the reconciliation endpoints
+
+Usage: python benchmarks/bench_suite.py [--sizes 10k,100k,1m] [--requests 200] [--concurrency 8]
+                                        [--no-http] [--output bench_results.json]
+
+For every size a synthetic dataset is generated (see synthetic.py) and loaded with init_db,
+then /, /suggest/entity, /preview/<id> and batch POSTs are driven through the Flask test
+client and through a local HTTP server with concurrent clients. Each size runs in its own
+process so peak RSS belongs to that dataset alone. The report is written as sorted JSON,
+so runs from two commits can be diffed directly.
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import platform
+import tempfile
+import threading
+import subprocess
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+from common import ROOT, BENCHMARK_DATABASE_PATH, use_benchmark_database
+from synthetic import generate_dataset, parse_size
+from config.settings import Config
+
+# Settings that change what the numbers mean, recorded with every report
+REPORTED_SETTINGS = ['SCORER_BACKEND', 'FTS_ENABLED', 'INDEX_MAX_CANDIDATES', 'INDEX_MIN_NGRAM_OVERLAP',
+                     'SEARCH_TIME_BUDGET_MS', 'SEARCH_WORKERS', 'RESULT_CACHE_ENABLED', 'PREVIEW_CACHE_ENABLED',
+                     'ENTITY_CACHE_ENABLED', 'DB_POOL_ENABLED']
+RECALL_AT = (1, 5, 10)
+
+def percentile(sorted_values, fraction):
+    """Linearly interpolated percentile of an already sorted list"""
+    if not sorted_values:
+        return None
+    position = (len(sorted_values) - 1) * fraction
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+
+def latency_stats(latencies, elapsed, errors=0):
+    """Summarize per-request latencies (seconds) measured over elapsed wall seconds"""
+    values = sorted(latencies)
+    ms = lambda seconds: round(seconds * 1000, 3) if seconds is not None else None
+    return {
+        "requests": len(values),
+        "errors": errors,
+        "p50_ms": ms(percentile(values, 0.50)),
+        "p95_ms": ms(percentile(values, 0.95)),
+        "p99_ms": ms(percentile(values, 0.99)),
+        "mean_ms": ms(sum(values) / len(values)) if values else None,
+        "max_ms": ms(values[-1]) if values else None,
+        "throughput_rps": round(len(values) / elapsed, 2) if elapsed else None
+    }
+
+def build_workloads(queries, request_count, batch_size, seed):
+    """Requests per endpoint, as (method, path, form) triples"""
+    rng = random.Random(seed)
+    picks = [rng.choice(queries) for _ in range(request_count)]
+    
+    def reconcile_form(batch):
+        return {"queries": json.dumps({f"q{i}": {"query": query['query'], "type": query['type'], "limit": 10}
+                                       for i, query in enumerate(batch)})}
+    
+    return {
+        "metadata": [('GET', '/', None)] * request_count,
+        "reconcile": [('POST', '/', reconcile_form([query])) for query in picks],
+        "reconcile_batch": [('POST', '/', reconcile_form(rng.sample(queries, min(batch_size, len(queries)))))
+                            for _ in range(max(1, request_count // batch_size))],
+        "suggest": [('GET', '/suggest/entity?' + urllib.parse.urlencode({"prefix": query['query'][:4],
+                                                                        "type": query['type']}), None)
+                    for query in picks],
+        "preview": [('GET', f"/preview/{query['expected']}", None) for query in picks]
+    }
+
+def run_test_client(app, workloads):
+    """Drive every workload sequentially through the Flask test client"""
+    client = app.test_client()
+    report = {}
+    for name, requests in workloads.items():
+        # One untimed request first, so lazy setup is not charged to the first sample
+        send_test_request(client, requests[0])
+        latencies = []
+        errors = 0
+        started = time.perf_counter()
+        for request in requests:
+            request_started = time.perf_counter()
+            status = send_test_request(client, request)
+            latencies.append(time.perf_counter() - request_started)
+            errors += status >= 400
+        report[name] = latency_stats(latencies, time.perf_counter() - started, errors)
+    return report
+
+def send_test_request(client, request):
+    method, path, form = request
+    response = client.post(path, data=form) if method == 'POST' else client.get(path)
+    return response.status_code
+
+def run_http(app, workloads, concurrency):
+    """Drive every workload from concurrent clients against a local threaded HTTP server"""
+    from werkzeug.serving import make_server, WSGIRequestHandler
+    
+    class QuietRequestHandler(WSGIRequestHandler):
+        def log_request(self, *args, **kwargs):
+            pass
+    
+    server = make_server('127.0.0.1', 0, app, threaded=True, request_handler=QuietRequestHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    base_url = f"http://127.0.0.1:{server.server_port}"
+    
+    report = {}
+    try:
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            for name, requests in workloads.items():
+                send_http_request(base_url, requests[0])
+                started = time.perf_counter()
+                samples = list(pool.map(lambda request: timed_http_request(base_url, request), requests))
+                elapsed = time.perf_counter() - started
+                report[name] = latency_stats([latency for latency, ok in samples if ok], elapsed,
+                                             sum(1 for _, ok in samples if not ok))
+                report[name]["concurrency"] = concurrency
+    finally:
+        server.shutdown()
+    return report
+
+def send_http_request(base_url, request):
+    method, path, form = request
+    data = urllib.parse.urlencode(form).encode('utf-8') if method == 'POST' else None
+    with urllib.request.urlopen(urllib.request.Request(base_url + path, data=data), timeout=120) as response:
+        response.read()
+        return response.status
+
+def timed_http_request(base_url, request):
+    """(latency in seconds, succeeded) of one HTTP request"""
+    started = time.perf_counter()
+    try:
+        ok = send_http_request(base_url, request) < 400
+    except Exception:
+        ok = False
+    return time.perf_counter() - started, ok
+
+def measure_quality(app, queries, batch_size):
+    """recall@k of the known matches, overall and per query kind and type"""
+    client = app.test_client()
+    ranks = []
+    for start in range(0, len(queries), batch_size):
+        batch = queries[start:start + batch_size]
+        form = {"queries": json.dumps({f"q{i}": {"query": query['query'], "type": query['type'],
+                                                 "limit": max(RECALL_AT)}
+                                       for i, query in enumerate(batch)})}
+        results = client.post('/', data=form).get_json()
+        for i, query in enumerate(batch):
+            ids = [match['id'] for match in results[f"q{i}"]['result']]
+            ranks.append(ids.index(query['expected']) + 1 if query['expected'] in ids else None)
+    
+    def recall(selected):
+        if not selected:
+            return {}
+        return {f"recall@{k}": round(sum(1 for rank in selected if rank and rank <= k) / len(selected), 4)
+                for k in RECALL_AT}
+    
+    report = {"queries": len(queries), **recall(ranks), "by_kind": {}, "by_type": {}}
+    for field, group in (('kind', 'by_kind'), ('type', 'by_type')):
+        for value in sorted({query[field] for query in queries}):
+            report[group][value] = recall([rank for query, rank in zip(queries, ranks) if query[field] == value])
+    return report
+
+def run_size(size, args):
+    """Generate, load and measure one dataset size in this process"""
+    from services.database_service import peak_rss_mb
+    from services.index_service import load_search_indexes
+    from services.suggest_service import load_suggest_indexes
+    
+    csv_files, queries = generate_dataset(size, seed=args.seed, query_count=args.queries)
+    rows = {}
+    for name, path in csv_files.items():
+        with open(path, encoding='utf-8') as f:
+            rows[name] = sum(1 for _ in f) - 1
+    
+    Config.SYNC_ON_STARTUP = False
+    Config.JOBS_ENABLED = False
+    started = time.perf_counter()
+    build = use_benchmark_database(csv_files, db_path=args.database)
+    build_seconds = time.perf_counter() - started
+    
+    started = time.perf_counter()
+    load_search_indexes()
+    load_suggest_indexes()
+    index_seconds = time.perf_counter() - started
+    build_peak_rss = peak_rss_mb()
+    
+    from app import create_app
+    app = create_app()
+    
+    workloads = build_workloads(queries, args.requests, args.batch_size, args.seed)
+    report = {
+        "rows": rows,
+        "build": {
+            "init_db_seconds": round(build_seconds, 3),
+            "index_load_seconds": round(index_seconds, 3),
+            "database_mb": round(os.path.getsize(build) / (1024 * 1024), 2),
+            "peak_rss_mb": round(build_peak_rss, 1)
+        },
+        "quality": measure_quality(app, queries, args.batch_size),
+        "test_client": run_test_client(app, workloads)
+    }
+    if not args.no_http:
+        report["http"] = run_http(app, workloads, args.concurrency)
+    report["peak_rss_mb"] = round(peak_rss_mb(), 1)
+    return report
+
+def run_size_in_child(size, args):
+    """Run one size in a fresh interpreter so its peak RSS is not inflated by earlier sizes"""
+    fd, output = tempfile.mkstemp(suffix='.json')
+    os.close(fd)
+    try:
+        command = [sys.executable, os.path.abspath(__file__), '--child', size, '--output', output,
+                   '--requests', str(args.requests), '--queries', str(args.queries),
+                   '--batch-size', str(args.batch_size), '--concurrency', str(args.concurrency),
+                   '--seed', str(args.seed), '--database', args.database]
+        if args.no_http:
+            command.append('--no-http')
+        subprocess.run(command, check=True, cwd=ROOT)
+        with open(output, encoding='utf-8') as f:
+            return json.load(f)
+    finally:
+        os.remove(output)
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', default='10k,100k', help="Comma-separated dataset sizes (rows, e.g. 10k,100k,1m)")
+    parser.add_argument('--requests', type=int, default=200, help="Requests per endpoint")
+    parser.add_argument('--queries', type=int, default=400, help="Known-answer queries per dataset")
+    parser.add_argument('--batch-size', type=int, default=25, help="Queries per batch POST")
+    parser.add_argument('--concurrency', type=int, default=8, help="Concurrent HTTP clients")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--no-http', action='store_true', help="Skip the local HTTP load generator")
+    parser.add_argument('--database', default=BENCHMARK_DATABASE_PATH, help="Scratch database path")
+    parser.add_argument('--output', default='bench_results.json')
+    parser.add_argument('--child', help=argparse.SUPPRESS)
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    
+    if args.child:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(run_size(args.child, args), f)
+        return
+    
+    sizes = [size.strip() for size in args.sizes.split(',') if size.strip()]
+    report = {
+        "commit": git_commit(),
+        "created": time.strftime('%Y-%m-%dT%H:%M:%S'),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "parameters": {"requests": args.requests, "queries": args.queries, "batch_size": args.batch_size,
+                       "concurrency": None if args.no_http else args.concurrency, "seed": args.seed},
+        "settings": {name: getattr(Config, name, None) for name in REPORTED_SETTINGS},
+        "sizes": {}
+    }
+    report["settings"]["RESULT_CACHE_ENABLED"] = False
+    
+    for size in sizes:
+        print("=" * 60)
+        print(f"Benchmark suite: {parse_size(size)} rows")
+        print("=" * 60)
+        result = run_size_in_child(size, args)
+        report["sizes"][size] = result
+        
+        print("-" * 60)
+        quality = result["quality"]
+        print("Quality:   " + "  ".join(f"recall@{k} {quality[f'recall@{k}']:.3f}" for k in RECALL_AT))
+        for mode in ('test_client', 'http'):
+            for name, stats in result.get(mode, {}).items():
+                if not stats['requests']:
+                    print(f"{mode:<11} {name:<16} all {stats['errors']} requests failed")
+                    continue
+                print(f"{mode:<11} {name:<16} p50 {stats['p50_ms']:>9.2f}ms  p95 {stats['p95_ms']:>9.2f}ms  "
+                      f"p99 {stats['p99_ms']:>9.2f}ms  {stats['throughput_rps']:>8.1f} req/s")
+        print(f"Peak RSS:  {result['peak_rss_mb']} MB")
+    
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, sort_keys=True)
+        f.write('\n')
+    print("=" * 60)
+    print(f"Report written to {args.output}")
+
+if __name__ == '__main__':
+    main()
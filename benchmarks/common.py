@@ -0,0 +1,73 @@
+"""
+Shared helpers for the benchmark scripts
+"""
+
+import os
+import sys
+import time
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from config.settings import Config
+
+# CSV files shipped with the repository
+BUNDLED_CSV_FILES = {
+    'museums': os.path.join(ROOT, 'data', 'museums_20.csv'),
+    'artists': os.path.join(ROOT, 'data', 'artists.csv'),
+    'artifacts': os.path.join(ROOT, 'data', 'artworks_20.csv')
+}
+
+# Scratch database rebuilt by the benchmarks
+BENCHMARK_DATABASE_PATH = os.path.join(tempfile.gettempdir(), 'museum_reconciliation_bench.db')
+
+def use_benchmark_database(csv_files=None, db_path=None, rebuild=True, result_cache=False):
+    """Point the services at a scratch database built from the given CSV files"""
+    from services.database_service import init_db
+    
+    # Measure the search engine itself unless a benchmark asks for the result cache
+    Config.RESULT_CACHE_ENABLED = result_cache
+    Config.CSV_FILES = dict(csv_files or BUNDLED_CSV_FILES)
+    Config.DATABASE_PATH = db_path or BENCHMARK_DATABASE_PATH
+    if rebuild or not os.path.exists(Config.DATABASE_PATH):
+        # Start from an empty file: init_db drops and recreates tables in place, so a rebuilt
+        # file would keep the free pages of a larger earlier dataset
+        for path in (Config.DATABASE_PATH, f"{Config.DATABASE_PATH}-wal", f"{Config.DATABASE_PATH}-shm",
+                     f"{Config.DATABASE_PATH}.index"):
+            if os.path.exists(path):
+                os.remove(path)
+        init_db()
+    return Config.DATABASE_PATH
+
+def sample_names(table, column, count, step=None):
+    """Pick evenly spaced values of a column to use as benchmark queries"""
+    import sqlite3
+    
+    conn = sqlite3.connect(Config.DATABASE_PATH)
+    values = [row[0] for row in conn.execute(f'SELECT {column} FROM {table} ORDER BY rowid') if row[0]]
+    conn.close()
+    
+    if not values:
+        return []
+    step = step or max(1, len(values) // count)
+    return values[::step][:count]
+
+def misspell(text):
+    """Drop one character from the middle of a name to force fuzzy matching"""
+    if len(text) < 4:
+        return text
+    middle = len(text) // 2
+    return text[:middle] + text[middle + 1:]
+
+def timed(func, *args, repeat=1, **kwargs):
+    """Run a function and return (best wall time in seconds, last result)"""
+    best = None
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args, **kwargs)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
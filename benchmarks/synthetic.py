@@ -0,0 +1,176 @@
+"""
+Synthetic museum, artist and artwork datasets in the CSV layout init_db reads
+
+Every dataset is generated from a seed, so a size always produces the same files. Alongside
+the CSVs, queries.json lists reconciliation queries with the entity id each one should find
+(exact names, misspellings and reordered tokens) for measuring result quality.
+"""
+
+import os
+import csv
+import json
+import random
+
+from common import ROOT, misspell
+
+# Share of the requested row count that goes to each table
+TABLE_SHARES = {'artists': 0.4, 'artifacts': 0.5, 'museums': 0.1}
+
+SYLLABLES = ['ka', 'lo', 'mi', 'ren', 'sa', 'tor', 'vi', 'an', 'bel', 'cor', 'da', 'el', 'fin', 'gar',
+             'hal', 'is', 'jo', 'ker', 'lin', 'mor', 'nes', 'ol', 'par', 'qui', 'ros', 'ste', 'tal',
+             'ul', 'ven', 'wen', 'xan', 'yor', 'zel', 'ber', 'cas', 'dor', 'ev', 'fra', 'gil', 'har']
+NATIONALITIES = ['American', 'French', 'German', 'Italian', 'Japanese', 'Spanish', 'British', 'Mexican',
+                 'Dutch', 'Brazilian', 'Swiss', 'Austrian', 'Russian', 'Chinese', 'Canadian']
+GENDERS = ['male', 'female', 'non-binary']
+MEDIUMS = ['Oil on canvas', 'Gelatin silver print', 'Lithograph', 'Ink on paper', 'Bronze',
+           'Watercolor on paper', 'Pencil on paper', 'Chromogenic print', 'Woodcut', 'Wood and metal']
+CLASSIFICATIONS = ['Painting', 'Photograph', 'Print', 'Drawing', 'Sculpture', 'Design', 'Architecture']
+DEPARTMENTS = ['Painting & Sculpture', 'Photography', 'Drawings & Prints', 'Architecture & Design']
+TITLE_WORDS = ['Study', 'Landscape', 'Portrait', 'Composition', 'Untitled', 'Interior', 'Figure', 'Garden',
+               'Harbor', 'Night', 'Morning', 'Window', 'Bridge', 'Still Life', 'Project', 'Tower']
+MUSEUM_TYPES = ['ART MUSEUM', 'HISTORY MUSEUM', 'SCIENCE & TECHNOLOGY MUSEUM OR PLANETARIUM',
+                'HISTORIC PRESERVATION', 'GENERAL MUSEUM', "CHILDREN'S MUSEUM", 'NATURAL HISTORY MUSEUM']
+MUSEUM_WORDS = ['HERITAGE', 'AVIATION', 'MARITIME', 'RAILROAD', 'PIONEER', 'FINE ARTS', 'HISTORICAL',
+                'CONTEMPORARY', 'FOLK ART', 'NATURE', 'SCIENCE', 'COUNTY']
+STATES = ['AK', 'CA', 'NY', 'TX', 'IL', 'MA', 'WA', 'OH', 'PA', 'FL', 'CO', 'MN']
+
+# Columns written for each table, in the order of the real CSV files
+MUSEUM_COLUMNS = ['Museum ID', 'Museum Name', 'Legal Name', 'Alternate Name', 'Museum Type',
+                  'Street Address (Administrative Location)', 'City (Administrative Location)',
+                  'State (Administrative Location)', 'Zip Code (Administrative Location)', 'Phone Number',
+                  'Latitude', 'Longitude', 'County Code (FIPS)', 'Region Code (AAM)', 'Revenue']
+ARTIST_COLUMNS = ['id', 'name', 'artist_bio', 'nationality', 'gender', 'birth_year', 'death_year',
+                  'wiki_qid', 'ulan']
+ARTWORK_COLUMNS = ['Title', 'Artist', 'ConstituentID', 'ArtistBio', 'Nationality', 'BeginDate', 'EndDate',
+                   'Gender', 'Date', 'Medium', 'Dimensions', 'CreditLine', 'AccessionNumber',
+                   'Classification', 'Department', 'DateAcquired', 'ObjectID', 'URL', 'ImageURL', 'OnView',
+                   'Height (cm)', 'Width (cm)', 'Length (cm)', 'Weight (kg)']
+
+# Synthetic datasets are cached here by size and seed
+DATASET_DIRECTORY = os.path.join(ROOT, 'benchmarks', 'data')
+
+def parse_size(size):
+    """Turn '10k', '100k', '1m' or '5000' into a row count"""
+    text = str(size).strip().lower()
+    multiplier = {'k': 1000, 'm': 1000000}.get(text[-1:], 1)
+    return int(float(text.rstrip('km')) * multiplier)
+
+def make_word(rng, syllables):
+    return ''.join(rng.choice(SYLLABLES) for _ in range(syllables))
+
+def unique_names(rng, count, make):
+    """Draw count distinct values from make(rng), so every query has a single right answer"""
+    names = set()
+    ordered = []
+    while len(ordered) < count:
+        name = make(rng)
+        if name not in names:
+            names.add(name)
+            ordered.append(name)
+    return ordered
+
+def artist_name(rng):
+    return f"{make_word(rng, rng.randint(2, 3)).capitalize()} {make_word(rng, rng.randint(2, 4)).capitalize()}"
+
+def artwork_title(rng):
+    return f"{rng.choice(TITLE_WORDS)} {make_word(rng, rng.randint(2, 3)).capitalize()} {rng.randint(1, 99)}"
+
+def museum_name(rng):
+    return f"{make_word(rng, rng.randint(2, 4)).upper()} {rng.choice(MUSEUM_WORDS)} MUSEUM"
+
+def write_csv(path, columns, rows):
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(columns)
+        writer.writerows(rows)
+
+def generate_artists(rng, count):
+    """Artist rows and the (id, name) pairs artworks are attributed to"""
+    rows = []
+    for number, name in enumerate(unique_names(rng, count, artist_name), start=1):
+        nationality = rng.choice(NATIONALITIES)
+        birth = rng.randint(1800, 1990)
+        death = birth + rng.randint(30, 90) if birth < 1950 and rng.random() < 0.8 else 0
+        bio = f"{nationality}, {birth}–{death}" if death else f"{nationality}, born {birth}"
+        rows.append([number, name, bio, nationality, rng.choice(GENDERS), birth, death, '', ''])
+    return rows
+
+def generate_artworks(rng, count, artists):
+    rows = []
+    for number, title in enumerate(unique_names(rng, count, artwork_title), start=1):
+        artist = rng.choice(artists)
+        artist_id, name, bio, nationality, gender, birth, death = artist[:7]
+        year = rng.randint(birth + 15, (death or 2020) if death else 2020)
+        height, width = round(rng.uniform(5, 300), 1), round(rng.uniform(5, 300), 1)
+        rows.append([title, name, artist_id, f"({bio})", f"({nationality})", f"({birth})", f"({death})",
+                     f"({gender})", year, rng.choice(MEDIUMS), f"{height} x {width} cm",
+                     'Gift of a synthetic donor', f"{number}.{year}", rng.choice(CLASSIFICATIONS),
+                     rng.choice(DEPARTMENTS), f"{rng.randint(1930, 2020)}-01-01", number,
+                     f"https://example.org/works/{number}", '', '', height, width, '', ''])
+    return rows
+
+def generate_museums(rng, count):
+    rows = []
+    for number, name in enumerate(unique_names(rng, count, museum_name), start=1):
+        city = make_word(rng, 3).upper()
+        rows.append([8400000000 + number, name, f"{name} INC", '', rng.choice(MUSEUM_TYPES),
+                     f"{rng.randint(1, 9999)} MAIN ST", city, rng.choice(STATES), f"{rng.randint(10000, 99999)}",
+                     '', round(rng.uniform(25, 65), 5), round(rng.uniform(-160, -70), 5), rng.randint(1, 200),
+                     rng.randint(1, 6), rng.randint(0, 10000000)])
+    return rows
+
+def vary_query(rng, name, kind):
+    """Turn an entity name into a query of the given kind"""
+    if kind == 'misspelled':
+        return misspell(name)
+    if kind == 'reordered':
+        tokens = name.split()
+        return ' '.join(tokens[1:] + tokens[:1]) if len(tokens) > 1 else name
+    if kind == 'lowercase':
+        return name.lower()
+    return name
+
+QUERY_KINDS = ['exact', 'misspelled', 'reordered', 'lowercase']
+
+def build_queries(rng, artists, artworks, museums, count):
+    """Queries with known answers, spread over the tables and the query kinds"""
+    sources = [
+        ('person', [(f"ARTIST_{row[0]:06d}", row[1]) for row in artists]),
+        ('artifact', [(f"ARTIFACT_{row[16]:06d}", row[0]) for row in artworks]),
+        ('museum', [(f"MUSEUM_{row[0]}", row[1]) for row in museums])
+    ]
+    queries = []
+    for i in range(count):
+        type_id, entities = sources[i % len(sources)]
+        expected, name = rng.choice(entities)
+        kind = QUERY_KINDS[(i // len(sources)) % len(QUERY_KINDS)]
+        queries.append({"query": vary_query(rng, name, kind), "type": type_id, "kind": kind, "expected": expected})
+    return queries
+
+def generate_dataset(size, seed=42, query_count=400, directory=None):
+    """Write (or reuse) the synthetic CSVs for a size; returns (csv_files, queries)"""
+    rows = parse_size(size)
+    directory = directory or os.path.join(DATASET_DIRECTORY, f"{rows}_{seed}")
+    csv_files = {
+        'museums': os.path.join(directory, 'museums.csv'),
+        'artists': os.path.join(directory, 'artists.csv'),
+        'artifacts': os.path.join(directory, 'artworks.csv')
+    }
+    queries_path = os.path.join(directory, 'queries.json')
+    
+    if not all(os.path.exists(path) for path in list(csv_files.values()) + [queries_path]):
+        os.makedirs(directory, exist_ok=True)
+        rng = random.Random(seed)
+        artists = generate_artists(rng, max(1, int(rows * TABLE_SHARES['artists'])))
+        artworks = generate_artworks(rng, max(1, int(rows * TABLE_SHARES['artifacts'])), artists)
+        museums = generate_museums(rng, max(1, int(rows * TABLE_SHARES['museums'])))
+        
+        write_csv(csv_files['artists'], ARTIST_COLUMNS, artists)
+        write_csv(csv_files['artifacts'], ARTWORK_COLUMNS, artworks)
+        write_csv(csv_files['museums'], MUSEUM_COLUMNS, museums)
+        with open(queries_path, 'w', encoding='utf-8') as f:
+            json.dump(build_queries(rng, artists, artworks, museums, query_count), f, indent=1)
+    
+    with open(queries_path, encoding='utf-8') as f:
+        queries = json.load(f)
+    return csv_files, queries
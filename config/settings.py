@@ -10,6 +10,13 @@ class Config:
     # Database settings
     DATABASE_PATH = 'data/museum_reconciliation.db'
     
+    # Read-only connection pool (one connection per thread and worker process)
+    DB_POOL_ENABLED = True
+    DB_JOURNAL_MODE = 'WAL'
+    DB_CACHE_SIZE_KB = 65536
+    DB_MMAP_SIZE = 268435456
+    DB_CACHED_STATEMENTS = 256
+    
     # CSV file paths
     CSV_FILES = {
         'museums': 'data/museums.csv',
@@ -17,6 +24,17 @@ class Config:
         'artifacts': 'data/artworks.csv'
     }
     
+    # Rows read per chunk while streaming CSV files into the database
+    CSV_CHUNK_SIZE = 20000
+    
+    # Diff changed CSV files into an existing database at startup (see sync_db). Off by default:
+    # it hashes every CSV file in every worker; run `python manage.py sync` after editing them
+    SYNC_ON_STARTUP = False
+    
+    # Build a missing database from the CSV files at startup; with False, workers only open a
+    # database prebuilt by `python manage.py build` (and fail fast without one)
+    BUILD_DB_ON_STARTUP = True
+    
     # Service metadata following W3C Reconciliation API specification
     SERVICE_METADATA = {
         "versions": ["0.2"],
@@ -58,6 +76,13 @@ class Config:
                 "service_url": "http://localhost:5000",
                 "service_path": "/suggest/property"
             }
+        },
+        "extend": {
+            "propose_properties": {
+                "service_url": "http://localhost:5000",
+                "service_path": "/extend/propose"
+            },
+            "property_settings": []
         }
     }
     
@@ -66,6 +91,118 @@ class Config:
     HIGH_MATCH_THRESHOLD = 80
     MAX_RESULTS_LIMIT = 100
     DEFAULT_SEARCH_LIMIT = 10
+    SUGGEST_LIMIT = 10
+    
+    # Fuzzy scoring backend: 'auto' uses rapidfuzz when installed, else fuzzywuzzy
+    SCORER_BACKEND = 'auto'
+    SCORING_CHUNK_SIZE = 256
+    
+    # Reconciliation result cache (per worker process)
+    RESULT_CACHE_ENABLED = True
+    RESULT_CACHE_MAX_ENTRIES = 10000
+    RESULT_CACHE_MAX_BYTES = 64 * 1024 * 1024
+    RESULT_CACHE_TTL_SECONDS = 3600
+    
+    # Entity lookups and rendered previews for /preview, /view and /flyout (per worker process)
+    ENTITY_CACHE_ENABLED = True
+    ENTITY_CACHE_MAX_ENTRIES = 2000
+    ENTITY_CACHE_MAX_BYTES = 16 * 1024 * 1024
+    PREVIEW_CACHE_ENABLED = True
+    PREVIEW_CACHE_MAX_ENTRIES = 2000
+    PREVIEW_CACHE_MAX_BYTES = 32 * 1024 * 1024
+    PREVIEW_MAX_AGE_SECONDS = 60
+    
+    # Works listed on an artist's preview, read from the artist -> artwork edges
+    PREVIEW_MAX_WORKS = 10
+    
+    # How long a process trusts its last read of the data version for cached lookups
+    DATA_VERSION_CHECK_SECONDS = 1.0
+    
+    # Prometheus metrics at /metrics: request latency per endpoint and entity type, search
+    # stage timings per batch and candidate rows fetched vs. fuzzy-scored per query
+    METRICS_ENABLED = True
+    METRICS_LATENCY_BUCKETS = [0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0]
+    METRICS_STAGE_BUCKETS = [0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0, 5.0]
+    METRICS_ROW_BUCKETS = [0, 10, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 50000]
+    
+    # Asynchronous reconciliation jobs for very large query sets (see /jobs)
+    JOBS_ENABLED = True
+    JOBS_DATABASE_PATH = 'data/reconciliation_jobs.db'
+    JOB_WORKERS = max(1, (os.cpu_count() or 2) - 1)
+    JOB_CHUNK_SIZE = 1000
+    JOB_BATCH_SIZE = 100
+    JOB_MAX_QUERIES = 1000000
+    JOB_RESULTS_PAGE_SIZE = 1000
+    
+    # Process pool for large search batches, each worker mapping the index snapshot
+    # (1 = search in the calling process)
+    SEARCH_WORKERS = 1
+    PARALLEL_SEARCH_MIN_BATCH = 200
+    
+    # ASGI serving (asgi.py): threads for ordinary requests, a bounded pool for reconciliation
+    # and extension requests, and how many of those may be running or queued before new ones get 503
+    ASGI_REQUEST_THREADS = 16
+    ASGI_SEARCH_THREADS = 2
+    ASGI_MAX_PENDING_SEARCHES = 64
+    
+    # JSON responses: reconciliation batches are searched STREAM_SEARCH_CHUNK queries at a time
+    # (PARALLEL_SEARCH_MIN_BATCH when SEARCH_WORKERS > 1, so chunks still reach the search pool) and
+    # streamed as each chunk finishes; bodies are gzip (or Brotli, when installed) compressed
+    # for clients that accept it
+    STREAM_SEARCH_CHUNK = 10
+    RESPONSE_CHUNK_BYTES = 16 * 1024
+    RESPONSE_COMPRESSION_ENABLED = True
+    RESPONSE_GZIP_LEVEL = 6
+    RESPONSE_BROTLI_QUALITY = 5
+    
+    # How pool processes are started for jobs and parallel search
+    WORKER_START_METHOD = 'spawn'
+    
+    # Per-query time budget for fuzzy scoring in milliseconds (None = unbounded)
+    SEARCH_TIME_BUDGET_MS = None
     
     # Preview templates
-    TEMPLATE_FOLDER = 'templates'
\ No newline at end of file
+    TEMPLATE_FOLDER = 'templates'
+    
+    # Candidate index configuration
+    INDEX_NGRAM_SIZE = 3
+    INDEX_MAX_CANDIDATES = 1000
+    INDEX_MIN_NGRAM_OVERLAP = 0.2
+    # Queries this short (normalized) skip the n-gram filter and score every row
+    INDEX_FULL_SCAN_MAX_LENGTH = 4
+    
+    # Memory-mapped snapshot of the candidate indexes written next to the database, so every
+    # worker process maps the same pages instead of rebuilding the indexes from SQLite
+    INDEX_SNAPSHOT_ENABLED = True
+    INDEX_SNAPSHOT_PATH = None  # Defaults to DATABASE_PATH + '.index'
+    
+    # Blocking keys (Double Metaphone codes, sorted tokens, surname + initial) for person names:
+    # rows sharing a key with a name query are scored alongside its n-gram candidates
+    BLOCKING_ENABLED = True
+    BLOCKING_MAX_BLOCK = 500
+    
+    # SQLite FTS5 token/prefix candidates, pre-ranked by bm25
+    FTS_ENABLED = True
+    FTS_MAX_CANDIDATES = 200
+    FTS_MIN_TOKEN_LENGTH = 2
+    
+    # Property-aware scoring: weight of each W3C query property in the final score
+    PROPERTY_WEIGHTS = {
+        'creator': 0.3,
+        'date': 0.2,
+        'location': 0.3,
+        'nationality': 0.15,
+        'medium': 0.15,
+        'classification': 0.1,
+        'department': 0.1,
+        'museum_type': 0.15
+    }
+    DEFAULT_PROPERTY_WEIGHT = 0.1
+    MIN_NAME_WEIGHT = 0.4
+    PROPERTY_YEAR_PENALTY = 5
+    PROPERTY_PREFILTER_MAX = 5000
+    
+    # Museum proximity: a location given as coordinates ("lat, lon[, radius km]") restricts
+    # candidates to the museums around it, scoring 100 at the point and 50 at the radius
+    GEO_DEFAULT_RADIUS_KM = 25
+    GEO_MAX_RADIUS_KM = 500
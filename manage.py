@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Maintenance commands for the reconciliation service
+
+Usage:
+    python manage.py build [--database PATH]
+    python manage.py sync
+    python manage.py startup-report [--runs N] [--database PATH]
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import subprocess
+
+# Run in a fresh interpreter so imports are timed cold, as a newly started worker sees them
+STARTUP_PROBE = '''
+import sys
+import time
+from config.settings import Config
+if len(sys.argv) > 1:
+    Config.DATABASE_PATH = sys.argv[1]
+started = time.perf_counter()
+from app import create_app
+app = create_app()
+report = dict(app.config['STARTUP_REPORT'])
+report['wall'] = round(time.perf_counter() - started, 3)
+print('STARTUP_REPORT ' + __import__('json').dumps(report))
+'''
+
+def build(args):
+    """Build the database and its index snapshot from the CSV files"""
+    from services.database_service import build_database
+
+    report = build_database(args.database)
+    print(json.dumps(report, indent=2))
+
+def sync(args):
+    """Apply changes in the CSV files to the existing database"""
+    from services.database_service import migrate_db, sync_db, maintenance_lock
+
+    with maintenance_lock():
+        migrate_db()
+        report = sync_db()
+    print(json.dumps(report, indent=2))
+
+def startup_report(args):
+    """Start the app in fresh processes and report where the startup time goes"""
+    root = os.path.dirname(os.path.abspath(__file__))
+    runs = []
+    for _ in range(args.runs):
+        started = time.perf_counter()
+        command = [sys.executable, '-c', STARTUP_PROBE] + ([os.path.abspath(args.database)] if args.database else [])
+        result = subprocess.run(command, cwd=root, capture_output=True, text=True)
+        elapsed = time.perf_counter() - started
+        lines = [line for line in result.stdout.splitlines() if line.startswith('STARTUP_REPORT ')]
+        if result.returncode != 0 or not lines:
+            print(result.stdout + result.stderr, file=sys.stderr)
+            sys.exit(result.returncode or 1)
+        report = json.loads(lines[-1][len('STARTUP_REPORT '):])
+        report['process'] = round(elapsed, 3)
+        runs.append(report)
+
+    print("=" * 60)
+    print(f"Startup time over {args.runs} fresh process(es), median seconds")
+    print("=" * 60)
+    for phase in runs[0]:
+        values = sorted(run[phase] for run in runs)
+        print(f"  {phase:<18} {values[len(values) // 2]:8.3f}")
+    print("  (process includes interpreter start; wall is app import plus create_app)")
+    print("=" * 60)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    build_parser = commands.add_parser('build', help=build.__doc__)
+    build_parser.add_argument('--database', help='database path (defaults to Config.DATABASE_PATH)')
+    build_parser.set_defaults(func=build)
+
+    sync_parser = commands.add_parser('sync', help=sync.__doc__)
+    sync_parser.set_defaults(func=sync)
+
+    report_parser = commands.add_parser('startup-report', help=startup_report.__doc__)
+    report_parser.add_argument('--runs', type=int, default=3, help='fresh processes to start')
+    report_parser.add_argument('--database', help='database path (defaults to Config.DATABASE_PATH)')
+    report_parser.set_defaults(func=startup_report)
+
+    args = parser.parse_args()
+    args.func(args)
+
+if __name__ == '__main__':
+    main()
@@ -1,6 +1,14 @@
+import json
+import itertools
 from flask import Blueprint, request, jsonify
-from services.search_service import search_entities
+from config.settings import Config
+from services.suggest_service import suggest_entities
+from services.extension_service import extend_entities, propose_properties
 from services.reconciliation_service import get_available_types, get_available_properties
+from services.metrics_service import set_entity_type
+from services.geo_service import parse_point
+from services.response_service import dumps, iter_json_object
+from routes.responses import streaming_json_response
 
 api_bp = Blueprint('api', __name__)
 
@@ -8,13 +16,18 @@ api_bp = Blueprint('api', __name__)
 def suggest_entity():
     """Entity suggestion endpoint for auto-completion"""
     prefix = request.args.get('prefix', '')
-    cursor = request.args.get('cursor', 0)
+    type_filter = request.args.get('type') or None
+    cursor = request.args.get('cursor', 0, type=int)
+    limit = request.args.get('limit', Config.SUGGEST_LIMIT, type=int)
+    # near=lat,lon[,radius km] narrows the suggestions to museums around a point
+    near = parse_point(request.args.get('near', ''))
+    set_entity_type(type_filter)
     
-    suggestions = search_entities(prefix, limit=20)
+    suggestions, next_cursor = suggest_entities(prefix, type_filter, cursor, limit, near)
     
     return jsonify({
-        "result": suggestions[:10],  # Return max 10 suggestions
-        "cursor": cursor + len(suggestions[:10])
+        "result": suggestions,
+        "cursor": next_cursor
     })
 
 @api_bp.route('/suggest/type', methods=['GET'])
@@ -37,10 +50,33 @@ def suggest_property():
     
     return jsonify({"result": filtered})
 
-@api_bp.route('/extend', methods=['GET'])
+@api_bp.route('/extend', methods=['GET', 'POST'])
 def extend():
-    """Extend endpoint for getting additional properties"""
-    return jsonify(get_available_properties())
+    """W3C data extension endpoint: property values for a list of reconciled ids"""
+    extend_query = request.values.get('extend')
+    if not extend_query:
+        # Without a query, list the properties available for extension
+        return jsonify(get_available_properties())
+    
+    try:
+        query = json.loads(extend_query)
+        ids = [str(entity_id) for entity_id in query.get('ids', [])]
+        property_ids = [prop['id'] if isinstance(prop, dict) else str(prop) for prop in query.get('properties', [])]
+    except (ValueError, AttributeError, KeyError, TypeError):
+        return jsonify({"error": "Invalid JSON in extend parameter"}), 400
+    
+    response = extend_entities(ids, property_ids)
+    # Rows are encoded a few at a time rather than into one large buffer
+    chunks = itertools.chain([b'{"meta":' + dumps(response['meta']) + b',"rows":'],
+                             iter_json_object(response['rows'].items()), [b'}'])
+    return streaming_json_response(chunks)
+
+@api_bp.route('/extend/propose', methods=['GET'])
+def extend_propose():
+    """Propose properties to extend entities of a type with"""
+    type_id = request.args.get('type') or None
+    limit = request.args.get('limit', type=int)
+    return jsonify(propose_properties(type_id, limit))
 
 @api_bp.route('/flyout', methods=['GET'])
 def flyout():
@@ -0,0 +1,74 @@
+import json
+from flask import Blueprint, request, jsonify, url_for
+from services.job_service import parse_ndjson, create_job, get_job, get_job_results, cancel_job
+
+job_bp = Blueprint('jobs', __name__)
+
+@job_bp.route('/jobs', methods=['POST'])
+def submit_job():
+    """Start an asynchronous reconciliation job from a JSON or NDJSON query set
+    
+    Accepts the same {query_id: query} object as /reconcile (as a JSON body, a "queries" form
+    field or an uploaded "file"), or NDJSON with one query object per line.
+    """
+    try:
+        queries = read_job_queries()
+        job = create_job(queries)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    
+    response = jsonify(job)
+    response.status_code = 202
+    response.headers['Location'] = url_for('jobs.job_status', job_id=job['id'])
+    return response
+
+def read_job_queries():
+    """Read the submitted query set from the request body, form or upload"""
+    upload = request.files.get('file')
+    if upload is not None:
+        text = upload.read().decode('utf-8')
+        is_ndjson = upload.filename.endswith(('.ndjson', '.jsonl'))
+    elif 'queries' in request.form:
+        text = request.form['queries']
+        is_ndjson = False
+    else:
+        text = request.get_data(as_text=True)
+        is_ndjson = request.mimetype in ('application/x-ndjson', 'application/jsonl')
+    
+    if is_ndjson:
+        return parse_ndjson(text)
+    try:
+        queries = json.loads(text)
+    except json.JSONDecodeError:
+        raise ValueError("Invalid JSON in queries")
+    if isinstance(queries, dict) and isinstance(queries.get('queries'), dict):
+        queries = queries['queries']
+    return queries
+
+@job_bp.route('/jobs/<job_id>', methods=['GET'])
+def job_status(job_id):
+    """Job status and progress"""
+    job = get_job(job_id)
+    if job is None:
+        return jsonify({"error": "Job not found"}), 404
+    return jsonify(job)
+
+@job_bp.route('/jobs/<job_id>/results', methods=['GET'])
+def job_results(job_id):
+    """Page of a job's results so far"""
+    cursor = request.args.get('cursor', 0, type=int)
+    limit = request.args.get('limit', type=int)
+    
+    results = get_job_results(job_id, cursor, limit)
+    if results is None:
+        return jsonify({"error": "Job not found"}), 404
+    return jsonify(results)
+
+@job_bp.route('/jobs/<job_id>', methods=['DELETE'])
+@job_bp.route('/jobs/<job_id>/cancel', methods=['POST'])
+def job_cancel(job_id):
+    """Cancel a queued or running job"""
+    job = cancel_job(job_id)
+    if job is None:
+        return jsonify({"error": "Job not found"}), 404
+    return jsonify(job)
\ No newline at end of file
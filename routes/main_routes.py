@@ -1,6 +1,9 @@
 from flask import Blueprint, request, jsonify
-from services.reconciliation_service import get_service_metadata, process_reconciliation_queries
+from services.reconciliation_service import (get_service_metadata, plan_reconciliation_queries,
+                                             iter_reconciliation_results)
 from services.database_service import get_database_stats
+from services.response_service import iter_json_object
+from routes.responses import streaming_json_response
 
 main_bp = Blueprint('main', __name__)
 
@@ -17,11 +20,18 @@ def reconcile():
         return jsonify({"error": "No queries provided"}), 400
     
     try:
-        results = process_reconciliation_queries(queries)
-        return jsonify(results)
+        requests, query_ids = plan_reconciliation_queries(queries)
     except ValueError as e:
         return jsonify({"error": str(e)}), 400
-    except Exception as e:
+    except Exception:
+        return jsonify({"error": "Internal server error"}), 500
+    
+    # Each chunk of queries is searched, encoded and sent before the next one starts;
+    # the first is searched before the response starts, so its failure is still a 500
+    try:
+        return streaming_json_response(iter_json_object(
+            iter_reconciliation_results(requests, query_ids)))
+    except Exception:
         return jsonify({"error": "Internal server error"}), 500
 
 @main_bp.route('/stats')
@@ -0,0 +1,43 @@
+from flask import Blueprint, Response, request
+from config.settings import Config
+from services.metrics_service import start_request, finish_request, render_metrics
+from services.cache_service import result_cache, entity_cache, preview_cache
+from services.connection_service import get_data_version
+
+metrics_bp = Blueprint('metrics', __name__)
+
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+@metrics_bp.before_app_request
+def start_request_timer():
+    """Start timing every request the app serves"""
+    if Config.METRICS_ENABLED:
+        start_request()
+
+@metrics_bp.after_app_request
+def record_request_metrics(response):
+    """Record the request's latency under its route (not its raw path, to bound the label values)"""
+    endpoint = request.url_rule.rule if request.url_rule is not None else 'unmatched'
+    if response.is_streamed:
+        # Streamed bodies are produced after this hook, so time them until the response is closed
+        method, status = request.method, response.status_code
+        response.call_on_close(lambda: finish_request(endpoint, method, status))
+    else:
+        finish_request(endpoint, request.method, response.status_code)
+    return response
+
+@metrics_bp.route('/metrics')
+def metrics():
+    """Prometheus metrics for this worker process"""
+    caches = {'results': result_cache, 'entities': entity_cache, 'previews': preview_cache}
+    cache_stats = {name: cache.stats() for name, cache in caches.items()}
+    gauges = {
+        'reconciliation_cache_entries': ("Entries held per cache",
+                                         {(('cache', name),): stats['entries'] for name, stats in cache_stats.items()}),
+        'reconciliation_cache_bytes': ("Approximate bytes held per cache",
+                                       {(('cache', name),): stats['bytes'] for name, stats in cache_stats.items()}),
+        'reconciliation_cache_hit_ratio': ("Hit ratio per cache since startup",
+                                           {(('cache', name),): stats['hit_ratio'] for name, stats in cache_stats.items()}),
+        'reconciliation_data_version': ("Database data version", {(): get_data_version()})
+    }
+    return Response(render_metrics(gauges), content_type=PROMETHEUS_CONTENT_TYPE)
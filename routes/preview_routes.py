@@ -1,22 +1,56 @@
-from flask import Blueprint, render_template
-from services.search_service import get_entity_by_id
+import hashlib
+from datetime import datetime, timezone
+from flask import Blueprint, render_template, request, make_response
+from config.settings import Config
+from services.search_service import get_entity_by_id, type_for_id
+from services.connection_service import read_connection
+from services.relation_service import artist_works
+from services.cache_service import preview_cache, current_data_version
+from services.metrics_service import set_entity_type
 
 preview_bp = Blueprint('preview', __name__, template_folder='../templates')
 
 @preview_bp.route('/preview/<entity_id>')
 def preview(entity_id):
-    """Preview endpoint for entity details with enhanced information"""
-    entity, entity_type = get_entity_by_id(entity_id)
-    print(entity_type)
+    """Preview endpoint for entity details with enhanced information
     
-    if not entity:
-        return "Entity not found", 404
+    Rendered previews are cached per data version and sent with an ETag and Last-Modified,
+    so repeated hovers are answered without the database or the templates.
+    """
+    set_entity_type(type_for_id(entity_id))
+    cached = None
+    if Config.PREVIEW_CACHE_ENABLED:
+        preview_cache.check_version(current_data_version())
+        cached = preview_cache.get(entity_id)
     
+    if cached is None:
+        entity, entity_type = get_entity_by_id(entity_id)
+        
+        if not entity:
+            return "Entity not found", 404
+        
+        html = render_preview(entity, entity_type)
+        etag = hashlib.sha1(html.encode('utf-8')).hexdigest()
+        cached = (html, etag, datetime.now(timezone.utc).replace(microsecond=0))
+        if Config.PREVIEW_CACHE_ENABLED:
+            preview_cache.put(entity_id, cached, len(html) * 2)
+    
+    html, etag, last_modified = cached
+    response = make_response(html)
+    response.set_etag(etag)
+    response.last_modified = last_modified
+    response.cache_control.max_age = Config.PREVIEW_MAX_AGE_SECONDS
+    return response.make_conditional(request)
+
+def render_preview(entity, entity_type):
+    """Render the preview template for an entity's type"""
     # Generate appropriate template based on entity type
     if entity_type == 'museum':
         return render_template('museum_preview.html', entity=entity)
     elif entity_type == 'artist':
-        return render_template('artist_preview.html', entity=entity)
+        with read_connection() as conn:
+            works, work_count = artist_works(conn.cursor(), entity['id'])
+        return render_template('artist_preview.html', entity=entity, works=works, work_count=work_count)
     else:  # artifact
         return render_template('artifact_preview.html', entity=entity)
 
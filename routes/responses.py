@@ -0,0 +1,37 @@
+from typing import Iterable, Iterator
+from flask import Response, request, stream_with_context
+from config.settings import Config
+from services.response_service import negotiate_encoding, compress_chunks
+
+def streaming_json_response(chunks: Iterable[bytes]) -> Response:
+    """JSON response sent as its chunks are produced, so large payloads are never held whole
+
+    The first chunk is produced here, before the response starts, so a failure there raises to
+    the caller and can still be answered with an error status.
+    """
+    chunks = iter(chunks)
+    first = next(chunks, b'')
+    encoding = negotiate_encoding(request.headers.get('Accept-Encoding', ''))
+    body = compress_chunks(abort_on_error(first, chunks), encoding)
+    response = Response(stream_with_context(body), mimetype='application/json')
+    set_encoding_headers(response, encoding)
+    return response
+
+def abort_on_error(first: bytes, chunks: Iterator[bytes]) -> Iterator[bytes]:
+    """Chunks after the first, re-raising a failure so the server drops the connection
+
+    Once the status is sent, ending the body normally would pass truncated JSON off as a
+    complete 200 response; an aborted transfer tells the client the response failed.
+    """
+    yield first
+    try:
+        yield from chunks
+    except Exception as e:
+        print(f"Aborting streamed response: {e}")
+        raise
+
+def set_encoding_headers(response: Response, encoding):
+    if encoding is not None:
+        response.headers['Content-Encoding'] = encoding
+    if Config.RESPONSE_COMPRESSION_ENABLED:
+        response.vary.add('Accept-Encoding')
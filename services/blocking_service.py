@@ -0,0 +1,152 @@
+import sqlite3
+from typing import List, Optional, Set, Tuple
+from config.settings import Config
+from utils.text_utils import normalize_text, fold_ascii
+from utils.phonetic_utils import double_metaphone
+
+# Person-name field whose blocking keys are stored per table
+BLOCKING_FIELDS = {
+    'artists': 'name',
+    'artifacts': 'artist'
+}
+
+BLOCKING_TABLE = 'blocking_keys'
+
+# Stored with each table's keys; bump it when the derived keys change so migrate_db re-derives them
+BLOCKING_KEYS_VERSION = 2
+# Marker row holding that version; no query yields a 'v:' key, so it never joins a block
+VERSION_KEY = f'v:{BLOCKING_KEYS_VERSION}'
+
+def name_tokens(name: str) -> List[str]:
+    """Normalized, ASCII-folded tokens of a name"""
+    return fold_ascii(normalize_text(name)).split()
+
+def phonetic_codes(tokens: List[str]) -> Set[str]:
+    """Sorted Double Metaphone codes of the tokens, once with primary and once with alternate codes"""
+    codes = [double_metaphone(token) for token in tokens]
+    keys = set()
+    for variant in (0, 1):
+        parts = sorted(code[variant] for code in codes if code[variant])
+        if parts:
+            keys.add(' '.join(parts))
+    return keys
+
+def surname_keys(surname: List[str], given: List[str]) -> Set[str]:
+    """Surname, surname plus first initial and the surname's phonetic codes"""
+    if not surname:
+        return set()
+    keys = {'s:' + ' '.join(surname)}
+    if given:
+        keys.add(f"s:{' '.join(surname)} {given[0][0]}")
+    keys.update('ps:' + code for code in phonetic_codes(surname))
+    return keys
+
+def person_keys(surname: List[str], given: List[str]) -> Set[str]:
+    """Blocking keys of one person name split into surname and given-name tokens
+
+    sorted tokens  - "Picasso, Pablo" and "Pablo Picasso" share t:pablo picasso
+    phonetic codes - "Pablo Picaso" and "Pablo Picasso" share p:PKS PPL
+    surname keys   - "P. Picasso" and "Pablo Picasso" share s:picasso p
+    """
+    tokens = given + surname
+    if not tokens:
+        return set()
+    keys = {'t:' + ' '.join(sorted(tokens))}
+    keys.update('p:' + code for code in phonetic_codes(tokens))
+    keys.update(surname_keys(surname, given))
+    return keys
+
+def field_keys(table: str, value: str) -> Set[str]:
+    """Blocking keys stored for a row's name field, read as "Given Surname"
+
+    The artworks' artist field lists several people separated by commas.
+    """
+    if not value:
+        return set()
+    names = str(value).split(',') if table == 'artifacts' else [str(value)]
+    keys = set()
+    for name in names:
+        tokens = name_tokens(name)
+        keys.update(person_keys(tokens[-1:], tokens[:-1]))
+    return keys
+
+def query_keys(query: str) -> Set[str]:
+    """Blocking keys of a name query, read as "Surname, Given" or else in both orders"""
+    text = str(query or '')
+    if ',' in text:
+        surname, _, given = text.partition(',')
+        return person_keys(name_tokens(surname), name_tokens(given))
+
+    tokens = name_tokens(text)
+    keys = person_keys(tokens[-1:], tokens[:-1])
+    if len(tokens) > 1:
+        keys.update(person_keys(tokens[:1], tokens[1:]))
+    return keys
+
+def create_blocking_table(conn: sqlite3.Connection):
+    conn.execute(f'''CREATE TABLE IF NOT EXISTS {BLOCKING_TABLE}
+                     (table_name TEXT NOT NULL,
+                      key TEXT NOT NULL,
+                      entity_rowid INTEGER NOT NULL,
+                      PRIMARY KEY (table_name, key, entity_rowid)) WITHOUT ROWID''')
+
+def build_blocking_keys(conn: sqlite3.Connection, table: str) -> int:
+    """(Re)derive the blocking keys of every row of a table; returns the number of keys stored"""
+    field = BLOCKING_FIELDS[table]
+    create_blocking_table(conn)
+    conn.execute(f'DELETE FROM {BLOCKING_TABLE} WHERE table_name = ?', (table,))
+
+    def rows():
+        for rowid, value in conn.execute(f'SELECT rowid, {field} FROM {table}').fetchall():
+            for key in field_keys(table, value):
+                yield table, key, rowid
+
+    before = conn.total_changes
+    conn.executemany(f'INSERT OR IGNORE INTO {BLOCKING_TABLE} VALUES (?, ?, ?)', rows())
+    count = conn.total_changes - before
+    conn.execute(f'INSERT OR IGNORE INTO {BLOCKING_TABLE} VALUES (?, ?, 0)', (table, VERSION_KEY))
+    return count
+
+def ensure_blocking_keys(conn: sqlite3.Connection) -> bool:
+    """Derive blocking keys for tables that have rows but no current keys; True if any were built"""
+    create_blocking_table(conn)
+    built = False
+    for table in BLOCKING_FIELDS:
+        has_rows = conn.execute(f'SELECT 1 FROM {table} LIMIT 1').fetchone()
+        has_keys = conn.execute(f'SELECT 1 FROM {BLOCKING_TABLE} WHERE table_name = ? AND key = ?',
+                                (table, VERSION_KEY)).fetchone()
+        if has_rows and not has_keys:
+            count = build_blocking_keys(conn, table)
+            print(f"Derived {count} blocking keys for {table}")
+            built = True
+    conn.commit()
+    return built
+
+def block_rowids(c, table: str, query: str, max_block: Optional[int] = None) -> Optional[Tuple[List[int], Set[int]]]:
+    """Rowids sharing a blocking key with a name query (in table order), and those of them with
+    exactly the query's tokens in another order ("Picasso, Pablo" for Pablo Picasso)
+
+    Returns None when blocking does not apply: the table has no name keys, the query yields
+    none, nothing matches, or the block is larger than max_block (Config.BLOCKING_MAX_BLOCK).
+    """
+    if table not in BLOCKING_FIELDS:
+        return None
+    keys = sorted(query_keys(query))
+    if not keys:
+        return None
+    max_block = max_block or Config.BLOCKING_MAX_BLOCK
+
+    placeholders = ','.join('?' * len(keys))
+    c.execute(f'SELECT entity_rowid, key FROM {BLOCKING_TABLE} '
+              f'WHERE table_name = ? AND key IN ({placeholders})', [table] + keys)
+    rowids = set()
+    same_tokens = set()
+    for rowid, key in c.fetchall():
+        rowids.add(rowid)
+        if key.startswith('t:'):
+            same_tokens.add(rowid)
+        if len(rowids) > max_block:
+            return None
+    if not rowids:
+        return None
+    return sorted(rowids), same_tokens
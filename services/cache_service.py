@@ -0,0 +1,148 @@
+import json
+import time
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+from config.settings import Config
+from services.connection_service import get_data_version
+
+class ResultCache:
+    """Thread-safe LRU cache with a TTL and a memory cap, tied to one database data version"""
+
+    def __init__(self, max_entries: int, max_bytes: int, ttl_seconds: Optional[float]):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.entries = OrderedDict()
+        self.total_bytes = 0
+        self.data_version = None
+        self.lock = threading.Lock()
+        self.counters = {
+            'hits': 0,
+            'misses': 0,
+            'evictions': 0,
+            'expirations': 0,
+            'invalidations': 0
+        }
+
+    def check_version(self, data_version: Any):
+        """Drop every entry if the database was rebuilt since they were cached"""
+        with self.lock:
+            if data_version != self.data_version:
+                if self.entries:
+                    self.counters['invalidations'] += 1
+                self.entries.clear()
+                self.total_bytes = 0
+                self.data_version = data_version
+
+    def get(self, key: Hashable):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                self.counters['misses'] += 1
+                return None
+
+            value, size, expires_at = entry
+            if expires_at is not None and time.monotonic() > expires_at:
+                self._remove(key)
+                self.counters['expirations'] += 1
+                self.counters['misses'] += 1
+                return None
+
+            self.entries.move_to_end(key)
+            self.counters['hits'] += 1
+            return value
+
+    def put(self, key: Hashable, value: Any, size: Optional[int] = None):
+        if size is None:
+            size = estimate_size(value)
+        if size > self.max_bytes:
+            return
+
+        expires_at = time.monotonic() + self.ttl_seconds if self.ttl_seconds else None
+        with self.lock:
+            if key in self.entries:
+                self._remove(key)
+            self.entries[key] = (value, size, expires_at)
+            self.total_bytes += size
+
+            # Evict least recently used entries until both caps hold
+            while len(self.entries) > self.max_entries or self.total_bytes > self.max_bytes:
+                oldest = next(iter(self.entries))
+                self._remove(oldest)
+                self.counters['evictions'] += 1
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.total_bytes = 0
+            self.data_version = None
+
+    def _remove(self, key: Hashable):
+        _, size, _ = self.entries.pop(key)
+        self.total_bytes -= size
+
+    def stats(self) -> Dict[str, Any]:
+        with self.lock:
+            stats = dict(self.counters)
+            stats['entries'] = len(self.entries)
+            stats['bytes'] = self.total_bytes
+            stats['max_bytes'] = self.max_bytes
+            stats['data_version'] = self.data_version
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_ratio'] = round(stats['hits'] / lookups, 4) if lookups else 0.0
+        return stats
+
+def estimate_size(value: Any) -> int:
+    """Approximate memory held by a cached value from its JSON size"""
+    return len(json.dumps(value, default=str)) * 2
+
+result_cache = ResultCache(Config.RESULT_CACHE_MAX_ENTRIES, Config.RESULT_CACHE_MAX_BYTES,
+                           Config.RESULT_CACHE_TTL_SECONDS)
+
+# Recently looked-up entities and rendered previews, kept until the data version changes
+entity_cache = ResultCache(Config.ENTITY_CACHE_MAX_ENTRIES, Config.ENTITY_CACHE_MAX_BYTES, None)
+preview_cache = ResultCache(Config.PREVIEW_CACHE_MAX_ENTRIES, Config.PREVIEW_CACHE_MAX_BYTES, None)
+
+_data_version_lock = threading.Lock()
+_data_version = None
+_data_version_checked_at = None
+
+def current_data_version():
+    """Database data version, re-read at most every Config.DATA_VERSION_CHECK_SECONDS
+    
+    Lets repeated entity and preview lookups be answered without touching the database.
+    """
+    global _data_version, _data_version_checked_at
+    now = time.monotonic()
+    with _data_version_lock:
+        if _data_version_checked_at is not None and now - _data_version_checked_at < Config.DATA_VERSION_CHECK_SECONDS:
+            return _data_version
+    
+    data_version = get_data_version()
+    with _data_version_lock:
+        _data_version = data_version
+        _data_version_checked_at = now
+    return data_version
+
+def get_result_cache_stats() -> Dict[str, Any]:
+    """Get hit/miss/eviction counters for the reconciliation result cache"""
+    stats = result_cache.stats()
+    stats['enabled'] = Config.RESULT_CACHE_ENABLED
+    return stats
+
+def get_preview_cache_stats() -> Dict[str, Any]:
+    """Get hit/miss/eviction counters for the entity and rendered-preview caches"""
+    return {
+        'entities': dict(entity_cache.stats(), enabled=Config.ENTITY_CACHE_ENABLED),
+        'previews': dict(preview_cache.stats(), enabled=Config.PREVIEW_CACHE_ENABLED)
+    }
+
+def clear_result_cache():
+    """Forget every cached result, entity and preview in this process"""
+    global _data_version_checked_at
+    result_cache.clear()
+    entity_cache.clear()
+    preview_cache.clear()
+    with _data_version_lock:
+        _data_version_checked_at = None
\ No newline at end of file
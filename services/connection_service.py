@@ -0,0 +1,98 @@
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Optional
+from urllib.parse import quote
+from config.settings import Config
+
+# One pooled read-only connection per thread (and per worker process)
+_local = threading.local()
+_pool_lock = threading.Lock()
+_pool_generation = 0
+_pool_stats = {
+    'opened': 0,
+    'reused': 0,
+    'closed': 0,
+    'open_connections': 0
+}
+
+def _count(stat: str, amount: int = 1):
+    with _pool_lock:
+        _pool_stats[stat] += amount
+
+def open_read_connection() -> sqlite3.Connection:
+    """Open a tuned read-only connection to the reconciliation database"""
+    uri = f"file:{quote(os.path.abspath(Config.DATABASE_PATH))}?mode=ro"
+    conn = sqlite3.connect(uri, uri=True, check_same_thread=False,
+                           cached_statements=Config.DB_CACHED_STATEMENTS)
+    conn.row_factory = sqlite3.Row
+    conn.execute(f'PRAGMA cache_size = -{int(Config.DB_CACHE_SIZE_KB)}')
+    conn.execute(f'PRAGMA mmap_size = {int(Config.DB_MMAP_SIZE)}')
+    conn.execute('PRAGMA query_only = 1')
+    _count('opened')
+    _count('open_connections')
+    return conn
+
+def _close(conn: sqlite3.Connection):
+    conn.close()
+    _count('closed')
+    _count('open_connections', -1)
+
+def _pooled_connection() -> sqlite3.Connection:
+    """Get this thread's connection, reopening it after a rebuild or a fork"""
+    conn = getattr(_local, 'conn', None)
+    if conn is not None:
+        if _local.generation == _pool_generation and _local.pid == os.getpid():
+            _count('reused')
+            return conn
+        if _local.pid == os.getpid():
+            _close(conn)
+        _local.conn = None
+
+    conn = open_read_connection()
+    _local.conn = conn
+    _local.generation = _pool_generation
+    _local.pid = os.getpid()
+    return conn
+
+@contextmanager
+def read_connection():
+    """Context manager yielding a read-only connection, pooled per thread when enabled"""
+    if Config.DB_POOL_ENABLED:
+        yield _pooled_connection()
+        return
+
+    conn = open_read_connection()
+    try:
+        yield conn
+    finally:
+        _close(conn)
+
+def reset_connection_pool():
+    """Make every thread reopen its connection, e.g. after the database is rebuilt"""
+    global _pool_generation
+    with _pool_lock:
+        _pool_generation += 1
+
+    conn = getattr(_local, 'conn', None)
+    if conn is not None and _local.pid == os.getpid():
+        _close(conn)
+    _local.conn = None
+
+def get_data_version(conn: Optional[sqlite3.Connection] = None) -> int:
+    """Data-version stamp that init_db bumps (stored as PRAGMA user_version) every time data changes"""
+    if conn is None:
+        with read_connection() as conn:
+            return get_data_version(conn)
+    return conn.execute('PRAGMA user_version').fetchone()[0]
+
+def get_connection_pool_stats() -> dict:
+    """Get connection reuse counters for this worker process"""
+    with _pool_lock:
+        stats = dict(_pool_stats)
+    requests = stats['opened'] + stats['reused']
+    stats['reuse_ratio'] = round(stats['reused'] / requests, 4) if requests else 0.0
+    stats['pooled'] = Config.DB_POOL_ENABLED
+    stats['pid'] = os.getpid()
+    return stats
\ No newline at end of file
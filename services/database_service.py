@@ -1,60 +1,213 @@
+import os
+import sys
+import time
+import hashlib
 import sqlite3
-import pandas as pd
+from contextlib import contextmanager
+from typing import Optional
 from config.settings import Config
-from utils.text_utils import clean_float_value, clean_numeric_value
+from utils.text_utils import clean_float_value, clean_numeric_value, normalize_text
+from services.index_service import (SEARCHABLE_FIELDS, fts_table, normalized_column, load_search_indexes,
+                                    reset_search_indexes, ensure_index_snapshot, snapshot_path)
+from services.connection_service import (read_connection, reset_connection_pool, get_connection_pool_stats,
+                                         get_data_version)
+from services.cache_service import clear_result_cache, get_result_cache_stats, get_preview_cache_stats
+from services.blocking_service import BLOCKING_FIELDS, BLOCKING_TABLE, ensure_blocking_keys, build_blocking_keys
+from services.geo_service import GEO_TABLE, ensure_geo_index, build_geo_index
+from services.relation_service import CREATOR_TABLE, ensure_creator_edges, build_creator_edges
 
-def load_csv_data():
-    """Load data from CSV files"""
-    data = {}
+try:
+    import fcntl
+except ImportError:  # Not available on Windows; startup maintenance is then not serialized
+    fcntl = None
+
+# CSV columns read for each dataset; everything else in the files is skipped
+CSV_COLUMNS = {
+    'museums': ['Museum ID', 'Museum Name', 'Legal Name', 'Alternate Name', 'Museum Type',
+                'Street Address (Administrative Location)', 'City (Administrative Location)',
+                'State (Administrative Location)', 'Zip Code (Administrative Location)', 'Phone Number',
+                'Latitude', 'Longitude', 'County Code (FIPS)', 'Region Code (AAM)', 'Revenue'],
+    'artists': ['id', 'name', 'artist_bio', 'nationality', 'gender', 'birth_year', 'death_year', 'wiki_qid', 'ulan'],
+    'artifacts': ['Title', 'Artist', 'ConstituentID', 'ArtistBio', 'Nationality', 'BeginDate', 'EndDate',
+                  'Gender', 'Date', 'Medium', 'Dimensions', 'CreditLine', 'AccessionNumber', 'Classification',
+                  'Department', 'DateAcquired', 'ObjectID', 'URL', 'ImageURL', 'OnView',
+                  'Height (cm)', 'Width (cm)', 'Length (cm)', 'Weight (kg)']
+}
+
+def iter_csv_records(name: str, strict: bool = False):
+    """Stream records of a CSV file chunk by chunk, reading only the columns we use
     
-    # Load museums CSV
-    try:
-        museums_df = pd.read_csv(Config.CSV_FILES['museums'])
-        data['museums'] = museums_df.fillna('').to_dict('records')
-        print(f"Loaded {len(data['museums'])} museums from CSV")
-    except FileNotFoundError:
-        print(f"Warning: {Config.CSV_FILES['museums']} not found. Using empty dataset.")
-        data['museums'] = []
-    except Exception as e:
-        print(f"Error loading museums CSV: {e}")
-        data['museums'] = []
+    Read errors are reported and end the stream, unless strict is set (used by sync_db,
+    where a truncated stream would look like deleted rows).
+    """
+    import pandas as pd
     
-    # Load artists CSV
+    path = Config.CSV_FILES[name]
+    wanted = set(CSV_COLUMNS[name])
     try:
-        artists_df = pd.read_csv(Config.CSV_FILES['artists'])
-        data['artists'] = artists_df.fillna('').to_dict('records')
-        print(f"Loaded {len(data['artists'])} artists from CSV")
+        reader = pd.read_csv(path, chunksize=Config.CSV_CHUNK_SIZE, dtype=str,
+                             usecols=lambda column: column in wanted)
+        for chunk in reader:
+            yield from chunk.fillna('').to_dict('records')
     except FileNotFoundError:
-        print(f"Warning: {Config.CSV_FILES['artists']} not found. Using empty dataset.")
-        data['artists'] = []
+        if strict:
+            raise
+        print(f"Warning: {path} not found. Using empty dataset.")
     except Exception as e:
-        print(f"Error loading artists CSV: {e}")
-        data['artists'] = []
+        if strict:
+            raise
+        print(f"Error loading {name} CSV: {e}")
+
+def entity_id(prefix: str, natural_key, number: int) -> str:
+    """Stable entity ID from the CSV's natural key, falling back to the row number
     
-    # Load artifacts CSV
-    try:
-        artifacts_df = pd.read_csv(Config.CSV_FILES['artifacts'])
-        data['artifacts'] = artifacts_df.fillna('').to_dict('records')
-        print(f"Loaded {len(data['artifacts'])} artifacts from CSV")
-    except FileNotFoundError:
-        print(f"Warning: {Config.CSV_FILES['artifacts']} not found. Using empty dataset.")
-        data['artifacts'] = []
-    except Exception as e:
-        print(f"Error loading artifacts CSV: {e}")
-        data['artifacts'] = []
+    Numeric keys are zero-padded so artists.csv ids keep their ARTIST_000123 form.
+    """
+    key = str(natural_key).strip() if natural_key is not None else ''
+    if not key:
+        return f'{prefix}_{number:06d}'
+    if key.isdigit():
+        return f'{prefix}_{int(key):06d}'
+    return f'{prefix}_{key}'
+
+def museum_record(museum, number: int) -> tuple:
+    """Build a museums row from a CSV record"""
+    museum_id = entity_id('MUSEUM', museum.get('Museum ID'), number)
+    return (
+        museum_id,
+        museum.get('Museum Name', ''),
+        museum.get('Legal Name', ''),
+        museum.get('Alternate Name', ''),
+        museum.get('Museum Type', ''),
+        museum.get('Street Address (Administrative Location)', ''),
+        museum.get('City (Administrative Location)', ''),
+        museum.get('State (Administrative Location)', ''),
+        museum.get('Zip Code (Administrative Location)', ''),
+        museum.get('Phone Number', ''),
+        clean_float_value(museum.get('Latitude')),
+        clean_float_value(museum.get('Longitude')),
+        museum.get('County Code (FIPS)', ''),
+        museum.get('Region Code (AAM)', ''),
+        clean_numeric_value(museum.get('Revenue')) or 0,
+        'museum'
+    )
+
+def artist_record(artist, number: int) -> tuple:
+    """Build an artists row from a CSV record"""
+    artist_id = entity_id('ARTIST', artist.get('id'), number)
+    return (
+        artist_id,
+        artist.get('name', ''),
+        artist.get('artist_bio', ''),
+        artist.get('nationality', ''),
+        artist.get('gender', ''),
+        clean_numeric_value(artist.get('birth_year')),
+        clean_numeric_value(artist.get('death_year')),
+        artist.get('wiki_qid', ''),
+        artist.get('ulan', ''),
+        'person'
+    )
+
+def artifact_record(artifact, number: int) -> tuple:
+    """Build an artifacts row from a CSV record"""
+    artifact_id = entity_id('ARTIFACT', artifact.get('ObjectID'), number)
+    return (
+        artifact_id,
+        artifact.get('Title', ''),
+        artifact.get('Artist', ''),
+        artifact.get('ConstituentID', ''),
+        artifact.get('ArtistBio', ''),
+        artifact.get('Nationality', ''),
+        clean_numeric_value(artifact.get('BeginDate')),
+        clean_numeric_value(artifact.get('EndDate')),
+        artifact.get('Gender', ''),
+        artifact.get('Date', ''),
+        artifact.get('Medium', ''),
+        artifact.get('Dimensions', ''),
+        artifact.get('CreditLine', ''),
+        artifact.get('AccessionNumber', ''),
+        artifact.get('Classification', ''),
+        artifact.get('Department', ''),
+        artifact.get('DateAcquired', ''),
+        str(artifact.get('ObjectID', '')),
+        artifact.get('URL', ''),
+        artifact.get('ImageURL', ''),
+        artifact.get('OnView', ''),
+        clean_float_value(artifact.get('Height (cm)')),
+        clean_float_value(artifact.get('Width (cm)')),
+        clean_float_value(artifact.get('Length (cm)')),
+        clean_float_value(artifact.get('Weight (kg)')),
+        'artifact'
+    )
+
+# (CSV dataset, row builder) for each entity table, in load order
+TABLE_SOURCES = {
+    'museums': ('museums', museum_record),
+    'artists': ('artists', artist_record),
+    'artifacts': ('artifacts', artifact_record)
+}
+
+# Columns derived from the CSV fields rather than read from them
+DERIVED_COLUMNS = ('search_blob', 'row_hash')
+
+def row_layout(conn, table: str):
+    """(insert columns, positions of the searchable fields) for rows built by complete_row"""
+    base_columns = [column for column in get_table_columns(conn, table)
+                    if column not in DERIVED_COLUMNS and not column.endswith('_norm')]
+    searchable_positions = [base_columns.index(field) for field in SEARCHABLE_FIELDS[table]]
+    insert_columns = (base_columns + [normalized_column(field) for field in SEARCHABLE_FIELDS[table]]
+                      + list(DERIVED_COLUMNS))
+    return insert_columns, searchable_positions
+
+def complete_row(row: tuple, searchable_positions: list) -> tuple:
+    """Append normalized search columns, the search blob and the row hash to a built row"""
+    row_hash = hashlib.sha1(repr(row).encode('utf-8')).hexdigest()
+    return row + normalized_row([row[position] for position in searchable_positions]) + (row_hash,)
+
+def insert_csv_rows(conn, table: str) -> int:
+    """Stream a CSV into its table with normalized search columns computed on the way"""
+    name, build_record = TABLE_SOURCES[table]
+    insert_columns, searchable_positions = row_layout(conn, table)
+    
+    def rows():
+        for number, record in enumerate(iter_csv_records(name), 1):
+            yield complete_row(build_record(record, number), searchable_positions)
     
-    return data
+    # Rows repeating a natural key are skipped; the first occurrence wins
+    before = conn.total_changes
+    conn.executemany(f"INSERT OR IGNORE INTO {table} ({', '.join(insert_columns)}) "
+                     f"VALUES ({','.join('?' * len(insert_columns))})", rows())
+    return conn.total_changes - before
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process in MB (0 where unsupported)"""
+    try:
+        import resource
+    except ImportError:
+        return 0.0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and kilobytes on Linux
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
 
 def init_db():
-    """Initialize SQLite database with museum and cultural heritage data from CSV files"""
+    """Initialize SQLite database with museum and cultural heritage data from CSV files
+    
+    Returns a load report with row counts, wall time and peak RSS per table.
+    """
     conn = sqlite3.connect(Config.DATABASE_PATH)
     c = conn.cursor()
     
     # Drop existing tables for clean initialization
+    for table in SEARCHABLE_FIELDS:
+        c.execute(f'DROP TABLE IF EXISTS {fts_table(table)}')
     c.execute('DROP TABLE IF EXISTS artifacts')
     c.execute('DROP TABLE IF EXISTS museums')
     c.execute('DROP TABLE IF EXISTS artists')
     c.execute('DROP TABLE IF EXISTS artifact_types')
+    c.execute('DROP TABLE IF EXISTS csv_fingerprints')
+    c.execute(f'DROP TABLE IF EXISTS {BLOCKING_TABLE}')
+    c.execute(f'DROP TABLE IF EXISTS {GEO_TABLE}')
+    c.execute(f'DROP TABLE IF EXISTS {CREATOR_TABLE}')
     
     # Create museums table with fields from CSV
     c.execute('''CREATE TABLE museums
@@ -123,99 +276,31 @@ def init_db():
                   name TEXT NOT NULL,
                   parent_type TEXT)''')
     
-    # Load data from CSV files
-    csv_data = load_csv_data()
-    
-    # Insert museums data
-    museums_data = []
-    for i, museum in enumerate(csv_data['museums']):
-        # museum_id = str(museum.get('Museum ID', f'MUS_{i+1:06d}'))
-        museum_id = f'MUSEUM_{len(museums_data)+1:06d}'
-        museums_data.append((
-            museum_id,
-            museum.get('Museum Name', ''),
-            museum.get('Legal Name', ''),
-            museum.get('Alternate Name', ''),
-            museum.get('Museum Type', ''),
-            museum.get('Street Address (Administrative Location)', ''),
-            museum.get('City (Administrative Location)', ''),
-            museum.get('State (Administrative Location)', ''),
-            museum.get('Zip Code (Administrative Location)', ''),
-            museum.get('Phone Number', ''),
-            clean_float_value(museum.get('Latitude')),
-            clean_float_value(museum.get('Longitude')),
-            museum.get('County Code (FIPS)', ''),
-            museum.get('Region Code (AAM)', ''),
-            clean_numeric_value(museum.get('Revenue')) or 0,
-            'museum'
-        ))
-    
-    if museums_data:
-        c.executemany('''INSERT INTO museums VALUES 
-                         (?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?)''', museums_data)
-        print(f"Inserted {len(museums_data)} museums into database")
-    
-    # Insert artists data
-    artists_data = []
-    for artist in csv_data['artists']:
-        # artist_id = str(artist.get('id', f'ART_{len(artists_data)+1:06d}'))
-        artist_id = f'ARTIST_{len(artists_data)+1:06d}'
-        artists_data.append((
-            artist_id,
-            artist.get('name', ''),
-            artist.get('artist_bio', ''),
-            artist.get('nationality', ''),
-            artist.get('gender', ''),
-            clean_numeric_value(artist.get('birth_year')),
-            clean_numeric_value(artist.get('death_year')),
-            artist.get('wiki_qid', ''),
-            artist.get('ulan', ''),
-            'person'
-        ))
-    
-    if artists_data:
-        c.executemany('''INSERT INTO artists VALUES 
-                         (?,?,?,?,?,?,?,?,?,?)''', artists_data)
-        print(f"Inserted {len(artists_data)} artists into database")
-    
-    # Insert artifacts data
-    artifacts_data = []
-    for i, artifact in enumerate(csv_data['artifacts']):
-        # artifact_id = str(artifact.get('ObjectID', f'OBJ_{i+1:06d}'))
-        artifact_id = f'ARTIFACT_{len(artifacts_data)+1:06d}'
-        artifacts_data.append((
-            artifact_id,
-            artifact.get('Title', ''),
-            artifact.get('Artist', ''),
-            artifact.get('ConstituentID', ''),
-            artifact.get('ArtistBio', ''),
-            artifact.get('Nationality', ''),
-            clean_numeric_value(artifact.get('BeginDate')),
-            clean_numeric_value(artifact.get('EndDate')),
-            artifact.get('Gender', ''),
-            artifact.get('Date', ''),
-            artifact.get('Medium', ''),
-            artifact.get('Dimensions', ''),
-            artifact.get('CreditLine', ''),
-            artifact.get('AccessionNumber', ''),
-            artifact.get('Classification', ''),
-            artifact.get('Department', ''),
-            artifact.get('DateAcquired', ''),
-            str(artifact.get('ObjectID', '')),
-            artifact.get('URL', ''),
-            artifact.get('ImageURL', ''),
-            artifact.get('OnView', ''),
-            clean_float_value(artifact.get('Height (cm)')),
-            clean_float_value(artifact.get('Width (cm)')),
-            clean_float_value(artifact.get('Length (cm)')),
-            clean_float_value(artifact.get('Weight (kg)')),
-            'artifact'
-        ))
-    
-    if artifacts_data:
-        c.executemany('''INSERT INTO artifacts VALUES 
-                         (?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?)''', artifacts_data)
-        print(f"Inserted {len(artifacts_data)} artifacts into database")
+    # Fingerprints of the loaded CSV files, compared by sync_db
+    create_fingerprint_table(conn)
+    
+    # Add the normalized search columns up front so rows are inserted complete
+    for table in SEARCHABLE_FIELDS:
+        add_normalized_columns(conn, table)
+    
+    # Bulk load without a journal or fsyncs; indexes are created once the rows are in
+    c.execute('PRAGMA journal_mode = OFF')
+    c.execute('PRAGMA synchronous = OFF')
+    
+    # Stream every CSV into its table inside one transaction
+    report = {}
+    load_started = time.perf_counter()
+    for table in TABLE_SOURCES:
+        started = time.perf_counter()
+        inserted = insert_csv_rows(conn, table)
+        report[table] = {
+            "rows": inserted,
+            "seconds": round(time.perf_counter() - started, 3),
+            "peak_rss_mb": round(peak_rss_mb(), 1)
+        }
+        print(f"Inserted {inserted} {table} into database in {report[table]['seconds']}s "
+              f"(peak RSS {report[table]['peak_rss_mb']} MB)")
+        record_fingerprint(conn, TABLE_SOURCES[table][0])
     
     # Insert default artifact types
     artifact_types_data = [
@@ -243,27 +328,372 @@ def init_db():
     c.execute('CREATE INDEX IF NOT EXISTS idx_artifacts_artist ON artifacts(artist)')
     
     conn.commit()
+    
+    # Build the search indexes over the loaded rows
+    migrate_db(conn)
+    
+    # Back to durable writes; WAL lets pooled read-only connections read while the database is written
+    c.execute('PRAGMA synchronous = NORMAL')
+    c.execute(f'PRAGMA journal_mode = {Config.DB_JOURNAL_MODE}')
+    bump_data_version(conn)
+    # Finalize the cursor's statements first, or the closed connection lingers holding its lock
+    c.close()
     conn.close()
+    
+    report["total_seconds"] = round(time.perf_counter() - load_started, 3)
+    report["peak_rss_mb"] = round(peak_rss_mb(), 1)
+    print(f"Database built in {report['total_seconds']}s (peak RSS {report['peak_rss_mb']} MB)")
+    
+    # Pooled connections, cached candidate indexes and cached results describe the old data
+    reset_connection_pool()
+    reset_search_indexes()
+    clear_result_cache()
+    
+    # Snapshot the candidate indexes so every worker maps them instead of rebuilding
+    ensure_index_snapshot()
+    
+    return report
 
-def get_database_stats():
-    """Get database statistics"""
-    conn = sqlite3.connect(Config.DATABASE_PATH)
-    c = conn.cursor()
+@contextmanager
+def maintenance_lock():
+    """Hold an exclusive file lock next to the database while it is created, migrated or synced
+    
+    Worker processes starting together take turns, so only the first one finds work to do.
+    """
+    if fcntl is None:
+        yield
+        return
+    os.makedirs(os.path.dirname(os.path.abspath(Config.DATABASE_PATH)), exist_ok=True)
+    with open(f"{Config.DATABASE_PATH}.lock", 'a') as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+def build_database(path: Optional[str] = None) -> dict:
+    """Build a complete database and its index snapshot next to path, then move both into place
     
-    c.execute('SELECT COUNT(*) FROM museums')
-    museum_count = c.fetchone()[0]
+    Workers started afterwards open the prebuilt files directly: no CSV is read and no index is
+    built at startup. The new data version is above the replaced database's, so a stale snapshot
+    can never be mapped for it. Workers still serving the replaced files must be restarted.
+    """
+    path = path or Config.DATABASE_PATH
+    final_snapshot = snapshot_path() if path == Config.DATABASE_PATH else f"{path}.index"
+    build_path = f"{path}.build"
+    for leftover in (build_path, f"{build_path}-wal", f"{build_path}-shm", f"{build_path}.index"):
+        if os.path.exists(leftover):
+            os.remove(leftover)
     
-    c.execute('SELECT COUNT(*) FROM artists')
-    artist_count = c.fetchone()[0]
+    previous_version = 0
+    if os.path.exists(path):
+        conn = sqlite3.connect(path)
+        previous_version = conn.execute('PRAGMA user_version').fetchone()[0]
+        conn.close()
     
-    c.execute('SELECT COUNT(*) FROM artifacts')
-    artifact_count = c.fetchone()[0]
+    started = time.perf_counter()
+    settings = (Config.DATABASE_PATH, Config.INDEX_SNAPSHOT_PATH, Config.INDEX_SNAPSHOT_ENABLED)
+    try:
+        # The snapshot is written once, after the final data version is stamped
+        Config.DATABASE_PATH, Config.INDEX_SNAPSHOT_PATH = build_path, f"{build_path}.index"
+        Config.INDEX_SNAPSHOT_ENABLED = False
+        report = init_db()
+        
+        conn = sqlite3.connect(build_path)
+        version = max(conn.execute('PRAGMA user_version').fetchone()[0], previous_version + 1)
+        conn.execute(f'PRAGMA user_version = {version}')
+        conn.commit()
+        # Fold the WAL into the file so the database is complete on its own
+        conn.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+        conn.close()
+        
+        Config.INDEX_SNAPSHOT_ENABLED = True
+        ensure_index_snapshot()
+    finally:
+        Config.DATABASE_PATH, Config.INDEX_SNAPSHOT_PATH, Config.INDEX_SNAPSHOT_ENABLED = settings
+        reset_connection_pool()
+        reset_search_indexes()
     
-    conn.close()
+    # An old WAL left next to the replaced file would be replayed into the new one
+    if os.path.exists(path):
+        conn = sqlite3.connect(path)
+        conn.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+        conn.close()
+    os.replace(f"{build_path}.index", final_snapshot)
+    os.replace(build_path, path)
+    for leftover in (f"{build_path}-wal", f"{build_path}-shm"):
+        if os.path.exists(leftover):
+            os.remove(leftover)
+    
+    report["database"] = path
+    report["snapshot"] = final_snapshot
+    report["data_version"] = version
+    report["database_mb"] = round(os.path.getsize(path) / (1024 * 1024), 1)
+    report["snapshot_mb"] = round(os.path.getsize(final_snapshot) / (1024 * 1024), 1)
+    report["build_seconds"] = round(time.perf_counter() - started, 3)
+    print(f"Built {path} (data version {version}, {report['database_mb']} MB) and "
+          f"{final_snapshot} ({report['snapshot_mb']} MB) in {report['build_seconds']}s")
+    return report
+
+def bump_data_version(conn) -> int:
+    """Stamp the database with a new data version so every worker drops cached results"""
+    version = conn.execute('PRAGMA user_version').fetchone()[0] + 1
+    conn.execute(f'PRAGMA user_version = {version}')
+    conn.commit()
+    return version
+
+def get_table_columns(conn, table: str) -> list:
+    """Get the column names of a table"""
+    return [row[1] for row in conn.execute(f'PRAGMA table_info({table})')]
+
+def add_normalized_columns(conn, table: str, columns: list = None):
+    """Add the <field>_norm, search_blob and row_hash columns to a table if missing"""
+    columns = columns if columns is not None else get_table_columns(conn, table)
+    for column in [normalized_column(field) for field in SEARCHABLE_FIELDS[table]] + list(DERIVED_COLUMNS):
+        if column not in columns:
+            conn.execute(f'ALTER TABLE {table} ADD COLUMN {column} TEXT')
+
+def has_data_tables(path: Optional[str] = None) -> bool:
+    """Whether a database file holds every data table (an empty or foreign file does not)"""
+    path = path or Config.DATABASE_PATH
+    if not os.path.exists(path):
+        return False
+    conn = sqlite3.connect(path)
+    try:
+        return all(get_table_columns(conn, table) for table in SEARCHABLE_FIELDS)
+    finally:
+        conn.close()
+
+def migrate_db(conn=None) -> int:
+    """Add normalized search columns and search indexes to an existing database without a rebuild"""
+    own_conn = conn is None
+    if own_conn:
+        conn = sqlite3.connect(Config.DATABASE_PATH)
+    
+    updated = 0
+    existing = set()
+    try:
+        for table, fields in SEARCHABLE_FIELDS.items():
+            columns = get_table_columns(conn, table)
+            if not columns:
+                continue
+            existing.add(table)
+            
+            # Add any missing normalized columns plus the combined search blob
+            add_normalized_columns(conn, table, columns)
+            
+            # Fill rows that have not been normalized yet
+            rows = conn.execute(f"SELECT rowid, {', '.join(fields)} FROM {table} "
+                                f"WHERE search_blob IS NULL").fetchall()
+            if rows:
+                assignments = ', '.join(f'{normalized_column(field)} = ?' for field in fields)
+                conn.executemany(f'UPDATE {table} SET {assignments}, search_blob = ? WHERE rowid = ?',
+                                 (normalized_row(row[1:]) + (row[0],) for row in rows))
+                conn.commit()
+                updated += len(rows)
+                print(f"Normalized search fields for {len(rows)} {table}")
+            
+            if create_search_indexes(conn, table):
+                updated += 1
+        
+        # The structures below are derived from the data tables, so each needs its source tables
+        # Phonetic and token blocking keys for the person-name fields
+        if existing.issuperset(BLOCKING_FIELDS) and ensure_blocking_keys(conn):
+            updated += 1
+        
+        # R*Tree over museum coordinates for proximity matching
+        if 'museums' in existing and ensure_geo_index(conn):
+            updated += 1
+        
+        # Artist -> artwork edges, by constituent id or else by unambiguous name
+        if existing.issuperset({'artists', 'artifacts'}) and ensure_creator_edges(conn):
+            updated += 1
+        
+        if updated:
+            bump_data_version(conn)
+    finally:
+        if own_conn:
+            conn.close()
+    
+    if updated:
+        reset_search_indexes()
+        clear_result_cache()
+    if own_conn and existing == set(SEARCHABLE_FIELDS):
+        # Databases built before snapshots existed (or whose snapshot is stale) get one now
+        ensure_index_snapshot()
+    return updated
+
+# Columns behind the property pre-filter conditions in property_service
+PROPERTY_INDEXES = {
+    'artifacts': ['constituent_id'],
+    'artists': ['birth_year']
+}
+
+def create_search_indexes(conn, table: str) -> bool:
+    """Create the case-insensitive field indexes and FTS5 table for a table if missing"""
+    created = False
+    for field in SEARCHABLE_FIELDS[table]:
+        conn.execute(f'CREATE INDEX IF NOT EXISTS idx_{table}_{field}_nocase '
+                     f'ON {table}({field} COLLATE NOCASE)')
+    for column in PROPERTY_INDEXES.get(table, []):
+        conn.execute(f'CREATE INDEX IF NOT EXISTS idx_{table}_{column} ON {table}({column})')
+    
+    # External-content FTS5 table over the raw fields; unicode61 folds case and diacritics
+    exists = conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?",
+                          (fts_table(table),)).fetchone()
+    if not exists:
+        columns = ', '.join(SEARCHABLE_FIELDS[table])
+        conn.execute(f"CREATE VIRTUAL TABLE {fts_table(table)} USING fts5({columns}, "
+                     f"content='{table}', content_rowid='rowid', "
+                     f"tokenize='unicode61 remove_diacritics 2')")
+        conn.execute(f"INSERT INTO {fts_table(table)}({fts_table(table)}) VALUES ('rebuild')")
+        print(f"Built full-text index {fts_table(table)}")
+        created = True
+    
+    conn.commit()
+    return created
+
+def normalized_row(values) -> tuple:
+    """Normalize field values and append the combined search blob"""
+    normalized = tuple(normalize_text(value) if value else '' for value in values)
+    return normalized + (' '.join(value for value in normalized if value),)
+
+def create_fingerprint_table(conn):
+    """Create the table holding the fingerprint of each loaded CSV file"""
+    conn.execute('''CREATE TABLE IF NOT EXISTS csv_fingerprints
+                    (name TEXT PRIMARY KEY,
+                     path TEXT,
+                     fingerprint TEXT)''')
+
+def csv_fingerprint(path: str) -> Optional[str]:
+    """SHA-1 of a CSV file's contents, or None if it does not exist"""
+    if not os.path.exists(path):
+        return None
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def record_fingerprint(conn, name: str):
+    """Remember the fingerprint of the CSV file a dataset was loaded from"""
+    path = Config.CSV_FILES[name]
+    conn.execute('INSERT OR REPLACE INTO csv_fingerprints VALUES (?, ?, ?)',
+                 (name, path, csv_fingerprint(path)))
+
+def sync_table(conn, table: str) -> dict:
+    """Apply the inserts, updates and deletes that bring a table in line with its CSV"""
+    name, build_record = TABLE_SOURCES[table]
+    insert_columns, searchable_positions = row_layout(conn, table)
+    existing = dict(conn.execute(f'SELECT id, row_hash FROM {table}'))
+    
+    seen = set()
+    inserts = []
+    updates = []
+    for number, record in enumerate(iter_csv_records(name, strict=True), 1):
+        row = complete_row(build_record(record, number), searchable_positions)
+        if row[0] in seen:
+            continue
+        seen.add(row[0])
+        
+        if row[0] not in existing:
+            inserts.append(row)
+        elif existing[row[0]] != row[-1]:
+            updates.append(row)
+    deletes = [(entity_id,) for entity_id in existing if entity_id not in seen]
+    
+    if inserts:
+        conn.executemany(f"INSERT INTO {table} ({', '.join(insert_columns)}) "
+                         f"VALUES ({','.join('?' * len(insert_columns))})", inserts)
+    if updates:
+        assignments = ', '.join(f'{column} = ?' for column in insert_columns[1:])
+        conn.executemany(f'UPDATE {table} SET {assignments} WHERE id = ?',
+                         [row[1:] + (row[0],) for row in updates])
+    if deletes:
+        conn.executemany(f'DELETE FROM {table} WHERE id = ?', deletes)
+    
+    return {"inserted": len(inserts), "updated": len(updates), "deleted": len(deletes)}
+
+def sync_db() -> dict:
+    """Bring an existing database in line with changed CSV files without dropping it
+    
+    Each CSV is fingerprinted; only changed files are diffed row by row on their natural keys.
+    All changes are applied in one transaction, after which the in-memory search indexes are
+    rebuilt and swapped in while searches keep using the old ones.
+    """
+    conn = sqlite3.connect(Config.DATABASE_PATH)
+    report = {}
+    changed_tables = []
+    try:
+        # Schema additions (normalized and hash columns, search indexes) are committed first
+        migrate_db(conn)
+        create_fingerprint_table(conn)
+        conn.commit()
+        
+        for table, (name, _) in TABLE_SOURCES.items():
+            path = Config.CSV_FILES[name]
+            fingerprint = csv_fingerprint(path)
+            stored = conn.execute('SELECT fingerprint FROM csv_fingerprints WHERE name = ?', (name,)).fetchone()
+            
+            # A missing file is not treated as "every row deleted"
+            if fingerprint is None or (stored and stored[0] == fingerprint):
+                report[table] = {"unchanged": True}
+                continue
+            
+            report[table] = sync_table(conn, table)
+            record_fingerprint(conn, name)
+            if any(report[table].values()):
+                changed_tables.append(table)
+            print(f"Synced {table}: {report[table]['inserted']} inserted, "
+                  f"{report[table]['updated']} updated, {report[table]['deleted']} deleted")
+        
+        # The external-content FTS tables are rebuilt from the synced rows
+        for table in changed_tables:
+            conn.execute(f"INSERT INTO {fts_table(table)}({fts_table(table)}) VALUES ('rebuild')")
+            if table in BLOCKING_FIELDS:
+                build_blocking_keys(conn, table)
+            if table == 'museums':
+                build_geo_index(conn)
+        # Rowids and names on either side of an edge may have changed
+        if 'artists' in changed_tables or 'artifacts' in changed_tables:
+            build_creator_edges(conn)
+        
+        if changed_tables:
+            bump_data_version(conn)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+    
+    if changed_tables:
+        clear_result_cache()
+        ensure_index_snapshot()
+        load_search_indexes()
+    return report
+
+def get_database_stats():
+    """Get database statistics"""
+    with read_connection() as conn:
+        c = conn.cursor()
+        
+        c.execute('SELECT COUNT(*) FROM museums')
+        museum_count = c.fetchone()[0]
+        
+        c.execute('SELECT COUNT(*) FROM artists')
+        artist_count = c.fetchone()[0]
+        
+        c.execute('SELECT COUNT(*) FROM artifacts')
+        artifact_count = c.fetchone()[0]
     
     return {
         "museums": museum_count,
         "artists": artist_count,
         "artifacts": artifact_count,
-        "total_entities": museum_count + artist_count + artifact_count
+        "total_entities": museum_count + artist_count + artifact_count,
+        "data_version": get_data_version(),
+        "connection_pool": get_connection_pool_stats(),
+        "result_cache": get_result_cache_stats(),
+        "preview_cache": get_preview_cache_stats()
     }
\ No newline at end of file
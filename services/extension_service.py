@@ -0,0 +1,155 @@
+from typing import Any, Callable, Dict, List, Optional
+from services.index_service import table_for_id
+from services.connection_service import read_connection
+from services.search_service import SQLITE_MAX_VARIABLES, get_search_configs
+from services.relation_service import linked_creators
+
+def text_value(*columns: str) -> Callable:
+    """Value of the first non-empty column as a W3C string value"""
+    def values(row) -> List[Dict]:
+        for column in columns:
+            if row[column] not in (None, ''):
+                return [{"str": str(row[column])}]
+        return []
+    return values
+
+def number_value(column: str, kind: str = 'int') -> Callable:
+    """Numeric column as a W3C int/float value, skipping blanks and the 0 used for unknown years"""
+    def values(row) -> List[Dict]:
+        value = row[column]
+        if value in (None, '', 0):
+            return []
+        return [{kind: int(value) if kind == 'int' else float(value)}]
+    return values
+
+def museum_location(row) -> List[Dict]:
+    parts = [row[column] for column in ('city_admin', 'state_admin') if row[column]]
+    return [{"str": ", ".join(parts)}] if parts else []
+
+def artist_life_dates(row) -> List[Dict]:
+    if row['birth_year'] and row['death_year']:
+        return [{"str": f"{row['birth_year']}–{row['death_year']}"}]
+    if row['birth_year']:
+        return [{"str": f"b. {row['birth_year']}"}]
+    return []
+
+# Properties available for data extension per table: (name, columns read, row -> W3C values)
+EXTENSION_PROPERTIES = {
+    'museums': {
+        'name': ("Name", ['museum_name', 'legal_name'], text_value('museum_name', 'legal_name')),
+        'location': ("Location", ['city_admin', 'state_admin'], museum_location),
+        'museum_type': ("Museum Type", ['museum_type'], text_value('museum_type')),
+        'address': ("Street Address", ['street_address_admin'], text_value('street_address_admin')),
+        'city': ("City", ['city_admin'], text_value('city_admin')),
+        'state': ("State", ['state_admin'], text_value('state_admin')),
+        'zip': ("ZIP Code", ['zip_admin'], text_value('zip_admin')),
+        'phone': ("Phone", ['phone'], text_value('phone')),
+        'latitude': ("Latitude", ['latitude'], number_value('latitude', 'float')),
+        'longitude': ("Longitude", ['longitude'], number_value('longitude', 'float')),
+        'revenue': ("Revenue", ['revenue'], number_value('revenue'))
+    },
+    'artists': {
+        'name': ("Name", ['name'], text_value('name')),
+        'nationality': ("Nationality", ['nationality'], text_value('nationality')),
+        'date': ("Date/Period", ['birth_year', 'death_year'], artist_life_dates),
+        'birth_year': ("Birth Year", ['birth_year'], number_value('birth_year')),
+        'death_year': ("Death Year", ['death_year'], number_value('death_year')),
+        'gender': ("Gender", ['gender'], text_value('gender')),
+        'wiki_qid': ("Wikidata ID", ['wiki_qid'], text_value('wiki_qid')),
+        'ulan': ("ULAN ID", ['ulan'], text_value('ulan'))
+    },
+    'artifacts': {
+        'name': ("Title", ['title'], text_value('title')),
+        # Filled with artist entities by resolve_creators
+        'creator': ("Creator/Artist", ['artist'], text_value('artist')),
+        'date': ("Date/Period", ['date'], text_value('date')),
+        'medium': ("Medium/Material", ['medium'], text_value('medium')),
+        'nationality': ("Nationality", ['nationality'], text_value('nationality')),
+        'classification': ("Classification", ['classification'], text_value('classification')),
+        'department': ("Department", ['department'], text_value('department')),
+        'dimensions': ("Dimensions", ['dimensions'], text_value('dimensions')),
+        'credit_line': ("Credit Line", ['credit_line'], text_value('credit_line')),
+        'accession_number': ("Accession Number", ['accession_number'], text_value('accession_number')),
+        'date_acquired': ("Date Acquired", ['date_acquired'], text_value('date_acquired')),
+        'url': ("URL", ['url'], text_value('url')),
+        'image_url': ("Image URL", ['image_url'], text_value('image_url'))
+    }
+}
+
+# Properties whose values are entities of another type
+PROPERTY_TYPES = {
+    'creator': {"id": "person", "name": "Artist/Creator"}
+}
+
+def propose_properties(type_id: Optional[str] = None, limit: Optional[int] = None) -> Dict[str, Any]:
+    """W3C property proposals for an entity type (every extendable property without one)"""
+    tables = [config['table'] for config in get_search_configs(type_id)]
+    properties = []
+    seen = set()
+    for table in tables:
+        for pid, (name, _, _) in EXTENSION_PROPERTIES[table].items():
+            if pid not in seen:
+                seen.add(pid)
+                properties.append({"id": pid, "name": name})
+    
+    if limit:
+        properties = properties[:limit]
+    return {"type": type_id, "properties": properties}
+
+def property_meta(property_id: str) -> Dict[str, Any]:
+    """Column header for a requested property"""
+    meta = {"id": property_id, "name": property_id}
+    for properties in EXTENSION_PROPERTIES.values():
+        if property_id in properties:
+            meta["name"] = properties[property_id][0]
+            break
+    if property_id in PROPERTY_TYPES:
+        meta["type"] = PROPERTY_TYPES[property_id]
+    return meta
+
+def extend_entities(ids: List[str], property_ids: List[str]) -> Dict[str, Any]:
+    """Fetch property values for many entities with a few batched queries per table
+    
+    Returns a W3C data extension response: column metadata plus one row of values per id.
+    """
+    rows = {str(entity_id): {pid: [] for pid in property_ids} for entity_id in ids}
+    
+    ids_by_table = {}
+    for entity_id in rows:
+        table = table_for_id(entity_id)
+        if table:
+            ids_by_table.setdefault(table, []).append(entity_id)
+    
+    with read_connection() as conn:
+        c = conn.cursor()
+        for table, table_ids in ids_by_table.items():
+            properties = {pid: EXTENSION_PROPERTIES[table][pid] for pid in property_ids
+                          if pid in EXTENSION_PROPERTIES[table]}
+            if not properties:
+                continue
+            
+            columns = sorted({column for _, property_columns, _ in properties.values() for column in property_columns})
+            fetched = []
+            for start in range(0, len(table_ids), SQLITE_MAX_VARIABLES):
+                chunk = table_ids[start:start + SQLITE_MAX_VARIABLES]
+                c.execute(f"SELECT id, {', '.join(columns)} FROM {table} WHERE id IN ({','.join('?' * len(chunk))})",
+                          chunk)
+                fetched.extend(c.fetchall())
+            
+            for row in fetched:
+                rows[str(row['id'])].update({pid: values(row) for pid, (_, _, values) in properties.items()})
+            
+            if table == 'artifacts' and 'creator' in properties:
+                resolve_creators(c, fetched, rows)
+    
+    return {
+        "meta": [property_meta(pid) for pid in property_ids],
+        "rows": rows
+    }
+
+def resolve_creators(c, artifact_rows, rows: Dict[str, Dict]):
+    """Replace artifacts' creator strings with the artist entities init_db linked to them"""
+    artifact_ids = [str(row['id']) for row in artifact_rows]
+    for start in range(0, len(artifact_ids), SQLITE_MAX_VARIABLES):
+        for artifact_id, creators in linked_creators(c, artifact_ids[start:start + SQLITE_MAX_VARIABLES]).items():
+            rows[artifact_id]['creator'] = creators
@@ -0,0 +1,126 @@
+import math
+import re
+import sqlite3
+from typing import Any, List, Optional, Tuple
+from config.settings import Config
+
+# R*Tree over museum coordinates, keyed by museums rowid
+GEO_TABLE = 'museums_geo'
+
+EARTH_RADIUS_KM = 6371.0088
+
+NUMBER_PATTERN = re.compile(r'-?\d+(?:\.\d+)?')
+
+def parse_point(value: Any) -> Optional[Tuple[float, float, float]]:
+    """(latitude, longitude, radius in km) of a location value given as coordinates, else None
+
+    Accepts {"lat": .., "lon": .., "radius": ..} objects (also "latitude"/"lng"/"longitude" and
+    "radius_km") and "lat, lon" or "lat, lon, radius" strings; the radius defaults to
+    Config.GEO_DEFAULT_RADIUS_KM. City names and other text return None.
+    """
+    if isinstance(value, dict):
+        lat = value.get('lat', value.get('latitude'))
+        lon = value.get('lon', value.get('lng', value.get('longitude')))
+        radius = value.get('radius', value.get('radius_km'))
+        numbers = [lat, lon] + ([radius] if radius not in (None, '') else [])
+    elif isinstance(value, (list, tuple)) and 2 <= len(value) <= 3:
+        numbers = list(value)
+    elif isinstance(value, str):
+        text = value.strip().lower()
+        if text.endswith('km'):
+            text = text[:-2]
+        parts = [part.strip() for part in text.split(',')]
+        if not 2 <= len(parts) <= 3 or not all(NUMBER_PATTERN.fullmatch(part) for part in parts):
+            return None
+        numbers = parts
+    else:
+        return None
+
+    try:
+        numbers = [float(number) for number in numbers]
+    except (TypeError, ValueError):
+        return None
+    lat, lon = numbers[0], numbers[1]
+    radius = numbers[2] if len(numbers) > 2 else Config.GEO_DEFAULT_RADIUS_KM
+    if not (-90 <= lat <= 90 and -180 <= lon <= 180) or radius <= 0:
+        return None
+    return lat, lon, min(radius, Config.GEO_MAX_RADIUS_KM)
+
+def distance_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Great-circle (haversine) distance between two points"""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    half_dphi = (phi2 - phi1) / 2
+    half_dlambda = math.radians(lon2 - lon1) / 2
+    a = math.sin(half_dphi) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(half_dlambda) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+def bounding_box(lat: float, lon: float, radius_km: float) -> Tuple[float, float, float, float]:
+    """(min lat, max lat, min lon, max lon) enclosing the circle; every longitude near the poles
+    or when the circle crosses the antimeridian"""
+    dlat = math.degrees(radius_km / EARTH_RADIUS_KM)
+    min_lat, max_lat = lat - dlat, lat + dlat
+    if min_lat <= -90 or max_lat >= 90:
+        return max(min_lat, -90.0), min(max_lat, 90.0), -180.0, 180.0
+
+    dlon = math.degrees(math.asin(min(1.0, math.sin(radius_km / EARTH_RADIUS_KM) / math.cos(math.radians(lat)))))
+    if lon - dlon < -180 or lon + dlon > 180:
+        return min_lat, max_lat, -180.0, 180.0
+    return min_lat, max_lat, lon - dlon, lon + dlon
+
+def proximity_score(lat: float, lon: float, radius_km: float, row_lat, row_lon) -> int:
+    """100 at the point itself, 50 at the edge of the radius and 0 from twice the radius on"""
+    if row_lat is None or row_lon is None:
+        return 0
+    distance = distance_km(lat, lon, float(row_lat), float(row_lon))
+    return max(0, int(round(100 * (1 - distance / (2 * radius_km)))))
+
+def box_condition(lat: float, lon: float, radius_km: float) -> Tuple[str, list]:
+    """SQL condition on museums rowid selecting the R*Tree entries in the point's bounding box"""
+    # The R*Tree stores 32-bit floats rounded outwards, so compare against the box as is
+    return (f"rowid IN (SELECT id FROM {GEO_TABLE} "
+            f"WHERE max_lat >= ? AND min_lat <= ? AND max_lon >= ? AND min_lon <= ?)",
+            list(bounding_box(lat, lon, radius_km)))
+
+def rowids_near(c, lat: float, lon: float, radius_km: float) -> List[int]:
+    """Rowids of the museums within radius_km of a point, nearest first"""
+    min_lat, max_lat, min_lon, max_lon = bounding_box(lat, lon, radius_km)
+    c.execute(f'SELECT g.id, m.latitude, m.longitude FROM {GEO_TABLE} g JOIN museums m ON m.rowid = g.id '
+              f'WHERE g.max_lat >= ? AND g.min_lat <= ? AND g.max_lon >= ? AND g.min_lon <= ?',
+              (min_lat, max_lat, min_lon, max_lon))
+    nearby = []
+    for rowid, row_lat, row_lon in c.fetchall():
+        distance = distance_km(lat, lon, row_lat, row_lon)
+        if distance <= radius_km:
+            nearby.append((distance, rowid))
+    return [rowid for _, rowid in sorted(nearby)]
+
+def create_geo_table(conn: sqlite3.Connection):
+    conn.execute(f'CREATE VIRTUAL TABLE IF NOT EXISTS {GEO_TABLE} '
+                 f'USING rtree(id, min_lat, max_lat, min_lon, max_lon)')
+
+def build_geo_index(conn: sqlite3.Connection) -> int:
+    """(Re)load the R*Tree from the museums with coordinates; returns the number indexed"""
+    create_geo_table(conn)
+    conn.execute(f'DELETE FROM {GEO_TABLE}')
+    # (0, 0) is how blank coordinates ended up in older loads, not a museum in the Gulf of Guinea
+    conn.execute(f'INSERT INTO {GEO_TABLE} SELECT rowid, latitude, latitude, longitude, longitude FROM museums '
+                 f'WHERE latitude BETWEEN -90 AND 90 AND longitude BETWEEN -180 AND 180 '
+                 f'AND NOT (latitude = 0 AND longitude = 0)')
+    # total_changes would also count the R*Tree's node table writes
+    return conn.execute(f'SELECT COUNT(*) FROM {GEO_TABLE}').fetchone()[0]
+
+def ensure_geo_index(conn: sqlite3.Connection) -> bool:
+    """Load the R*Tree if it does not exist yet and museums have coordinates; True if it was built"""
+    # Existence rather than emptiness: when every coordinate is filtered out the tree stays empty,
+    # and reloading it on every start would bump the data version each time
+    exists = conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?",
+                          (GEO_TABLE,)).fetchone()
+    create_geo_table(conn)
+    has_points = conn.execute('SELECT 1 FROM museums WHERE latitude IS NOT NULL LIMIT 1').fetchone()
+    built = False
+    if has_points and not exists:
+        count = build_geo_index(conn)
+        print(f"Indexed coordinates of {count} museums")
+        built = True
+    conn.commit()
+    return built
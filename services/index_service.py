@@ -0,0 +1,594 @@
+import os
+import json
+import mmap
+import sqlite3
+import threading
+import heapq
+import tempfile
+from bisect import bisect_left
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from config.settings import Config
+from utils.text_utils import normalize_text
+from services.connection_service import read_connection, get_data_version
+
+# Searchable fields per table, shared by the index and the search service
+SEARCHABLE_FIELDS = {
+    'museums': ['museum_name', 'legal_name', 'alternate_name', 'museum_type', 'city_admin', 'state_admin'],
+    'artists': ['name', 'nationality', 'artist_bio'],
+    'artifacts': ['title', 'artist', 'medium', 'classification', 'department']
+}
+
+# Columns a result's name and description are built from, per table
+DISPLAY_FIELDS = {
+    'museums': ['museum_name', 'legal_name', 'city_admin', 'state_admin', 'museum_type'],
+    'artists': ['name', 'nationality', 'birth_year', 'death_year', 'artist_bio'],
+    'artifacts': ['title', 'artist', 'date', 'medium', 'department']
+}
+
+# Name fields offered for auto-completion, per table
+SUGGEST_FIELDS = {
+    'museums': ['museum_name', 'alternate_name'],
+    'artists': ['name'],
+    'artifacts': ['title']
+}
+
+# Entity id prefix per table, as assigned by init_db
+ID_PREFIXES = {
+    'museums': 'MUSEUM_',
+    'artists': 'ARTIST_',
+    'artifacts': 'ARTIFACT_'
+}
+
+_indexes = {}
+_indexes_version = None
+_index_lock = threading.Lock()
+_refresh_thread = None
+
+def normalized_column(field: str) -> str:
+    """Name of the column holding the normalized variant of a field"""
+    return f"{field}_norm"
+
+def fts_table(table: str) -> str:
+    """Name of the FTS5 table indexing a table's searchable fields"""
+    return f"{table}_fts"
+
+def table_for_id(entity_id: str) -> Optional[str]:
+    """Table an entity id belongs to, from its prefix"""
+    for table, prefix in ID_PREFIXES.items():
+        if str(entity_id).startswith(prefix):
+            return table
+    return None
+
+def describe_entity(table: str, row) -> Optional[Tuple[str, str]]:
+    """Display name and description of a row holding (at least) the table's DISPLAY_FIELDS"""
+    if table == 'museums':
+        name = row['museum_name'] or row['legal_name'] or 'Unnamed Museum'
+        description_parts = []
+        if row['city_admin']:
+            description_parts.append(row['city_admin'])
+        if row['state_admin']:
+            description_parts.append(row['state_admin'])
+        if row['museum_type']:
+            description_parts.append(f"({row['museum_type']})")
+        description = ", ".join(description_parts) if description_parts else "Museum"
+
+    elif table == 'artists':
+        name = row['name'] or 'Unknown Artist'
+        description_parts = []
+        if row['nationality']:
+            description_parts.append(row['nationality'])
+        if row['birth_year'] and row['death_year']:
+            description_parts.append(f"({row['birth_year']}–{row['death_year']})")
+        elif row['birth_year']:
+            description_parts.append(f"(b. {row['birth_year']})")
+        if row['artist_bio']:
+            bio_parts = row['artist_bio'].split(',')
+            if len(bio_parts) > 1:
+                description_parts.append(bio_parts[1].strip())
+        description = ", ".join(description_parts) if description_parts else "Artist"
+
+    elif table == 'artifacts':
+        name = row['title'] or 'Untitled'
+        description_parts = []
+        if row['artist']:
+            description_parts.append(f"by {row['artist']}")
+        if row['date']:
+            description_parts.append(row['date'])
+        if row['medium']:
+            description_parts.append(row['medium'])
+        if row['department']:
+            description_parts.append(f"({row['department']})")
+        description = ", ".join(description_parts) if description_parts else "Artwork"
+
+    else:
+        return None
+
+    return str(name), str(description)
+
+def build_suggest_keys(index, fields: List[str]) -> Dict[str, list]:
+    """Sorted normalized names (and every word start within them) of an index's rows, with
+    the row position of each, for prefix lookups by bisection"""
+    field_positions = [index.fields.index(field) for field in fields]
+
+    names = []
+    word_starts = []
+    for position, values in enumerate(index.values):
+        for field_position in field_positions:
+            name = values[field_position]
+            if not name:
+                continue
+            names.append((name, position))
+            # Let "picas" find "pablo picasso" as well as names starting with it
+            start = name.find(' ')
+            while start != -1:
+                word_starts.append((name[start + 1:], position))
+                start = name.find(' ', start + 1)
+
+    names.sort()
+    word_starts.sort()
+    return {
+        'name_keys': [key for key, _ in names],
+        'name_positions': [position for _, position in names],
+        'word_keys': [key for key, _ in word_starts],
+        'word_positions': [position for _, position in word_starts]
+    }
+
+def make_ngrams(text: str, size: int = None) -> set:
+    """Split normalized text into padded character n-grams"""
+    size = size or Config.INDEX_NGRAM_SIZE
+    if not text:
+        return set()
+    padded = f" {text} "
+    if len(padded) <= size:
+        return {padded}
+    return {padded[i:i + size] for i in range(len(padded) - size + 1)}
+
+class SearchIndex:
+    """Pre-normalized field values plus an n-gram inverted index for one table
+
+    Rows also keep their display name and description, so results are formatted
+    from the index instead of re-reading and re-describing database rows.
+    """
+
+    def __init__(self, table: str, fields: List[str]):
+        self.table = table
+        self.fields = fields
+        self.ids = []
+        self.values = []
+        self.names = []
+        self.descriptions = []
+        self.postings = {}
+        # Distinct n-grams per row, normalizing overlap counts when the candidates are capped
+        self.gram_counts = []
+        self.rowid_positions = {}
+        self.has_fts = False
+        # Prefix lookup arrays for the suggest service, when mapped from a snapshot
+        self.suggest_keys = None
+
+    def add(self, entity_id: str, values: tuple, rowid: Optional[int] = None,
+            name: str = '', description: str = ''):
+        """Add one row of normalized field values (and its display strings) to the index"""
+        position = len(self.ids)
+        self.ids.append(entity_id)
+        self.values.append(values)
+        self.names.append(name)
+        self.descriptions.append(description)
+        if rowid is not None:
+            self.rowid_positions[rowid] = position
+
+        grams = set()
+        for value in values:
+            if value:
+                grams.update(make_ngrams(value))
+        for gram in grams:
+            self.postings.setdefault(gram, []).append(position)
+        self.gram_counts.append(len(grams))
+
+    def candidates(self, normalized_query: str, max_candidates: Optional[int] = None,
+                   extra_rowids: Optional[List[int]] = None) -> List[int]:
+        """Return row positions sharing enough n-grams with the query (plus extra rowids), in table order"""
+        if 0 < len(normalized_query) <= Config.INDEX_FULL_SCAN_MAX_LENGTH:
+            # Close matches of very short queries often share no n-gram with them ("forg" and "fred")
+            return list(range(len(self)))
+
+        max_candidates = max_candidates or Config.INDEX_MAX_CANDIDATES
+        query_grams = make_ngrams(normalized_query)
+
+        counts = Counter()
+        for gram in query_grams:
+            postings = self.postings.get(gram)
+            if postings:
+                counts.update(postings)
+
+        min_overlap = max(1, int(len(query_grams) * Config.INDEX_MIN_NGRAM_OVERLAP))
+        matching = [(count, position) for position, count in counts.items() if count >= min_overlap]
+
+        if len(matching) > max_candidates:
+            # Keep the best Dice overlaps: raw counts favour long rows over close short matches.
+            # Break ties by table order so the candidate set is deterministic
+            query_size = len(query_grams)
+            gram_counts = self.gram_counts
+            matching = heapq.nlargest(max_candidates, matching,
+                                      key=lambda item: (item[0] / (query_size + gram_counts[item[1]]), -item[1]))
+
+        positions = {position for _, position in matching}
+        for rowid in extra_rowids or ():
+            position = self.rowid_positions.get(rowid)
+            if position is not None:
+                positions.add(position)
+
+        # Score candidates in table order so ties rank exactly like a full scan
+        return sorted(positions)
+
+    def __len__(self):
+        return len(self.ids)
+
+class StringArray:
+    """Read-only sequence of strings stored as one UTF-8 buffer plus end offsets"""
+
+    __slots__ = ('data', 'offsets', 'base', 'count')
+
+    def __init__(self, data: mmap.mmap, offsets: memoryview, base: int):
+        # offsets holds count + 1 positions in data, relative to base
+        self.data = data
+        self.offsets = offsets
+        self.base = base
+        self.count = len(offsets) - 1
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, i: int) -> str:
+        if not 0 <= i < self.count:
+            raise IndexError(i)
+        offsets, base = self.offsets, self.base
+        return self.data[base + offsets[i]:base + offsets[i + 1]].decode('utf-8')
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+class RowValues:
+    """Per-row tuples of normalized field values over one StringArray per field"""
+
+    def __init__(self, fields: List[StringArray]):
+        self.fields = fields
+
+    def __len__(self):
+        return len(self.fields[0]) if self.fields else 0
+
+    def __getitem__(self, position: int) -> tuple:
+        return tuple([field[position] for field in self.fields])
+
+    def __iter__(self):
+        for position in range(len(self)):
+            yield self[position]
+
+class MappedPostings:
+    """N-gram postings looked up by binary search over the sorted grams"""
+
+    def __init__(self, grams: StringArray, offsets: memoryview, positions: memoryview):
+        self.grams = grams
+        self.offsets = offsets
+        self.positions = positions
+
+    def __len__(self):
+        return len(self.grams)
+
+    def get(self, gram: str, default=None):
+        i = bisect_left(self.grams, gram)
+        if i < len(self.grams) and self.grams[i] == gram:
+            return self.positions[self.offsets[i]:self.offsets[i + 1]].tolist()
+        return default
+
+class RowidPositions:
+    """Rowid to row position lookups over sorted rowid and position arrays"""
+
+    def __init__(self, rowids: np.ndarray, positions: np.ndarray):
+        self.rowids = rowids
+        self.positions = positions
+
+    def get(self, rowid: int, default=None):
+        i = int(np.searchsorted(self.rowids, rowid))
+        if i < len(self.rowids) and self.rowids[i] == rowid:
+            return int(self.positions[i])
+        return default
+
+    def __contains__(self, rowid: int) -> bool:
+        return self.get(rowid) is not None
+
+    def __getitem__(self, rowid: int) -> int:
+        position = self.get(rowid)
+        if position is None:
+            raise KeyError(rowid)
+        return position
+
+class MappedSearchIndex(SearchIndex):
+    """A SearchIndex read zero-copy from a memory-mapped snapshot file"""
+
+    def __init__(self, table: str, fields: List[str], has_fts: bool, ids: StringArray, values: RowValues,
+                 names: StringArray, descriptions: StringArray, postings: MappedPostings,
+                 gram_counts: memoryview, rowid_positions: RowidPositions, suggest_keys: Optional[Dict] = None):
+        self.table = table
+        self.fields = fields
+        self.ids = ids
+        self.values = values
+        self.names = names
+        self.descriptions = descriptions
+        self.postings = postings
+        self.gram_counts = gram_counts
+        self.rowid_positions = rowid_positions
+        self.has_fts = has_fts
+        self.suggest_keys = suggest_keys
+
+    def add(self, entity_id: str, values: tuple, rowid: Optional[int] = None,
+            name: str = '', description: str = ''):
+        raise TypeError("Mapped search indexes are read-only")
+
+SNAPSHOT_MAGIC = b'MRIDX003'
+
+def snapshot_path() -> str:
+    """Where the index snapshot of the configured database lives"""
+    return Config.INDEX_SNAPSHOT_PATH or f"{Config.DATABASE_PATH}.index"
+
+def write_index_snapshot(indexes: Dict[str, SearchIndex], data_version: int, path: Optional[str] = None) -> str:
+    """Serialize candidate indexes into a snapshot file, replacing any previous one atomically
+
+    Layout: magic, directory length, JSON directory, then 8-byte aligned sections (UTF-8 string
+    buffers with uint64 end offsets, uint32 postings and int64 rowids) in native byte order.
+    """
+    path = path or snapshot_path()
+    sections = []
+    size = 0
+
+    def add_section(data: bytes) -> List[int]:
+        nonlocal size
+        offset = size
+        sections.append(data + b'\0' * (-len(data) % 8))
+        size += len(sections[-1])
+        return [offset, len(data)]
+
+    def add_strings(strings) -> Dict[str, List[int]]:
+        encoded = [value.encode('utf-8') for value in strings]
+        data = add_section(b''.join(encoded))
+        # End offsets are absolute within the sections area, so readers slice the map directly
+        offsets = np.full(len(encoded) + 1, data[0], dtype='u8')
+        np.cumsum([len(value) for value in encoded], out=offsets[1:])
+        offsets[1:] += data[0]
+        return {'offsets': add_section(offsets.tobytes()), 'data': data}
+
+    directory = {'data_version': data_version, 'tables': {}}
+    for table, index in indexes.items():
+        rowids = np.array(list(index.rowid_positions.keys()), dtype='i8')
+        positions = np.array(list(index.rowid_positions.values()), dtype='u4')
+        order = np.argsort(rowids, kind='stable')
+        grams = sorted(index.postings)
+        posting_offsets = np.zeros(len(grams) + 1, dtype='u8')
+        np.cumsum([len(index.postings[gram]) for gram in grams], out=posting_offsets[1:])
+        postings = np.fromiter((position for gram in grams for position in index.postings[gram]),
+                               dtype='u4', count=int(posting_offsets[-1]))
+        suggest_keys = index.suggest_keys or build_suggest_keys(index, SUGGEST_FIELDS[table])
+
+        directory['tables'][table] = {
+            'fields': index.fields,
+            'count': len(index),
+            'has_fts': index.has_fts,
+            'ids': add_strings(index.ids),
+            'values': [add_strings(values[i] for values in index.values) for i in range(len(index.fields))],
+            'names': add_strings(index.names),
+            'descriptions': add_strings(index.descriptions),
+            'grams': add_strings(grams),
+            'posting_offsets': add_section(posting_offsets.tobytes()),
+            'postings': add_section(postings.tobytes()),
+            'gram_counts': add_section(np.array(index.gram_counts, dtype='u4').tobytes()),
+            'rowids': add_section(rowids[order].tobytes()),
+            'rowid_positions': add_section(positions[order].tobytes()),
+            'suggest_fields': SUGGEST_FIELDS[table],
+            'suggest': {
+                'name_keys': add_strings(suggest_keys['name_keys']),
+                'name_positions': add_section(np.array(suggest_keys['name_positions'], dtype='u4').tobytes()),
+                'word_keys': add_strings(suggest_keys['word_keys']),
+                'word_positions': add_section(np.array(suggest_keys['word_positions'], dtype='u4').tobytes())
+            }
+        }
+
+    header = json.dumps(directory).encode('utf-8')
+    header_size = len(SNAPSHOT_MAGIC) + 8 + len(header)
+
+    # Write beside the target and rename, so readers map either the old file or the new one
+    fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), prefix='.index-')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(SNAPSHOT_MAGIC)
+            f.write(len(header).to_bytes(8, 'little'))
+            f.write(header)
+            f.write(b'\0' * (-header_size % 8))
+            for section in sections:
+                f.write(section)
+        os.chmod(temp_path, 0o644)
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    return path
+
+def read_snapshot_directory(path: str):
+    """Map a snapshot file, returning (mmap, directory, offset of the first section) or None"""
+    if not os.path.exists(path):
+        return None
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size < len(SNAPSHOT_MAGIC) + 8:
+            return None
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    if mapped[:len(SNAPSHOT_MAGIC)] != SNAPSHOT_MAGIC:
+        return None
+    header_length = int.from_bytes(mapped[len(SNAPSHOT_MAGIC):len(SNAPSHOT_MAGIC) + 8], 'little')
+    header_size = len(SNAPSHOT_MAGIC) + 8 + header_length
+    directory = json.loads(mapped[len(SNAPSHOT_MAGIC) + 8:header_size])
+    return mapped, directory, header_size + (-header_size % 8)
+
+def load_index_snapshot(data_version: int, path: Optional[str] = None) -> Optional[Dict[str, MappedSearchIndex]]:
+    """Map the snapshot's indexes if it was written for this data version and these fields"""
+    opened = read_snapshot_directory(path or snapshot_path())
+    if opened is None:
+        return None
+    mapped, directory, base = opened
+    tables = directory.get('tables', {})
+    if directory.get('data_version') != data_version or set(tables) != set(SEARCHABLE_FIELDS):
+        return None
+
+    buffer = memoryview(mapped)
+
+    def array(section: List[int], dtype: str) -> np.ndarray:
+        offset, length = section
+        return np.frombuffer(mapped, dtype=dtype, count=length // np.dtype(dtype).itemsize, offset=base + offset)
+
+    def view(section: List[int], code: str) -> memoryview:
+        # Plain memoryviews index faster than numpy arrays for single elements
+        offset, length = section
+        return buffer[base + offset:base + offset + length].cast(code)
+
+    def strings(sections: Dict[str, List[int]]) -> StringArray:
+        return StringArray(mapped, view(sections['offsets'], 'Q'), base)
+
+    indexes = {}
+    for table, entry in tables.items():
+        if entry['fields'] != SEARCHABLE_FIELDS[table]:
+            return None
+        suggest = entry.get('suggest')
+        suggest_keys = None
+        if suggest and entry.get('suggest_fields') == SUGGEST_FIELDS[table]:
+            suggest_keys = {
+                'name_keys': strings(suggest['name_keys']),
+                'name_positions': view(suggest['name_positions'], 'I'),
+                'word_keys': strings(suggest['word_keys']),
+                'word_positions': view(suggest['word_positions'], 'I')
+            }
+        indexes[table] = MappedSearchIndex(
+            table, entry['fields'], entry['has_fts'],
+            strings(entry['ids']),
+            RowValues([strings(sections) for sections in entry['values']]),
+            strings(entry['names']), strings(entry['descriptions']),
+            MappedPostings(strings(entry['grams']), view(entry['posting_offsets'], 'Q'), view(entry['postings'], 'I')),
+            view(entry['gram_counts'], 'I'),
+            RowidPositions(array(entry['rowids'], 'i8'), array(entry['rowid_positions'], 'u4')),
+            suggest_keys
+        )
+    return indexes
+
+def snapshot_data_version(path: Optional[str] = None) -> Optional[int]:
+    """Data version the snapshot was written for, or None without a readable snapshot"""
+    opened = read_snapshot_directory(path or snapshot_path())
+    return opened[1].get('data_version') if opened else None
+
+def ensure_index_snapshot() -> Optional[str]:
+    """Write the index snapshot for the current data version unless an up-to-date one exists"""
+    if not Config.INDEX_SNAPSHOT_ENABLED:
+        return None
+    path = snapshot_path()
+    with read_connection() as conn:
+        data_version = get_data_version(conn)
+        if snapshot_data_version(path) == data_version:
+            return path
+        indexes = {table: build_search_index(table, conn) for table in SEARCHABLE_FIELDS}
+
+    write_index_snapshot(indexes, data_version, path)
+    print(f"Wrote search index snapshot {path} ({os.path.getsize(path) / (1024 * 1024):.1f} MB)")
+    return path
+
+def build_search_index(table: str, conn: Optional[sqlite3.Connection] = None) -> SearchIndex:
+    """Build the candidate index for a table from the database"""
+    if conn is None:
+        with read_connection() as conn:
+            return build_search_index(table, conn)
+
+    fields = SEARCHABLE_FIELDS[table]
+    index = SearchIndex(table, fields)
+    c = conn.cursor()
+    columns = [row[1] for row in c.execute(f"PRAGMA table_info({table})")]
+    normalized_fields = [normalized_column(field) for field in fields]
+    display_fields = DISPLAY_FIELDS[table]
+    display_start = 2 + len(fields)
+    # Many rows share a description ("Artwork", "Dutch, (1606–1669)"), so store each string once
+    interned = {}
+
+    # Read the normalized variants persisted by init_db; older databases lack them
+    persisted = all(column in columns for column in normalized_fields)
+    search_columns = normalized_fields if persisted else fields
+    c.execute(f"SELECT rowid, id, {', '.join(search_columns)}, {', '.join(display_fields)} "
+              f"FROM {table} ORDER BY rowid")
+
+    for row in c:
+        if persisted:
+            values = tuple(value or '' for value in row[2:display_start])
+        else:
+            values = tuple(normalize_text(value) if value else '' for value in row[2:display_start])
+        name, description = describe_entity(table, dict(zip(display_fields, row[display_start:])))
+        index.add(str(row[1]), values, row[0], name, interned.setdefault(description, description))
+
+    index.has_fts = c.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?",
+                              (fts_table(table),)).fetchone() is not None
+
+    return index
+
+def load_search_indexes() -> Dict[str, SearchIndex]:
+    """Build the candidate indexes for every searchable table and swap them in at once
+
+    Searches keep using the previous indexes until the new set is complete.
+    """
+    global _indexes, _indexes_version
+    with read_connection() as conn:
+        data_version = get_data_version(conn)
+        # Map the snapshot written by init_db when it matches the data, else read SQLite
+        indexes = load_index_snapshot(data_version) if Config.INDEX_SNAPSHOT_ENABLED else None
+        source = 'mapped from snapshot'
+        if indexes is None:
+            indexes = {table: build_search_index(table, conn) for table in SEARCHABLE_FIELDS}
+            source = 'built from database'
+
+    with _index_lock:
+        _indexes = indexes
+        _indexes_version = data_version
+
+    for table, index in indexes.items():
+        print(f"Indexed {len(index)} {table} ({len(index.postings)} n-grams, {source})")
+    return indexes
+
+def get_search_index(table: str) -> SearchIndex:
+    """Get the candidate index for a table, building it on first use"""
+    index = _indexes.get(table)
+    if index is None and not _indexes:
+        # First use in this process: map the snapshot (or build every index) in one go
+        index = load_search_indexes().get(table)
+    if index is None:
+        with _index_lock:
+            index = _indexes.get(table)
+            if index is None:
+                index = build_search_index(table)
+                _indexes[table] = index
+    return index
+
+def refresh_search_indexes(data_version: int):
+    """Rebuild the indexes in the background when another process changed the data
+
+    The stale indexes keep answering until the rebuilt set is swapped in.
+    """
+    global _refresh_thread
+    if _indexes_version is None or _indexes_version == data_version:
+        return
+    with _index_lock:
+        if _refresh_thread is not None and _refresh_thread.is_alive():
+            return
+        _refresh_thread = threading.Thread(target=load_search_indexes, name='search-index-refresh', daemon=True)
+        _refresh_thread.start()
+
+def reset_search_indexes():
+    """Drop loaded indexes so they are rebuilt from the current database"""
+    global _indexes, _indexes_version
+    with _index_lock:
+        _indexes = {}
+        _indexes_version = None
\ No newline at end of file
@@ -0,0 +1,361 @@
+import os
+import json
+import time
+import uuid
+import sqlite3
+import threading
+from typing import Any, Dict, List, Optional
+from config.settings import Config
+from services.worker_service import create_process_pool
+
+# Job states; the last three are final
+JOB_QUEUED = 'queued'
+JOB_RUNNING = 'running'
+JOB_COMPLETED = 'completed'
+JOB_CANCELLED = 'cancelled'
+JOB_FAILED = 'failed'
+FINAL_STATES = (JOB_COMPLETED, JOB_CANCELLED, JOB_FAILED)
+
+_executor = None
+_executor_lock = threading.Lock()
+_job_futures = {}
+
+def open_jobs_connection() -> sqlite3.Connection:
+    """Open the job database, shared by the web workers and the job pool processes"""
+    conn = sqlite3.connect(Config.JOBS_DATABASE_PATH, timeout=30)
+    conn.row_factory = sqlite3.Row
+    conn.execute('PRAGMA journal_mode = WAL')
+    conn.execute('PRAGMA synchronous = NORMAL')
+    return conn
+
+def init_jobs_db(conn: Optional[sqlite3.Connection] = None):
+    """Create the job tables if missing"""
+    own_conn = conn is None
+    if own_conn:
+        conn = open_jobs_connection()
+    try:
+        conn.execute('''CREATE TABLE IF NOT EXISTS jobs
+                        (id TEXT PRIMARY KEY,
+                         status TEXT NOT NULL,
+                         total INTEGER NOT NULL,
+                         cancel_requested INTEGER DEFAULT 0,
+                         error TEXT,
+                         created_at REAL,
+                         started_at REAL,
+                         finished_at REAL,
+                         owner INTEGER)''')
+        # Job databases from before jobs had an owner process
+        if 'owner' not in [row[1] for row in conn.execute('PRAGMA table_info(jobs)')]:
+            conn.execute('ALTER TABLE jobs ADD COLUMN owner INTEGER')
+        conn.execute('''CREATE TABLE IF NOT EXISTS job_queries
+                        (job_id TEXT NOT NULL,
+                         position INTEGER NOT NULL,
+                         query_id TEXT NOT NULL,
+                         query TEXT NOT NULL,
+                         PRIMARY KEY (job_id, position)) WITHOUT ROWID''')
+        conn.execute('''CREATE TABLE IF NOT EXISTS job_results
+                        (job_id TEXT NOT NULL,
+                         position INTEGER NOT NULL,
+                         query_id TEXT NOT NULL,
+                         result TEXT NOT NULL,
+                         PRIMARY KEY (job_id, position)) WITHOUT ROWID''')
+        conn.commit()
+    finally:
+        if own_conn:
+            conn.close()
+
+def parse_ndjson(text: str) -> Dict[str, Dict]:
+    """Turn NDJSON (one W3C query object per line) into a {query_id: query} dict
+    
+    A line's "id" becomes its query id; lines without one are numbered q0, q1, ...
+    """
+    queries = {}
+    for number, line in enumerate(text.splitlines()):
+        if not line.strip():
+            continue
+        try:
+            query = json.loads(line)
+        except json.JSONDecodeError:
+            raise ValueError(f"Invalid JSON on line {number + 1}")
+        if not isinstance(query, dict):
+            raise ValueError(f"Line {number + 1} is not a query object")
+        query_id = str(query.pop('id', f"q{len(queries)}"))
+        queries[query_id] = query
+    return queries
+
+def create_job(queries: Dict[str, Dict]) -> Dict[str, Any]:
+    """Store a query set as a new job and queue it on the job pool"""
+    from services.reconciliation_service import parse_query
+    
+    if not isinstance(queries, dict) or not queries:
+        raise ValueError("No queries provided")
+    if len(queries) > Config.JOB_MAX_QUERIES:
+        raise ValueError(f"Too many queries (at most {Config.JOB_MAX_QUERIES} per job)")
+    if not all(isinstance(query, dict) for query in queries.values()):
+        raise ValueError("Every query must be a JSON object")
+    # Reject bad queries up front rather than failing the chunk they land in
+    for query_id, query in queries.items():
+        try:
+            parse_query(query)
+        except ValueError as e:
+            raise ValueError(f"Query {query_id}: {e}")
+    
+    job_id = uuid.uuid4().hex
+    conn = open_jobs_connection()
+    try:
+        init_jobs_db(conn)
+        # The owner process holds the job's futures; resume_jobs leaves jobs of live owners alone
+        conn.execute('INSERT INTO jobs (id, status, total, created_at, owner) VALUES (?, ?, ?, ?, ?)',
+                     (job_id, JOB_QUEUED, len(queries), time.time(), os.getpid()))
+        conn.executemany('INSERT INTO job_queries (job_id, position, query_id, query) VALUES (?, ?, ?, ?)',
+                         ((job_id, position, str(query_id), json.dumps(query))
+                          for position, (query_id, query) in enumerate(queries.items())))
+        conn.commit()
+    finally:
+        conn.close()
+    
+    submit_job(job_id, len(queries))
+    return get_job(job_id)
+
+def get_job_executor():
+    """Get the process pool running the jobs, started on first use"""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = create_process_pool(Config.JOB_WORKERS, init_job_worker)
+        return _executor
+
+def init_job_worker():
+    """Map the search indexes in a job process; jobs are already spread over processes"""
+    from services.index_service import load_search_indexes
+    
+    Config.SEARCH_WORKERS = 1
+    load_search_indexes()
+
+def submit_job(job_id: str, total: int):
+    """Queue a job's queries on the pool in chunks of Config.JOB_CHUNK_SIZE"""
+    executor = get_job_executor()
+    futures = [executor.submit(run_job_chunk, job_id, start, start + Config.JOB_CHUNK_SIZE)
+               for start in range(0, total, Config.JOB_CHUNK_SIZE)]
+    with _executor_lock:
+        _job_futures[job_id] = set(futures)
+    for future in futures:
+        future.add_done_callback(lambda future, job_id=job_id: chunk_done(job_id, future))
+
+def chunk_done(job_id: str, future):
+    """Record a finished chunk's error and finalize the job once all of its chunks are done"""
+    if not future.cancelled() and future.exception() is not None:
+        record_job_error(job_id, str(future.exception()) or type(future.exception()).__name__)
+    
+    with _executor_lock:
+        remaining = _job_futures.get(job_id, set())
+        remaining.discard(future)
+        if remaining:
+            return
+        _job_futures.pop(job_id, None)
+    finalize_job(job_id)
+
+def record_job_error(job_id: str, error: str):
+    """Keep the first chunk error of a job, whichever chunk finishes last"""
+    conn = open_jobs_connection()
+    try:
+        conn.execute('UPDATE jobs SET error = ? WHERE id = ? AND error IS NULL', (error, job_id))
+        conn.commit()
+    finally:
+        conn.close()
+
+def finalize_job(job_id: str, error: Optional[str] = None):
+    """Mark a job completed, cancelled or failed from its stored results and chunk errors"""
+    conn = open_jobs_connection()
+    try:
+        job = conn.execute('SELECT total, cancel_requested, error FROM jobs WHERE id = ?', (job_id,)).fetchone()
+        if job is None:
+            return
+        error = error or job['error']
+        completed = conn.execute('SELECT COUNT(*) FROM job_results WHERE job_id = ?', (job_id,)).fetchone()[0]
+        if job['cancel_requested']:
+            status = JOB_CANCELLED
+        elif completed >= job['total']:
+            status = JOB_COMPLETED
+        elif error:
+            status = JOB_FAILED
+        else:
+            # Chunks dropped by a pool shutdown; resume_jobs picks the job up again
+            return
+        conn.execute('UPDATE jobs SET status = ?, error = ?, finished_at = ? WHERE id = ?',
+                     (status, error, time.time(), job_id))
+        conn.commit()
+    finally:
+        conn.close()
+
+def run_job_chunk(job_id: str, start: int, end: int) -> int:
+    """Reconcile the queries at positions [start, end) of a job in a pool process
+    
+    Queries that already have a stored result are skipped, so a resumed job picks up where it
+    stopped. Returns the number of queries reconciled.
+    """
+    from services.reconciliation_service import process_reconciliation_queries
+    
+    conn = open_jobs_connection()
+    reconciled = 0
+    try:
+        conn.execute('UPDATE jobs SET status = ?, started_at = ? WHERE id = ? AND status = ?',
+                     (JOB_RUNNING, time.time(), job_id, JOB_QUEUED))
+        conn.commit()
+        
+        rows = conn.execute('''SELECT position, query_id, query FROM job_queries q
+                               WHERE job_id = ? AND position >= ? AND position < ?
+                               AND NOT EXISTS (SELECT 1 FROM job_results r
+                                               WHERE r.job_id = q.job_id AND r.position = q.position)
+                               ORDER BY position''', (job_id, start, end)).fetchall()
+        
+        for batch_start in range(0, len(rows), Config.JOB_BATCH_SIZE):
+            if is_cancel_requested(conn, job_id):
+                break
+            batch = rows[batch_start:batch_start + Config.JOB_BATCH_SIZE]
+            
+            # Key by position so repeated query ids within a job stay separate
+            queries = {str(row['position']): json.loads(row['query']) for row in batch}
+            results = process_reconciliation_queries(json.dumps(queries))
+            conn.executemany('INSERT OR REPLACE INTO job_results (job_id, position, query_id, result) '
+                             'VALUES (?, ?, ?, ?)',
+                             [(job_id, row['position'], row['query_id'], json.dumps(results[str(row['position'])]))
+                              for row in batch])
+            conn.commit()
+            reconciled += len(batch)
+    finally:
+        conn.close()
+    return reconciled
+
+def is_cancel_requested(conn: sqlite3.Connection, job_id: str) -> bool:
+    row = conn.execute('SELECT cancel_requested FROM jobs WHERE id = ?', (job_id,)).fetchone()
+    return row is None or bool(row['cancel_requested'])
+
+def get_job(job_id: str) -> Optional[Dict[str, Any]]:
+    """Get a job's status and progress"""
+    conn = open_jobs_connection()
+    try:
+        init_jobs_db(conn)
+        job = conn.execute('SELECT * FROM jobs WHERE id = ?', (job_id,)).fetchone()
+        if job is None:
+            return None
+        completed = conn.execute('SELECT COUNT(*) FROM job_results WHERE job_id = ?', (job_id,)).fetchone()[0]
+    finally:
+        conn.close()
+    
+    return {
+        "id": job['id'],
+        "status": job['status'],
+        "total": job['total'],
+        "completed": completed,
+        "progress": round(completed / job['total'], 4) if job['total'] else 1.0,
+        "cancel_requested": bool(job['cancel_requested']),
+        "error": job['error'],
+        "created_at": job['created_at'],
+        "started_at": job['started_at'],
+        "finished_at": job['finished_at']
+    }
+
+def get_job_results(job_id: str, cursor: int = 0, limit: Optional[int] = None) -> Optional[Dict[str, Any]]:
+    """Page through a job's results in query order, including those of a job still running
+    
+    Results are a list of W3C results, each with its "query_id"; a list because JSON objects
+    lose their order in many encoders. next_cursor resumes after the last returned query.
+    """
+    job = get_job(job_id)
+    if job is None:
+        return None
+    
+    limit = min(limit or Config.JOB_RESULTS_PAGE_SIZE, Config.JOB_RESULTS_PAGE_SIZE)
+    conn = open_jobs_connection()
+    try:
+        rows = conn.execute('''SELECT position, query_id, result FROM job_results
+                               WHERE job_id = ? AND position >= ?
+                               ORDER BY position LIMIT ?''', (job_id, max(0, cursor), limit)).fetchall()
+    finally:
+        conn.close()
+    
+    return {
+        "id": job_id,
+        "status": job['status'],
+        "results": [dict(json.loads(row['result']), query_id=row['query_id']) for row in rows],
+        "cursor": cursor,
+        "next_cursor": rows[-1]['position'] + 1 if rows else cursor
+    }
+
+def cancel_job(job_id: str) -> Optional[Dict[str, Any]]:
+    """Ask a job to stop; chunks not yet started are dropped and running ones stop between batches"""
+    conn = open_jobs_connection()
+    try:
+        init_jobs_db(conn)
+        updated = conn.execute('UPDATE jobs SET cancel_requested = 1 WHERE id = ? AND status NOT IN (?, ?, ?)',
+                               (job_id,) + FINAL_STATES).rowcount
+        conn.commit()
+    finally:
+        conn.close()
+    
+    if updated:
+        with _executor_lock:
+            futures = list(_job_futures.get(job_id, ()))
+        for future in futures:
+            future.cancel()
+    return get_job(job_id)
+
+def process_alive(pid: int) -> bool:
+    """Whether a process with this id is running on this machine"""
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    except OSError:
+        return False
+    return True
+
+def resume_jobs() -> List[str]:
+    """Queue the unfinished jobs whose owner process is gone again
+    
+    Each web worker calls this at startup. A job is claimed by swapping in this process as its
+    owner, so only one worker resumes it, and jobs of a live worker are left alone.
+    """
+    conn = open_jobs_connection()
+    try:
+        init_jobs_db(conn)
+        jobs = conn.execute('SELECT id, total, cancel_requested, owner FROM jobs WHERE status IN (?, ?)',
+                            (JOB_QUEUED, JOB_RUNNING)).fetchall()
+        claimed = []
+        for job in jobs:
+            owner = job['owner']
+            with _executor_lock:
+                running_here = job['id'] in _job_futures
+            if running_here or (owner is not None and owner != os.getpid() and process_alive(owner)):
+                continue
+            if conn.execute('UPDATE jobs SET owner = ? WHERE id = ? AND owner IS ?',
+                            (os.getpid(), job['id'], owner)).rowcount:
+                claimed.append(job)
+        conn.commit()
+    finally:
+        conn.close()
+    
+    resumed = []
+    for job in claimed:
+        if job['cancel_requested']:
+            finalize_job(job['id'])
+            continue
+        submit_job(job['id'], job['total'])
+        resumed.append(job['id'])
+    if resumed:
+        print(f"Resumed {len(resumed)} reconciliation jobs")
+    return resumed
+
+def shutdown_job_executor(wait: bool = True):
+    """Stop the job pool (unfinished jobs are resumed on the next start)"""
+    global _executor
+    with _executor_lock:
+        executor, _executor = _executor, None
+        futures = [future for futures in _job_futures.values() for future in futures]
+    for future in futures:
+        future.cancel()
+    if executor is not None:
+        executor.shutdown(wait=wait)
\ No newline at end of file
@@ -0,0 +1,167 @@
+import time
+import threading
+from bisect import bisect_left
+from typing import Dict, List, Optional, Tuple
+from config.settings import Config
+
+class Histogram:
+    """Thread-safe Prometheus-style histogram with one series per label set"""
+
+    def __init__(self, name: str, help_text: str, label_names: Tuple[str, ...], buckets: List[float]):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = label_names
+        self.buckets = sorted(buckets)
+        self.series = {}
+        self.lock = threading.Lock()
+
+    def observe(self, labels: Tuple[str, ...], value: float):
+        # Counts are kept per bucket and made cumulative when rendered
+        bucket = bisect_left(self.buckets, value)
+        with self.lock:
+            series = self.series.get(labels)
+            if series is None:
+                series = self.series[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][bucket] += 1
+            series[1] += value
+            series[2] += 1
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self.lock:
+            series = {labels: (list(counts), total, count) for labels, (counts, total, count) in self.series.items()}
+        for labels, (counts, total, count) in sorted(series.items()):
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + [None], counts):
+                cumulative += bucket_count
+                le = '+Inf' if bound is None else format_value(bound)
+                lines.append(f"{self.name}_bucket{format_labels(self.label_names + ('le',), labels + (le,))} {cumulative}")
+            lines.append(f"{self.name}_sum{format_labels(self.label_names, labels)} {format_value(total)}")
+            lines.append(f"{self.name}_count{format_labels(self.label_names, labels)} {count}")
+        return lines
+
+    def clear(self):
+        with self.lock:
+            self.series.clear()
+
+class Counter:
+    """Thread-safe Prometheus counter with one value per label set"""
+
+    def __init__(self, name: str, help_text: str, label_names: Tuple[str, ...]):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = label_names
+        self.values = {}
+        self.lock = threading.Lock()
+
+    def inc(self, labels: Tuple[str, ...], amount: float = 1):
+        with self.lock:
+            self.values[labels] = self.values.get(labels, 0) + amount
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        with self.lock:
+            values = dict(self.values)
+        for labels, value in sorted(values.items()):
+            lines.append(f"{self.name}{format_labels(self.label_names, labels)} {format_value(value)}")
+        return lines
+
+    def clear(self):
+        with self.lock:
+            self.values.clear()
+
+def format_labels(names: Tuple[str, ...], values: Tuple[str, ...]) -> str:
+    if not names:
+        return ''
+    escaped = (str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for value in values)
+    return '{' + ','.join(f'{name}="{value}"' for name, value in zip(names, escaped)) + '}'
+
+def format_value(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+request_duration = Histogram('reconciliation_request_duration_seconds',
+                             'HTTP request latency by endpoint and entity type',
+                             ('endpoint', 'method', 'type', 'status'), Config.METRICS_LATENCY_BUCKETS)
+stage_duration = Histogram('reconciliation_search_stage_seconds',
+                           'Time spent in each search stage per batch',
+                           ('stage',), Config.METRICS_STAGE_BUCKETS)
+query_rows = Histogram('reconciliation_query_rows',
+                       'Rows per query and table: candidates fetched from the index, and those fuzzy-scored',
+                       ('table', 'kind'), Config.METRICS_ROW_BUCKETS)
+queries_total = Counter('reconciliation_queries_total', 'Search queries run (result cache misses)', ('type',))
+rows_total = Counter('reconciliation_rows_total', 'Candidate rows fetched and fuzzy-scored', ('table', 'kind'))
+
+METRICS = [request_duration, stage_duration, query_rows, queries_total, rows_total]
+
+# Search stages, in the order a batch runs them
+SEARCH_STAGES = ['normalize', 'exact_sql', 'candidate_fetch', 'scoring', 'sort', 'format']
+
+class SearchStats:
+    """Per-batch stage timings and per-query row counts, recorded once the batch finishes"""
+
+    __slots__ = ('stages', 'rows', 'types')
+
+    def __init__(self):
+        self.stages = dict.fromkeys(SEARCH_STAGES, 0.0)
+        self.rows = []
+        self.types = []
+
+    def add_rows(self, table: str, fetched: int, scored: int):
+        self.rows.append((table, fetched, scored))
+
+    def record(self):
+        if not Config.METRICS_ENABLED:
+            return
+        for stage, seconds in self.stages.items():
+            stage_duration.observe((stage,), seconds)
+        for table, fetched, scored in self.rows:
+            query_rows.observe((table, 'fetched'), fetched)
+            query_rows.observe((table, 'scored'), scored)
+            rows_total.inc((table, 'fetched'), fetched)
+            rows_total.inc((table, 'scored'), scored)
+        for entity_type in self.types:
+            queries_total.inc((entity_type or 'any',))
+
+_request_labels = threading.local()
+
+def start_request():
+    """Reset the per-request labels at the start of a request on this thread"""
+    _request_labels.started = time.perf_counter()
+    _request_labels.entity_type = None
+
+def set_entity_type(entity_type: Optional[str]):
+    """Label the current request with an entity type; requests spanning several become 'mixed'"""
+    entity_type = entity_type or 'any'
+    current = getattr(_request_labels, 'entity_type', None)
+    _request_labels.entity_type = entity_type if current in (None, entity_type) else 'mixed'
+
+def finish_request(endpoint: str, method: str, status: int):
+    """Observe the current request's latency under its endpoint, type and status labels"""
+    started = getattr(_request_labels, 'started', None)
+    if started is None or not Config.METRICS_ENABLED:
+        return
+    _request_labels.started = None
+    entity_type = getattr(_request_labels, 'entity_type', None) or 'none'
+    request_duration.observe((endpoint, method, entity_type, str(status)), time.perf_counter() - started)
+
+def render_metrics(gauges: Optional[Dict[str, Tuple[str, Dict[Tuple, float]]]] = None) -> str:
+    """All metrics in the Prometheus text exposition format
+
+    gauges maps extra gauge names to (help text, {(label name, value) pairs: value}).
+    """
+    lines = []
+    for metric in METRICS:
+        lines.extend(metric.render())
+    for name, (help_text, values) in sorted((gauges or {}).items()):
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} gauge")
+        for labels, value in sorted(values.items()):
+            label_names = tuple(label for label, _ in labels)
+            label_values = tuple(label_value for _, label_value in labels)
+            lines.append(f"{name}{format_labels(label_names, label_values)} {format_value(value)}")
+    return '\n'.join(lines) + '\n'
+
+def reset_metrics():
+    """Clear every recorded metric in this process"""
+    for metric in METRICS:
+        metric.clear()
@@ -0,0 +1,237 @@
+import re
+from datetime import date
+from typing import Any, Dict, List, Optional, Tuple
+from fuzzywuzzy import fuzz
+from config.settings import Config
+from utils.text_utils import normalize_text
+from services.index_service import fts_table
+from services.geo_service import parse_point, proximity_score, box_condition
+from services.relation_service import creator_condition_sql, parse_constituent_ids, constituent_artist_id
+
+YEAR_PATTERN = re.compile(r'\b(\d{3,4})\b')
+
+def property_value_text(value: Any) -> str:
+    """Plain text of a W3C property value (string, number or {id, name} entity)"""
+    if isinstance(value, dict):
+        return str(value.get('name') or value.get('id') or '')
+    if isinstance(value, list):
+        return ' '.join(property_value_text(item) for item in value)
+    return '' if value is None else str(value)
+
+def parse_properties(properties: Any) -> Dict[str, Any]:
+    """Turn W3C [{pid, v}] properties (or a plain {pid: v} dict) into {pid: v}"""
+    if not properties:
+        return {}
+    if isinstance(properties, dict):
+        return {str(pid): value for pid, value in properties.items() if value not in (None, '')}
+
+    parsed = {}
+    for prop in properties:
+        if not isinstance(prop, dict):
+            continue
+        pid = prop.get('pid') or prop.get('id')
+        value = prop.get('v')
+        if pid and value not in (None, ''):
+            parsed[str(pid)] = value
+    return parsed
+
+def extract_years(text: str) -> List[int]:
+    """Years mentioned in a date string such as "c. 1905-1910" """
+    return [int(year) for year in YEAR_PATTERN.findall(text) if 100 <= int(year) <= 2100]
+
+def text_similarity(value: str, candidates: List[Any]) -> int:
+    """Best fuzz.ratio between a normalized property value and candidate field values"""
+    normalized_value = normalize_text(value)
+    if not normalized_value:
+        return 0
+    scores = [fuzz.ratio(normalized_value, normalize_text(candidate)) for candidate in candidates if candidate]
+    return max(scores) if scores else 0
+
+def year_distance_score(years: List[int], start: Optional[int], end: Optional[int]) -> int:
+    """100 inside [start, end], dropping Config.PROPERTY_YEAR_PENALTY points per year outside"""
+    if not years or start is None:
+        return 0
+    end = end if end is not None else start
+    low, high = min(years), max(years)
+    if high >= start and low <= end:
+        return 100
+    distance = start - high if high < start else low - end
+    return max(0, 100 - Config.PROPERTY_YEAR_PENALTY * distance)
+
+def constituent_key(value: Any) -> Optional[str]:
+    """Constituent ID referenced by a creator value: a reconciled {id} entity or an ARTIST_<id>
+
+    A bare number only counts as the id of an entity; as text, "1905" is more likely a year.
+    """
+    if isinstance(value, dict):
+        keys = parse_constituent_ids(value.get('id', ''))
+    else:
+        keys = parse_constituent_ids(property_value_text(value), bare_numbers=False)
+    return keys[0] if len(keys) == 1 else None
+
+def score_creator(value, row) -> int:
+    key = constituent_key(value)
+    if key and key in parse_constituent_ids(row['constituent_id']):
+        return 100
+    return text_similarity(property_value_text(value), [row['artist']])
+
+def score_artifact_date(value, row) -> int:
+    years = extract_years(property_value_text(value))
+    object_years = extract_years(str(row['date'] or ''))
+    if object_years:
+        return year_distance_score(years, min(object_years), max(object_years))
+    # Without an object date, fall back to the artist's life dates
+    return year_distance_score(years, row['begin_date'], row['end_date'] or None)
+
+def score_life_dates(value, row) -> int:
+    years = extract_years(property_value_text(value))
+    death_year = row['death_year'] or date.today().year
+    return year_distance_score(years, row['birth_year'], death_year)
+
+def score_location(value, row) -> int:
+    point = parse_point(value)
+    if point:
+        return proximity_score(*point, row['latitude'], row['longitude'])
+    
+    text = property_value_text(value)
+    parts = [part for part in re.split(r'[,;]', text) if part.strip()] or [text]
+    city, state = row['city_admin'] or '', row['state_admin'] or ''
+    scores = [text_similarity(text, [city, state, f"{city} {state}"])]
+    scores.extend(text_similarity(part, [city, state]) for part in parts)
+    return max(scores)
+
+def text_scorer(*columns):
+    """Score a property by its best similarity to any of the given columns"""
+    def score(value, row) -> int:
+        return text_similarity(property_value_text(value), [row[column] for column in columns])
+    return score
+
+def fts_condition(columns: List[str]):
+    """Pre-filter rows whose FTS5 columns contain every token of the value"""
+    def condition(table: str, value) -> Optional[Tuple[str, list]]:
+        tokens = [token for token in normalize_text(property_value_text(value)).split()
+                  if len(token) >= Config.FTS_MIN_TOKEN_LENGTH]
+        if not tokens:
+            return None
+        fts = fts_table(table)
+        match = '{' + ' '.join(columns) + '} : (' + ' AND '.join(f'"{token}"' for token in tokens) + ')'
+        return f"rowid IN (SELECT rowid FROM {fts} WHERE {fts} MATCH ?)", [match]
+    return condition
+
+def creator_condition(table: str, value) -> Optional[Tuple[str, list]]:
+    # A reconciled artist selects its works through the artist -> artwork edges init_db resolved
+    key = constituent_key(value)
+    if not key:
+        return fts_condition(['artist'])(table, value)
+    return creator_condition_sql(constituent_artist_id(key))
+
+def location_condition(table: str, value) -> Optional[Tuple[str, list]]:
+    # Coordinates select the museums in the R*Tree around the point, anything else is a place name
+    point = parse_point(value)
+    if point:
+        return box_condition(*point)
+    return fts_condition(['city_admin', 'state_admin'])(table, value)
+
+def life_dates_condition(table: str, value) -> Optional[Tuple[str, list]]:
+    years = extract_years(property_value_text(value))
+    if not years:
+        return None
+    return "birth_year <= ? AND (death_year >= ? OR death_year IS NULL OR death_year = 0)", [max(years), min(years)]
+
+# Properties understood per table: the columns they read, an optional indexed pre-filter
+# condition and a 0-100 scorer
+PROPERTY_MATCHERS = {
+    'artifacts': {
+        'creator': {'columns': ['artist', 'constituent_id'], 'condition': creator_condition, 'score': score_creator},
+        'date': {'columns': ['date', 'begin_date', 'end_date'], 'condition': None, 'score': score_artifact_date},
+        'nationality': {'columns': ['nationality'], 'condition': None, 'score': text_scorer('nationality')},
+        'medium': {'columns': ['medium'], 'condition': fts_condition(['medium']), 'score': text_scorer('medium')},
+        'classification': {'columns': ['classification'], 'condition': fts_condition(['classification']),
+                           'score': text_scorer('classification')},
+        'department': {'columns': ['department'], 'condition': fts_condition(['department']),
+                       'score': text_scorer('department')}
+    },
+    'artists': {
+        'nationality': {'columns': ['nationality'], 'condition': fts_condition(['nationality']),
+                        'score': text_scorer('nationality')},
+        'date': {'columns': ['birth_year', 'death_year'], 'condition': life_dates_condition, 'score': score_life_dates}
+    },
+    'museums': {
+        'location': {'columns': ['city_admin', 'state_admin', 'latitude', 'longitude'],
+                     'condition': location_condition, 'score': score_location},
+        'museum_type': {'columns': ['museum_type'], 'condition': fts_condition(['museum_type']),
+                        'score': text_scorer('museum_type')}
+    }
+}
+
+def applicable_properties(table: str, properties: Dict[str, Any]) -> Dict[str, Any]:
+    """The subset of parsed properties this table knows how to match"""
+    matchers = PROPERTY_MATCHERS.get(table, {})
+    return {pid: value for pid, value in properties.items() if pid in matchers}
+
+def property_weights(properties: Dict[str, Any]) -> Tuple[float, Dict[str, float]]:
+    """(name weight, weight per property), keeping at least Config.MIN_NAME_WEIGHT on the name"""
+    weights = {pid: Config.PROPERTY_WEIGHTS.get(pid, Config.DEFAULT_PROPERTY_WEIGHT) for pid in properties}
+    total = sum(weights.values())
+    available = 1.0 - Config.MIN_NAME_WEIGHT
+    if total > available:
+        weights = {pid: weight * available / total for pid, weight in weights.items()}
+        total = available
+    return 1.0 - total, weights
+
+def combine_scores(name_score: int, property_scores: Dict[str, int], properties: Dict[str, Any]) -> int:
+    """Weighted blend of the name score and the property scores"""
+    name_weight, weights = property_weights(properties)
+    blended = name_weight * name_score + sum(weights[pid] * property_scores.get(pid, 0) for pid in properties)
+    return int(round(blended))
+
+def combined_upper_bound(name_bound: int, properties: Dict[str, Any]) -> int:
+    """Highest blended score a row can reach given an upper bound on its name score"""
+    name_weight, _ = property_weights(properties)
+    return int(round(name_weight * name_bound + (1.0 - name_weight) * 100))
+
+def prefilter_rowids(c, table: str, properties: Dict[str, Any]) -> Optional[List[int]]:
+    """Rowids satisfying every indexed property condition, or None when that cannot shrink the scan
+
+    None is returned when no property has an indexed condition, when nothing matches (so bad
+    property values never hide name matches) or when more than Config.PROPERTY_PREFILTER_MAX
+    rows match.
+    """
+    conditions = []
+    params = []
+    for pid, value in properties.items():
+        condition = PROPERTY_MATCHERS[table][pid]['condition']
+        built = condition(table, value) if condition else None
+        if built:
+            conditions.append(built[0])
+            params.extend(built[1])
+    if not conditions:
+        return None
+
+    c.execute(f"SELECT rowid FROM {table} WHERE {' AND '.join(conditions)} LIMIT ?",
+              params + [Config.PROPERTY_PREFILTER_MAX + 1])
+    rowids = [row[0] for row in c.fetchall()]
+    if not rowids or len(rowids) > Config.PROPERTY_PREFILTER_MAX:
+        return None
+    return rowids
+
+def score_properties(c, table: str, properties: Dict[str, Any], entity_ids: List[str]) -> Dict[str, Dict[str, int]]:
+    """Property scores per entity id, reading only the columns the properties need
+
+    Callers keep entity_ids under SQLite's bound-parameter limit.
+    """
+    if not entity_ids or not properties:
+        return {}
+
+    matchers = PROPERTY_MATCHERS[table]
+    columns = sorted({column for pid in properties for column in matchers[pid]['columns']})
+    c.execute(f"SELECT id, {', '.join(columns)} FROM {table} WHERE id IN ({','.join('?' * len(entity_ids))})",
+              entity_ids)
+    return {str(row['id']): {pid: matchers[pid]['score'](value, row) for pid, value in properties.items()}
+            for row in c.fetchall()}
+
+def make_features(name_score: int, property_scores: Dict[str, int]) -> List[Dict[str, Any]]:
+    """W3C match features: the name score plus one entry per matched property"""
+    features = [{"id": "name", "value": name_score}]
+    features.extend({"id": pid, "value": score} for pid, score in property_scores.items())
+    return features
\ No newline at end of file
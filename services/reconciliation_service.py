@@ -1,34 +1,88 @@
 import json
-from typing import Dict, Any
-from services.search_service import search_entities
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+from services.search_service import search_entities_batch
+from services.metrics_service import set_entity_type
 from config.settings import Config
 
 def process_reconciliation_queries(queries_json: str) -> Dict[str, Any]:
     """Process reconciliation queries following W3C specification"""
+    requests, query_ids = plan_reconciliation_queries(queries_json)
+    # Search the whole batch at once
+    return dict(iter_reconciliation_results(requests, query_ids, len(requests)))
+
+def plan_reconciliation_queries(queries_json: str) -> Tuple[List[Tuple], List[List[str]]]:
+    """Parse a W3C query batch into distinct search requests and the query ids answered by each"""
     try:
         queries = json.loads(queries_json)
     except json.JSONDecodeError:
         raise ValueError("Invalid JSON in queries parameter")
+    if not isinstance(queries, dict):
+        raise ValueError("Queries must be a JSON object")
     
-    results = {}
+    requests = []
+    query_ids = []
+    request_positions = {}
     
     for query_id, query_data in queries.items():
-        query_text = query_data.get('query', '')
-        limit = min(query_data.get('limit', Config.DEFAULT_SEARCH_LIMIT), Config.MAX_RESULTS_LIMIT)
-        type_filter = None
-        properties = query_data.get('properties', {})
-        
-        # Handle type filtering
-        if 'type' in query_data:
-            type_filter = query_data['type']
-        elif 'types' in query_data and query_data['types']:
-            type_filter = query_data['types'][0]
+        request = parse_query(query_data)
+        set_entity_type(request[2])
         
-        # Search for matches
-        matches = search_entities(query_text, limit, type_filter, properties)
-        results[query_id] = {"result": matches}
+        # Identical queries within a batch are only searched once
+        key = (request[0], request[1], request[2], json.dumps(request[3], sort_keys=True, default=str))
+        if key not in request_positions:
+            request_positions[key] = len(requests)
+            requests.append(request)
+            query_ids.append([])
+        query_ids[request_positions[key]].append(query_id)
+    
+    return requests, query_ids
+
+def stream_chunk_size() -> int:
+    """Requests searched per streamed chunk
+    
+    Config.STREAM_SEARCH_CHUNK, raised to Config.PARALLEL_SEARCH_MIN_BATCH when the search pool
+    is enabled, since smaller chunks would never be large enough to fan out to it.
+    """
+    if Config.SEARCH_WORKERS > 1:
+        return max(Config.STREAM_SEARCH_CHUNK, Config.PARALLEL_SEARCH_MIN_BATCH)
+    return Config.STREAM_SEARCH_CHUNK
+
+def iter_reconciliation_results(requests: List[Tuple], query_ids: List[List[str]],
+                                chunk_size: Optional[int] = None) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """Yield (query id, W3C result) pairs, searching chunk_size requests at a time
+    
+    Smaller chunks (default stream_chunk_size()) let a streamed response start sooner
+    and hold fewer results at once; one chunk keeps the whole batch in a single search pass.
+    """
+    chunk_size = max(1, chunk_size or stream_chunk_size())
+    for start in range(0, len(requests), chunk_size):
+        partial_flags = []
+        batch_matches = search_entities_batch(requests[start:start + chunk_size], partial_flags=partial_flags)
+        for ids, matches, partial in zip(query_ids[start:start + chunk_size], batch_matches, partial_flags):
+            result = {"result": matches}
+            if partial:
+                # The time budget ran out; these are the best matches found so far
+                result["partial"] = True
+            for query_id in ids:
+                yield query_id, result
+
+def parse_query(query_data: Dict[str, Any]) -> Tuple[str, int, Optional[str], Any]:
+    """Turn one W3C query object into a (query, limit, type_filter, properties) search request"""
+    query_text = query_data.get('query', '')
+    try:
+        limit = min(int(query_data.get('limit', Config.DEFAULT_SEARCH_LIMIT)), Config.MAX_RESULTS_LIMIT)
+    except (TypeError, ValueError):
+        raise ValueError("limit must be an integer")
+    type_filter = None
+    properties = query_data.get('properties', {})
+    
+    # Handle type filtering
+    if 'type' in query_data:
+        type_filter = query_data['type']
+    elif 'types' in query_data and query_data['types']:
+        type_filter = query_data['types'][0]
     
-    return results
+    return query_text, limit, type_filter, properties
 
 def get_service_metadata() -> Dict[str, Any]:
     """Get service metadata following W3C specification"""
@@ -0,0 +1,151 @@
+import sqlite3
+from typing import Dict, List, Optional, Tuple
+from config.settings import Config
+from utils.text_utils import normalize_text
+from services.index_service import ID_PREFIXES
+
+# Artist -> artwork edges, keyed by rowid in both tables
+CREATOR_TABLE = 'artist_artifacts'
+
+# How an edge was resolved
+BY_CONSTITUENT = 'constituent'
+BY_NAME = 'name'
+
+def parse_constituent_ids(text, bare_numbers: bool = True) -> List[str]:
+    """Constituent ids in comma-separated text, as numbers without leading zeros
+
+    Each part is an ARTIST_<id> or, with bare_numbers, a plain number; anything else is skipped.
+    """
+    prefix = ID_PREFIXES['artists']
+    keys = []
+    for part in str(text or '').split(','):
+        part = part.strip()
+        if part.upper().startswith(prefix):
+            part = part[len(prefix):]
+        elif not bare_numbers:
+            continue
+        if part.isdigit():
+            keys.append(str(int(part)))
+    return keys
+
+def constituent_artist_id(key) -> str:
+    """Artist id of a constituent id"""
+    return f"{ID_PREFIXES['artists']}{int(key):06d}"
+
+def constituent_artist_ids(constituent_id) -> List[str]:
+    """Artist ids referenced by an artwork's comma-separated constituent ids"""
+    return [constituent_artist_id(key) for key in parse_constituent_ids(constituent_id)]
+
+def credited_names(artist) -> List[str]:
+    """Names in an artwork's comma-separated artist field"""
+    return [name.strip() for name in str(artist or '').split(',') if name.strip()]
+
+def link_creators(artist: str, constituent_id, rowids_by_id: Dict[str, int],
+                  rowids_by_name: Dict[str, Optional[int]]) -> List[Tuple[int, str]]:
+    """(artist rowid, method) of the creators of one artwork
+
+    Constituent ids are trusted first. Names in the comma-separated artist field that none of
+    those artists carry are then matched on their normalized form, when exactly one artist has it.
+    """
+    creators = {}
+    for artist_id in constituent_artist_ids(constituent_id):
+        rowid = rowids_by_id.get(artist_id)
+        if rowid is not None:
+            creators.setdefault(rowid, BY_CONSTITUENT)
+
+    for name in credited_names(artist):
+        rowid = rowids_by_name.get(normalize_text(name))
+        if rowid is not None:
+            creators.setdefault(rowid, BY_NAME)
+    return list(creators.items())
+
+def create_creator_table(conn: sqlite3.Connection):
+    conn.execute(f'''CREATE TABLE IF NOT EXISTS {CREATOR_TABLE}
+                     (artist_rowid INTEGER NOT NULL,
+                      artifact_rowid INTEGER NOT NULL,
+                      method TEXT NOT NULL,
+                      PRIMARY KEY (artist_rowid, artifact_rowid)) WITHOUT ROWID''')
+    # Reverse lookups, artwork -> artists
+    conn.execute(f'CREATE INDEX IF NOT EXISTS idx_{CREATOR_TABLE}_artifact '
+                 f'ON {CREATOR_TABLE}(artifact_rowid, artist_rowid)')
+
+def build_creator_edges(conn: sqlite3.Connection) -> int:
+    """(Re)resolve the artists of every artwork; returns the number of edges stored"""
+    create_creator_table(conn)
+    conn.execute(f'DELETE FROM {CREATOR_TABLE}')
+
+    rowids_by_id = {}
+    rowids_by_name = {}
+    for rowid, artist_id, name in conn.execute('SELECT rowid, id, name_norm FROM artists').fetchall():
+        rowids_by_id[str(artist_id)] = rowid
+        if name:
+            # Homonyms are ambiguous, so such a name resolves to no one
+            rowids_by_name[name] = None if name in rowids_by_name else rowid
+
+    def rows():
+        for rowid, artist, constituent_id in conn.execute(
+                'SELECT rowid, artist, constituent_id FROM artifacts').fetchall():
+            for artist_rowid, method in link_creators(artist, constituent_id, rowids_by_id, rowids_by_name):
+                yield artist_rowid, rowid, method
+
+    before = conn.total_changes
+    conn.executemany(f'INSERT OR IGNORE INTO {CREATOR_TABLE} VALUES (?, ?, ?)', rows())
+    return conn.total_changes - before
+
+def ensure_creator_edges(conn: sqlite3.Connection) -> bool:
+    """Resolve creators if the edge table does not exist yet; True if it was built"""
+    # Existence rather than emptiness: artworks whose artists are all unknown leave no edges,
+    # and rebuilding those on every start would bump the data version each time
+    exists = conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?",
+                          (CREATOR_TABLE,)).fetchone()
+    create_creator_table(conn)
+    has_artifacts = conn.execute('SELECT 1 FROM artifacts LIMIT 1').fetchone()
+    built = False
+    if has_artifacts and not exists:
+        count = build_creator_edges(conn)
+        print(f"Linked {count} artworks to their artists")
+        built = True
+    conn.commit()
+    return built
+
+def creator_condition_sql(artist_id: str) -> Tuple[str, list]:
+    """SQL condition on artifacts rowid selecting the works linked to an artist"""
+    return (f"rowid IN (SELECT e.artifact_rowid FROM artists a JOIN {CREATOR_TABLE} e "
+            f"ON e.artist_rowid = a.rowid WHERE a.id = ?)", [artist_id])
+
+def artist_works(c, artist_id: str, limit: Optional[int] = None) -> Tuple[List[Dict], int]:
+    """(first works, total number of works) of an artist, in catalogue order"""
+    limit = limit or Config.PREVIEW_MAX_WORKS
+    c.execute(f'SELECT w.id, w.title, w.date, COUNT(*) OVER () AS total '
+              f'FROM artists a JOIN {CREATOR_TABLE} e ON e.artist_rowid = a.rowid '
+              f'JOIN artifacts w ON w.rowid = e.artifact_rowid '
+              f'WHERE a.id = ? ORDER BY e.artifact_rowid LIMIT ?', (artist_id, limit))
+    rows = c.fetchall()
+    works = [{'id': row[0], 'title': row[1], 'date': row[2]} for row in rows]
+    return works, rows[0][3] if rows else 0
+
+def linked_creators(c, artifact_ids: List[str]) -> Dict[str, List[Dict]]:
+    """Artist entities linked to each of the given artworks, in credit order, keyed by artwork id
+
+    An artwork is only included when every artist it credits is linked, so a partly resolved
+    list never stands in for the full credit.
+    """
+    c.execute(f'SELECT w.id, w.artist, w.constituent_id, a.id, a.name '
+              f'FROM artifacts w JOIN {CREATOR_TABLE} e ON e.artifact_rowid = w.rowid '
+              f'JOIN artists a ON a.rowid = e.artist_rowid '
+              f'WHERE w.id IN ({",".join("?" * len(artifact_ids))}) ORDER BY e.artist_rowid', artifact_ids)
+    credits = {}
+    creators = {}
+    for artifact_id, artist, constituent_id, artist_id, name in c.fetchall():
+        credits[str(artifact_id)] = (artist, constituent_id)
+        creators.setdefault(str(artifact_id), []).append({"id": str(artist_id), "name": name})
+
+    linked = {}
+    for artifact_id, (artist, constituent_id) in credits.items():
+        order = constituent_artist_ids(constituent_id)
+        if len(creators[artifact_id]) < max(len(order), len(credited_names(artist))):
+            continue
+        # Artists credited by constituent id first, in that order; those linked by name after them
+        linked[artifact_id] = sorted(creators[artifact_id], key=lambda creator:
+                                     order.index(creator['id']) if creator['id'] in order else len(order))
+    return linked
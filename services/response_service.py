@@ -0,0 +1,81 @@
+import json
+import zlib
+from typing import Any, Iterable, Iterator, Optional, Tuple
+from config.settings import Config
+
+try:
+    import orjson
+except ImportError:  # Optional fast JSON encoder
+    orjson = None
+
+try:
+    import brotli
+except ImportError:  # Optional Brotli compression
+    brotli = None
+
+def dumps(value: Any) -> bytes:
+    """Compact UTF-8 JSON, through orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(value, default=str)
+    return json.dumps(value, ensure_ascii=False, separators=(',', ':'), default=str).encode('utf-8')
+
+def iter_json_object(items: Iterable[Tuple[str, Any]]) -> Iterator[bytes]:
+    """Encode (key, value) pairs as one JSON object, yielded in chunks of about Config.RESPONSE_CHUNK_BYTES"""
+    parts = [b'{']
+    size = 1
+    separator = b''
+    for key, value in items:
+        member = separator + dumps(str(key)) + b':' + dumps(value)
+        separator = b','
+        parts.append(member)
+        size += len(member)
+        if size >= Config.RESPONSE_CHUNK_BYTES:
+            yield b''.join(parts)
+            parts = []
+            size = 0
+    parts.append(b'}')
+    yield b''.join(parts)
+
+def negotiate_encoding(accept_encoding: str) -> Optional[str]:
+    """Content coding to answer an Accept-Encoding header with: 'br' (when brotli is installed), 'gzip' or None"""
+    if not Config.RESPONSE_COMPRESSION_ENABLED:
+        return None
+
+    accepted = set()
+    for part in (accept_encoding or '').lower().split(','):
+        coding, *params = [piece.strip() for piece in part.split(';')]
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition('=')
+            if name.strip() == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if quality > 0:
+            accepted.add(coding)
+    if brotli is not None and 'br' in accepted:
+        return 'br'
+    if 'gzip' in accepted or '*' in accepted:
+        return 'gzip'
+    return None
+
+def compress_chunks(chunks: Iterable[bytes], encoding: Optional[str]) -> Iterator[bytes]:
+    """Compress a stream of chunks, flushing after each so clients can decode as they arrive"""
+    if encoding is None:
+        yield from chunks
+        return
+
+    if encoding == 'br':
+        compressor = brotli.Compressor(quality=Config.RESPONSE_BROTLI_QUALITY)
+        compress, flush, finish = compressor.process, compressor.flush, compressor.finish
+    else:
+        # wbits 31 writes a gzip header and trailer
+        compressor = zlib.compressobj(Config.RESPONSE_GZIP_LEVEL, zlib.DEFLATED, 31)
+        compress, flush, finish = compressor.compress, lambda: compressor.flush(zlib.Z_SYNC_FLUSH), compressor.flush
+
+    for chunk in chunks:
+        data = compress(chunk) + flush()
+        if data:
+            yield data
+    yield finish()
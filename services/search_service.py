@@ -1,144 +1,537 @@
-import sqlite3
-from typing import Dict, List, Any, Optional
+import json
+import heapq
+import time
+import threading
+from typing import Dict, List, Optional, Tuple
 from fuzzywuzzy import fuzz
+
+try:
+    from rapidfuzz import fuzz as rapid_fuzz, process as rapid_process
+except ImportError:  # Optional fast scoring backend
+    rapid_fuzz = rapid_process = None
 from config.settings import Config
 from utils.text_utils import normalize_text
+from services.index_service import (SEARCHABLE_FIELDS, DISPLAY_FIELDS, fts_table, table_for_id, describe_entity,
+                                    get_search_index, load_search_indexes, refresh_search_indexes)
+from services.connection_service import read_connection, get_data_version
+from services.cache_service import result_cache, entity_cache, current_data_version
+from services.worker_service import create_process_pool
+from services.metrics_service import SearchStats
+from services.blocking_service import block_rowids
+from services.property_service import (parse_properties, applicable_properties, prefilter_rowids,
+                                       score_properties, combine_scores, combined_upper_bound, make_features)
+
+# Stay well under SQLite's bound-parameter limit for IN (...) lists
+SQLITE_MAX_VARIABLES = 999
+
+# Scan order of a candidate is table_rank * TABLE_ORDER_STRIDE + row position
+TABLE_ORDER_STRIDE = 1 << 40
+
+class FuzzyWuzzyScorer:
+    """Scores one query against candidate strings with fuzzywuzzy, one call per string"""
+    name = 'fuzzywuzzy'
+    
+    def score_many(self, query: str, choices: List[str]) -> List[int]:
+        return [fuzz.ratio(query, choice) for choice in choices]
+
+class RapidFuzzScorer:
+    """Scores one query against a whole array of candidate strings in a single rapidfuzz call"""
+    name = 'rapidfuzz'
+    
+    def score_many(self, query: str, choices: List[str]) -> List[int]:
+        if not choices:
+            return []
+        scores = rapid_process.cdist([query], choices, scorer=rapid_fuzz.ratio, dtype='float64', workers=1)[0]
+        # float64 avoids float32 rounding drift; fuzz.ratio rounds to an integer percentage
+        return [int(round(score)) for score in scores.tolist()]
+
+SCORERS = {
+    'fuzzywuzzy': FuzzyWuzzyScorer,
+    'rapidfuzz': RapidFuzzScorer
+}
+
+_scorer = None
+
+def get_scorer():
+    """Get the configured fuzzy scoring backend, falling back to fuzzywuzzy"""
+    global _scorer
+    if _scorer is None:
+        backend = Config.SCORER_BACKEND
+        if backend == 'auto':
+            backend = 'rapidfuzz' if rapid_process is not None else 'fuzzywuzzy'
+        if backend == 'rapidfuzz' and rapid_process is None:
+            print("Warning: rapidfuzz is not installed. Falling back to fuzzywuzzy scoring.")
+            backend = 'fuzzywuzzy'
+        _scorer = SCORERS[backend]()
+    return _scorer
+
+def set_scorer(backend: Optional[str] = None):
+    """Switch the fuzzy scoring backend ('auto', 'rapidfuzz' or 'fuzzywuzzy')"""
+    global _scorer
+    Config.SCORER_BACKEND = backend or Config.SCORER_BACKEND
+    _scorer = None
+    return get_scorer()
+
+SEARCH_CONFIGS = [
+    {
+        'table': 'museums',
+        'fields': SEARCHABLE_FIELDS['museums'],
+        'type': 'museum',
+        'type_name': 'Museum/Institution'
+    },
+    {
+        'table': 'artists',
+        'fields': SEARCHABLE_FIELDS['artists'],
+        'type': 'person',
+        'type_name': 'Artist/Creator'
+    },
+    {
+        'table': 'artifacts',
+        'fields': SEARCHABLE_FIELDS['artifacts'],
+        'type': 'artifact',
+        'type_name': 'Cultural Artifact'
+    }
+]
+
+def get_search_configs(type_filter: Optional[str] = None) -> List[Dict]:
+    """Get the search configurations matching a type filter"""
+    return [config for config in SEARCH_CONFIGS if not type_filter or type_filter == config['type']]
 
 def search_entities(query: str, limit: int = 10, type_filter: Optional[str] = None, 
                    properties: Optional[Dict] = None) -> List[Dict]:
     """Search for entities across all tables with advanced matching"""
-    conn = sqlite3.connect(Config.DATABASE_PATH)
-    conn.row_factory = sqlite3.Row
-    c = conn.cursor()
-    
-    results = []
-    normalized_query = normalize_text(query)
-    
-    # Define search configurations for each type
-    search_configs = []
-    
-    if not type_filter or type_filter == 'museum':
-        search_configs.append({
-            'table': 'museums',
-            'fields': ['museum_name', 'legal_name', 'alternate_name', 'museum_type', 'city_admin', 'state_admin'],
-            'type': 'museum',
-            'type_name': 'Museum/Institution'
-        })
-    
-    if not type_filter or type_filter == 'person':
-        search_configs.append({
-            'table': 'artists',
-            'fields': ['name', 'nationality', 'artist_bio'],
-            'type': 'person',
-            'type_name': 'Artist/Creator'
-        })
-    
-    if not type_filter or type_filter == 'artifact':
-        search_configs.append({
-            'table': 'artifacts',
-            'fields': ['title', 'artist', 'medium', 'classification', 'department'],
-            'type': 'artifact',
-            'type_name': 'Cultural Artifact'
-        })
-    
-    # Search each configured table
-    for config in search_configs:
-        # First try exact matches
-        exact_query = f"SELECT * FROM {config['table']} WHERE "
-        exact_conditions = []
-        for field in config['fields']:
-            if field:
-                exact_conditions.append(f"LOWER({field}) = ?")
+    return search_entities_batch([(query, limit, type_filter, properties)])[0]
+
+def search_entities_batch(requests: List[Tuple[str, int, Optional[str], Optional[Dict]]],
+                          time_budget_ms: Optional[float] = None,
+                          partial_flags: Optional[List[bool]] = None) -> List[List[Dict]]:
+    """Search for a batch of (query, limit, type_filter, properties) requests in one pass per table
+    
+    Each query's fuzzy stage gets time_budget_ms (default Config.SEARCH_TIME_BUDGET_MS); queries
+    that run out return their best matches so far and are flagged True in partial_flags.
+    """
+    if not requests:
+        return []
+    
+    if partial_flags is None:
+        partial_flags = []
+    partial_flags[:] = [False] * len(requests)
+    if time_budget_ms is None:
+        time_budget_ms = Config.SEARCH_TIME_BUDGET_MS
+    time_budget = time_budget_ms / 1000.0 if time_budget_ms else None
+    
+    with read_connection() as conn:
+        # Pick up data changed by another process (e.g. sync_db) without blocking this search
+        data_version = get_data_version(conn)
+        refresh_search_indexes(data_version)
         
-        if exact_conditions:
-            c.execute(exact_query + " OR ".join(exact_conditions), 
-                     [query.lower()] * len(exact_conditions))
-            
-            for row in c.fetchall():
-                result = create_result_from_row(row, config, 100, True)
-                if result:
-                    results.append(result)
-    
-    # If we need more results, do fuzzy matching
-    if len(results) < limit:
-        remaining_limit = limit - len(results)
-        fuzzy_results = []
+        if not Config.RESULT_CACHE_ENABLED:
+            return run_search_batch(conn.cursor(), requests, time_budget, partial_flags)
         
-        for config in search_configs:
-            c.execute(f"SELECT * FROM {config['table']}")
-            all_rows = c.fetchall()
-            
-            for row in all_rows:
-                # Skip if already in exact matches
-                if any(r['id'] == row['id'] for r in results):
-                    continue
-                
-                # Calculate fuzzy match scores for different fields
-                field_scores = []
-                
-                for field in config['fields']:
-                    if row[field]:
-                        field_score = fuzz.ratio(normalized_query, normalize_text(row[field]))
-                        field_scores.append(field_score)
-                
-                score = max(field_scores) if field_scores else 0
-                
-                if score > Config.FUZZY_SEARCH_THRESHOLD:
-                    result = create_result_from_row(row, config, score, score > Config.HIGH_MATCH_THRESHOLD)
-                    if result:
-                        fuzzy_results.append(result)
+        # Serve repeated queries from the result cache, dropped whenever the data version changes
+        result_cache.check_version(data_version)
+        keys = [result_cache_key(request) for request in requests]
+        results = [result_cache.get(key) for key in keys]
+        misses = [i for i, cached in enumerate(results) if cached is None]
         
-        # Sort by score and add top results
-        fuzzy_results.sort(key=lambda x: x['score'], reverse=True)
-        results.extend(fuzzy_results[:remaining_limit])
+        if misses:
+            miss_flags = []
+            fresh = run_search_batch(conn.cursor(), [requests[i] for i in misses], time_budget, miss_flags)
+            for i, matches, partial in zip(misses, fresh, miss_flags):
+                results[i] = matches
+                partial_flags[i] = partial
+                # Partial results depend on timing, so only complete ones are cached
+                if not partial:
+                    result_cache.put(keys[i], matches)
     
-    conn.close()
+    # Callers may edit what they get; the nested type and feature objects are cached too
+    return [[copy_result(result) for result in matches] for matches in results]
+
+def copy_result(result: Dict) -> Dict:
+    """Copy of a result that shares no mutable objects with it"""
+    copied = dict(result)
+    copied['type'] = [dict(entity_type) for entity_type in result['type']]
+    if 'features' in result:
+        copied['features'] = [dict(feature) for feature in result['features']]
+    return copied
+
+def result_cache_key(request: Tuple[str, int, Optional[str], Optional[Dict]]) -> Tuple:
+    """Cache key: case-folded query (all the search stages depend on), type, properties and limit"""
+    query, limit, type_filter, properties = request
+    return (str(query).lower(), type_filter, json.dumps(properties or {}, sort_keys=True, default=str), limit)
+
+def run_search_batch(c, requests: List[Tuple[str, int, Optional[str], Optional[Dict]]],
+                     time_budget: Optional[float], partial_flags: List[bool]) -> List[List[Dict]]:
+    """Run a batch here, or across the search pool when it is large and the pool is enabled"""
+    if Config.SEARCH_WORKERS > 1 and len(requests) >= Config.PARALLEL_SEARCH_MIN_BATCH:
+        return execute_search_parallel(requests, time_budget, partial_flags)
+    return execute_search_batch(c, requests, time_budget, partial_flags)
+
+_search_executor = None
+_search_executor_lock = threading.Lock()
+
+def get_search_executor():
+    """Get the search process pool; each worker maps the index snapshot once at startup"""
+    global _search_executor
+    with _search_executor_lock:
+        if _search_executor is None:
+            _search_executor = create_process_pool(Config.SEARCH_WORKERS, load_search_indexes)
+        return _search_executor
+
+def execute_search_parallel(requests: List[Tuple[str, int, Optional[str], Optional[Dict]]],
+                            time_budget: Optional[float], partial_flags: List[bool]) -> List[List[Dict]]:
+    """Split a batch into interleaved slices, one per search worker, and merge their results"""
+    executor = get_search_executor()
+    slices = [list(range(len(requests)))[start::Config.SEARCH_WORKERS] for start in range(Config.SEARCH_WORKERS)]
+    slices = [positions for positions in slices if positions]
+    futures = [executor.submit(search_batch_slice, [requests[i] for i in positions], time_budget)
+               for positions in slices]
+    
+    results = [None] * len(requests)
+    partial_flags[:] = [False] * len(requests)
+    for positions, future in zip(slices, futures):
+        matches, flags, stats = future.result()
+        # Workers hand their timings back, so /metrics in this process covers them
+        stats.record()
+        for i, result, partial in zip(positions, matches, flags):
+            results[i] = result
+            partial_flags[i] = partial
     return results
 
-def create_result_from_row(row, config, score, is_match):
-    """Create a result object from a database row"""
-    try:
-        if config['table'] == 'museums':
-            name = row['museum_name'] or row['legal_name'] or 'Unnamed Museum'
-            description_parts = []
-            if row['city_admin']:
-                description_parts.append(row['city_admin'])
-            if row['state_admin']:
-                description_parts.append(row['state_admin'])
-            if row['museum_type']:
-                description_parts.append(f"({row['museum_type']})")
-            description = ", ".join(description_parts) if description_parts else "Museum"
-        
-        elif config['table'] == 'artists':
-            name = row['name'] or 'Unknown Artist'
-            description_parts = []
-            if row['nationality']:
-                description_parts.append(row['nationality'])
-            if row['birth_year'] and row['death_year']:
-                description_parts.append(f"({row['birth_year']}–{row['death_year']})")
-            elif row['birth_year']:
-                description_parts.append(f"(b. {row['birth_year']})")
-            if row['artist_bio']:
-                bio_parts = row['artist_bio'].split(',')
-                if len(bio_parts) > 1:
-                    description_parts.append(bio_parts[1].strip())
-            description = ", ".join(description_parts) if description_parts else "Artist"
+def search_batch_slice(requests: List[Tuple[str, int, Optional[str], Optional[Dict]]],
+                       time_budget: Optional[float]) -> Tuple[List[List[Dict]], List[bool], SearchStats]:
+    """Run one slice of a batch inside a search pool process"""
+    partial_flags = []
+    stats = SearchStats()
+    with read_connection() as conn:
+        refresh_search_indexes(get_data_version(conn))
+        results = execute_search_batch(conn.cursor(), requests, time_budget, partial_flags, stats)
+    return results, partial_flags, stats
+
+def shutdown_search_executor(wait: bool = True):
+    """Stop the search process pool"""
+    global _search_executor
+    with _search_executor_lock:
+        executor, _search_executor = _search_executor, None
+    if executor is not None:
+        executor.shutdown(wait=wait)
+
+def execute_search_batch(c, requests: List[Tuple[str, int, Optional[str], Optional[Dict]]],
+                         time_budget: Optional[float], partial_flags: List[bool],
+                         stats: Optional[SearchStats] = None) -> List[List[Dict]]:
+    """Run a batch of search requests on an open cursor, filling partial_flags per request
+    
+    Stage timings and row counts go to stats, or straight to the metrics when none is given.
+    """
+    record_stats = stats is None
+    if record_stats:
+        stats = SearchStats()
+    stages = stats.stages
+    stats.types.extend(type_filter for _, _, type_filter, _ in requests)
+    
+    started = time.perf_counter()
+    partial_flags[:] = [False] * len(requests)
+    normalized_queries = [normalize_text(query) for query, _, _, _ in requests]
+    configs_per_request = [get_search_configs(type_filter) for _, _, type_filter, _ in requests]
+    properties_per_request = [parse_properties(properties) for _, _, _, properties in requests]
+    results = [[] for _ in requests]
+    stages['normalize'] += time.perf_counter() - started
+    
+    # First try exact matches, one statement per table for the whole batch
+    started = time.perf_counter()
+    for config in SEARCH_CONFIGS:
+        members = [i for i, configs in enumerate(configs_per_request) if config in configs]
+        if members:
+            find_exact_matches(c, config, [(i, str(requests[i][0]).lower()) for i in members], results)
+    
+    # Exact name matches still have to agree with the query's properties
+    for i, properties in enumerate(properties_per_request):
+        if properties and results[i]:
+            score_exact_matches(c, results[i], properties)
+    stages['exact_sql'] += time.perf_counter() - started
+    
+    # If we need more results, do fuzzy matching over the indexed candidates
+    pending = [i for i, (_, limit, _, _) in enumerate(requests) if len(results[i]) < limit]
+    exact_ids = {i: {r['id'] for r in results[i]} for i in pending}
+    selectors = {i: TopKSelector(requests[i][1] - len(results[i]), Config.FUZZY_SEARCH_THRESHOLD) for i in pending}
+    time_spent = dict.fromkeys(pending, 0.0)
+    indexes = {}
+    
+    for table_rank, config in enumerate(SEARCH_CONFIGS):
+        members = [i for i in pending if config in configs_per_request[i]]
+        if not members:
+            continue
         
-        elif config['table'] == 'artifacts':
-            name = row['title'] or 'Untitled'
-            description_parts = []
-            if row['artist']:
-                description_parts.append(f"by {row['artist']}")
-            if row['date']:
-                description_parts.append(row['date'])
-            if row['medium']:
-                description_parts.append(row['medium'])
-            if row['department']:
-                description_parts.append(f"({row['department']})")
-            description = ", ".join(description_parts) if description_parts else "Artwork"
+        index = indexes[table_rank] = get_search_index(config['table'])
         
+        for i in members:
+            if partial_flags[i]:
+                continue
+            started = time.perf_counter()
+            deadline = started + time_budget - time_spent[i] if time_budget is not None else None
+            properties = applicable_properties(config['table'], properties_per_request[i])
+            
+            # Rows passing the indexed property conditions replace the name candidates when few enough
+            only_rowids = prefilter_rowids(c, config['table'], properties) if properties and index.has_fts else None
+            
+            # Token and prefix hits from FTS5, pre-ranked by bm25, join the n-gram candidates
+            fts_rowids = None
+            if only_rowids is None and Config.FTS_ENABLED and index.has_fts:
+                fts_rowids = full_text_candidates(c, config['table'], normalized_queries[i])
+            
+            # Rows sharing a phonetic, token-order or surname key with a name query join the candidates
+            reordered_rowids = None
+            if only_rowids is None and Config.BLOCKING_ENABLED:
+                block = block_rowids(c, config['table'], requests[i][0])
+                if block is not None:
+                    fts_rowids = block[0] + (fts_rowids or [])
+                    reordered_rowids = block[1]
+            stages['candidate_fetch'] += time.perf_counter() - started
+            
+            if not score_candidates(index, table_rank, config, normalized_queries[i], exact_ids[i],
+                                    selectors[i], deadline, fts_rowids, only_rowids, properties, c, stats,
+                                    reordered_rowids):
+                partial_flags[i] = True
+            time_spent[i] += time.perf_counter() - started
+    
+    started = time.perf_counter()
+    fuzzy_matches = {i: selectors[i].ranked() for i in pending}
+    stages['sort'] += time.perf_counter() - started
+    
+    # Names and descriptions come precomputed from the same index the candidates were scored on
+    started = time.perf_counter()
+    for i in pending:
+        for order, (score, config, _, features) in fuzzy_matches[i]:
+            table_rank, position = divmod(order, TABLE_ORDER_STRIDE)
+            result = create_result_from_index(indexes[table_rank], position, config, score,
+                                              score > Config.HIGH_MATCH_THRESHOLD)
+            if features:
+                result['features'] = features
+            results[i].append(result)
+    
+    # Property scores can lift fuzzy matches above blended exact matches; the sort is stable,
+    # so exact matches stay first among equal scores
+    for i, (_, limit, _, _) in enumerate(requests):
+        if properties_per_request[i]:
+            results[i].sort(key=lambda result: result['score'], reverse=True)
+        del results[i][limit:]
+    stages['format'] += time.perf_counter() - started
+    
+    if record_stats:
+        stats.record()
+    return results
+
+class TopKSelector:
+    """Keeps the k best fuzzy matches seen so far, ranked like a stable sort in scan order"""
+    
+    def __init__(self, k: int, min_score: int):
+        self.k = k
+        self.min_score = min_score
+        self.heap = []
+    
+    def can_beat(self, score: int, order: int) -> bool:
+        """Whether a match with this score (or score upper bound) could still be kept"""
+        if score <= self.min_score or self.k <= 0:
+            return False
+        if len(self.heap) < self.k:
+            return True
+        return (score, -order) > self.heap[0][:2]
+    
+    def push(self, score: int, order: int, match: Tuple):
+        if not self.can_beat(score, order):
+            return
+        entry = (score, -order, match)
+        if len(self.heap) < self.k:
+            heapq.heappush(self.heap, entry)
         else:
+            heapq.heapreplace(self.heap, entry)
+    
+    def ranked(self) -> List[Tuple[int, Tuple]]:
+        """Kept (scan order, match) pairs, best score first and earliest scanned first among ties"""
+        return [(-negated_order, match)
+                for _, negated_order, match in sorted(self.heap, key=lambda entry: entry[:2], reverse=True)]
+    
+    def matches(self) -> List[Tuple]:
+        """Kept matches, best score first and earliest scanned first among ties"""
+        return [match for _, match in self.ranked()]
+
+def score_upper_bound(query_length: int, value_length: int) -> int:
+    """Highest fuzz.ratio two strings of these lengths can reach (2·min / total)"""
+    return int(round(200 * min(query_length, value_length) / (query_length + value_length)))
+
+def full_text_candidates(c, table: str, normalized_query: str) -> List[int]:
+    """Rowids whose fields contain the query's tokens (as words or prefixes), best bm25 first"""
+    tokens = [token for token in normalized_query.split() if len(token) >= Config.FTS_MIN_TOKEN_LENGTH]
+    if not tokens:
+        return []
+    
+    fts = fts_table(table)
+    match = ' OR '.join(f'"{token}"*' for token in tokens)
+    c.execute(f"SELECT rowid FROM {fts} WHERE {fts} MATCH ? ORDER BY bm25({fts}) LIMIT ?",
+              (match, Config.FTS_MAX_CANDIDATES))
+    return [row[0] for row in c.fetchall()]
+
+def score_candidates(index, table_rank: int, config: Dict, normalized_query: str, exclude_ids: set,
+                     selector: TopKSelector, deadline: Optional[float] = None,
+                     extra_rowids: Optional[List[int]] = None, only_rowids: Optional[List[int]] = None,
+                     properties: Optional[Dict] = None, c=None, stats: Optional[SearchStats] = None,
+                     reordered_rowids: Optional[set] = None) -> bool:
+    """Fuzzy-score a query's indexed candidates into a top-k selector; False if the deadline hit first
+    
+    only_rowids replaces the n-gram candidates with a pre-filtered set. With properties the name
+    score is blended with the property scores (read through cursor c) and features are attached.
+    Stage timings and fetched/scored row counts are added to stats when given. Rows in
+    reordered_rowids hold the query's tokens in another order and are scored on sorted tokens instead.
+    """
+    started = time.perf_counter()
+    if only_rowids is not None:
+        positions = sorted(index.rowid_positions[rowid] for rowid in only_rowids if rowid in index.rowid_positions)
+    else:
+        positions = index.candidates(normalized_query, extra_rowids=extra_rowids)
+    reordered = {index.rowid_positions.get(rowid) for rowid in reordered_rowids or ()}
+    
+    query_length = len(normalized_query)
+    candidates = []
+    for position in positions:
+        if index.ids[position] in exclude_ids:
+            continue
+        values = [value for value in index.values[position] if value]
+        if values:
+            bound = max(score_upper_bound(query_length, len(value)) for value in values)
+            if properties:
+                bound = combined_upper_bound(bound, properties)
+            candidates.append((bound, table_rank * TABLE_ORDER_STRIDE + position, values))
+    
+    fetched = time.perf_counter()
+    
+    # Most promising rows first, so the scan can stop once no bound can beat the k-th score
+    candidates.sort(key=lambda candidate: candidate[0], reverse=True)
+    scorer = get_scorer()
+    sorted_at = time.perf_counter()
+    scored = 0
+    completed = True
+    
+    for start in range(0, len(candidates), Config.SCORING_CHUNK_SIZE):
+        if deadline is not None and time.perf_counter() > deadline:
+            completed = False
+            break
+        
+        chunk = [candidate for candidate in candidates[start:start + Config.SCORING_CHUNK_SIZE]
+                 if selector.can_beat(candidate[0], candidate[1])]
+        if not chunk:
+            if not selector.can_beat(candidates[start][0], 0):
+                break
+            continue
+        scored += len(chunk)
+        
+        # Flatten the non-empty field values so the backend scores them in one call
+        choices = []
+        owners = []
+        for offset, (_, _, values) in enumerate(chunk):
+            choices.extend(values)
+            owners.extend([offset] * len(values))
+        
+        # Best field score per candidate row
+        best = [0] * len(chunk)
+        for offset, score in zip(owners, scorer.score_many(normalized_query, choices)):
+            if score > best[offset]:
+                best[offset] = score
+        if reordered:
+            for offset, (_, order, values) in enumerate(chunk):
+                if order - table_rank * TABLE_ORDER_STRIDE in reordered:
+                    best[offset] = max([best[offset]] + [fuzz.token_sort_ratio(normalized_query, value)
+                                                         for value in values])
+        
+        ids = [index.ids[order - table_rank * TABLE_ORDER_STRIDE] for _, order, _ in chunk]
+        if not properties:
+            for (_, order, _), entity_id, score in zip(chunk, ids, best):
+                selector.push(score, order, (score, config, entity_id, None))
+            continue
+        
+        property_scores = score_properties(c, config['table'], properties, ids)
+        for (_, order, _), entity_id, name_score in zip(chunk, ids, best):
+            scores = property_scores.get(entity_id, {})
+            score = combine_scores(name_score, scores, properties)
+            selector.push(score, order, (score, config, entity_id, make_features(name_score, scores)))
+    
+    if stats is not None:
+        stages = stats.stages
+        stages['candidate_fetch'] += fetched - started
+        stages['sort'] += sorted_at - fetched
+        stages['scoring'] += time.perf_counter() - sorted_at
+        stats.add_rows(config['table'], len(positions), scored)
+    return completed
+
+def find_exact_matches(c, config: Dict, lowered_queries: List[Tuple[int, str]], results: List[List[Dict]]):
+    """Append exact (case-insensitive) field matches for each (request index, lowered query)"""
+    requests_by_text = {}
+    for i, text in lowered_queries:
+        requests_by_text.setdefault(text, []).append(i)
+    
+    fields = config['fields']
+    texts = list(requests_by_text)
+    chunk_size = max(1, SQLITE_MAX_VARIABLES // len(fields))
+    # Only the columns the result is built from, not the long credit lines and dimensions
+    display = ', '.join(['id'] + DISPLAY_FIELDS[config['table']])
+    
+    for start in range(0, len(texts), chunk_size):
+        chunk = texts[start:start + chunk_size]
+        placeholders = ','.join('?' * len(chunk))
+        lowered = ', '.join(f"LOWER({field})" for field in fields)
+        # COLLATE NOCASE matches the idx_<table>_<field>_nocase indexes, unlike LOWER(field)
+        conditions = ' OR '.join(f"{field} COLLATE NOCASE IN ({placeholders})" for field in fields)
+        c.execute(f"SELECT rowid, {lowered}, {display} FROM {config['table']} WHERE {conditions}",
+                  chunk * len(fields))
+        
+        # The OR is answered from several indexes, so restore table order
+        for row in sorted(c.fetchall(), key=lambda row: row[0]):
+            matched_texts = {value for value in row[1:len(fields) + 1] if value in requests_by_text}
+            result = create_result_from_row(row, config, 100, True)
+            if not result:
+                continue
+            for text in matched_texts:
+                for i in requests_by_text[text]:
+                    results[i].append(dict(result))
+
+def score_exact_matches(c, results: List[Dict], properties: Dict):
+    """Blend exact matches' scores with their property scores and re-rank them, best first"""
+    for config in SEARCH_CONFIGS:
+        table_properties = applicable_properties(config['table'], properties)
+        matched = [result for result in results if result['type'][0]['id'] == config['type']]
+        if not table_properties or not matched:
+            continue
+        
+        ids = [result['id'] for result in matched]
+        property_scores = {}
+        for start in range(0, len(ids), SQLITE_MAX_VARIABLES):
+            property_scores.update(score_properties(c, config['table'], table_properties,
+                                                    ids[start:start + SQLITE_MAX_VARIABLES]))
+        for result in matched:
+            scores = property_scores.get(result['id'], {})
+            result['score'] = combine_scores(100, scores, table_properties)
+            result['match'] = result['score'] > Config.HIGH_MATCH_THRESHOLD
+            result['features'] = make_features(100, scores)
+    
+    results.sort(key=lambda result: result['score'], reverse=True)
+
+def create_result_from_index(index, position: int, config: Dict, score, is_match) -> Dict:
+    """Create a result object from a row's precomputed name and description in a search index"""
+    return {
+        "id": index.ids[position],
+        "name": index.names[position],
+        "type": [{"id": config['type'], "name": config['type_name']}],
+        "score": score,
+        "match": is_match,
+        "description": index.descriptions[position]
+    }
+
+def create_result_from_row(row, config, score, is_match):
+    """Create a result object from a database row"""
+    try:
+        described = describe_entity(config['table'], row)
+        if described is None:
             return None
+        name, description = described
         
         return {
             "id": str(row['id']),
@@ -152,38 +545,39 @@ def create_result_from_row(row, config, score, is_match):
         print(f"Error creating result: {e}")
         return None
 
+# Entity type reported by get_entity_by_id per table
+ENTITY_TYPES = {
+    'museums': 'museum',
+    'artists': 'artist',
+    'artifacts': 'artifact'
+}
+
+def type_for_id(entity_id: str) -> Optional[str]:
+    """W3C type id ('museum', 'person' or 'artifact') of an entity id, from its prefix"""
+    table = table_for_id(entity_id)
+    return next((config['type'] for config in SEARCH_CONFIGS if config['table'] == table), None)
+
 def get_entity_by_id(entity_id: str):
-    """Get entity by ID from any table"""
-    conn = sqlite3.connect(Config.DATABASE_PATH)
-    conn.row_factory = sqlite3.Row
-    c = conn.cursor()
-    
-    # Try to find entity in all tables
-    entity = None
-    entity_type = None
-    
-    # Check museums
-    c.execute('SELECT * FROM museums WHERE id = ?', (entity_id,))
-    result = c.fetchone()
-    if result:
-        entity = result
-        entity_type = 'museum'
-    
-    # Check artists
-    if not entity:
-        c.execute('SELECT * FROM artists WHERE id = ?', (entity_id,))
-        result = c.fetchone()
-        if result:
-            entity = result
-            entity_type = 'artist'
+    """Get entity by ID from the table its prefix routes to, via the entity cache"""
+    table = table_for_id(entity_id)
+    if table is None:
+        return None, None
     
-    # Check artifacts
-    if not entity:
-        c.execute('SELECT * FROM artifacts WHERE id = ?', (entity_id,))
+    if Config.ENTITY_CACHE_ENABLED:
+        entity_cache.check_version(current_data_version())
+        entity = entity_cache.get(entity_id)
+        if entity is not None:
+            return entity, ENTITY_TYPES[table]
+    
+    with read_connection() as conn:
+        c = conn.cursor()
+        c.execute(f'SELECT * FROM {table} WHERE id = ?', (entity_id,))
         result = c.fetchone()
-        if result:
-            entity = result
-            entity_type = 'artifact'
     
-    conn.close()
-    return entity, entity_type
\ No newline at end of file
+    if not result:
+        return None, None
+    
+    entity = dict(result)
+    if Config.ENTITY_CACHE_ENABLED:
+        entity_cache.put(entity_id, entity)
+    return entity, ENTITY_TYPES[table]
\ No newline at end of file
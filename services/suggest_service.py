@@ -0,0 +1,111 @@
+import heapq
+import threading
+from bisect import bisect_left
+from typing import Dict, List, Optional, Tuple
+from config.settings import Config
+from utils.text_utils import normalize_prefix
+from services.index_service import SUGGEST_FIELDS, get_search_index, build_suggest_keys
+from services.connection_service import read_connection
+from services.search_service import get_search_configs
+from services.geo_service import rowids_near
+
+_suggest_indexes = {}
+_suggest_lock = threading.Lock()
+
+class SuggestIndex:
+    """Sorted arrays of normalized names (and of every word start within them) for one table"""
+
+    def __init__(self, search_index, fields: List[str]):
+        self.search_index = search_index
+        # Snapshots carry the sorted arrays, so mapped indexes need no sorting here
+        keys = search_index.suggest_keys or build_suggest_keys(search_index, fields)
+        self.name_keys = keys['name_keys']
+        self.name_positions = keys['name_positions']
+        self.word_keys = keys['word_keys']
+        self.word_positions = keys['word_positions']
+
+    def iter_prefix(self, prefix: str, whole_names: bool, type_rank: int):
+        """Yield (key, type_rank, entity_id, position) for keys starting with prefix, in key order"""
+        keys = self.name_keys if whole_names else self.word_keys
+        positions = self.name_positions if whole_names else self.word_positions
+        ids = self.search_index.ids
+
+        i = bisect_left(keys, prefix)
+        while i < len(keys) and keys[i].startswith(prefix):
+            yield keys[i], type_rank, ids[positions[i]], positions[i]
+            i += 1
+
+def get_suggest_index(table: str) -> SuggestIndex:
+    """Get the suggest index for a table, rebuilding it whenever the search index is rebuilt"""
+    search_index = get_search_index(table)
+    index = _suggest_indexes.get(table)
+    if index is None or index.search_index is not search_index:
+        with _suggest_lock:
+            index = _suggest_indexes.get(table)
+            if index is None or index.search_index is not search_index:
+                index = SuggestIndex(search_index, SUGGEST_FIELDS[table])
+                _suggest_indexes[table] = index
+    return index
+
+def load_suggest_indexes():
+    """Build the suggest indexes for every table"""
+    for table in SUGGEST_FIELDS:
+        index = get_suggest_index(table)
+        print(f"Suggest index for {table}: {len(index.name_keys)} names, {len(index.word_keys)} word starts")
+
+def suggest_entities(prefix: str, type_filter: Optional[str] = None, cursor: int = 0,
+                     limit: Optional[int] = None,
+                     near: Optional[Tuple[float, float, float]] = None) -> Tuple[List[Dict], int]:
+    """Entities whose names start with prefix (whole-name matches first), paged by cursor
+
+    near (latitude, longitude, radius in km) keeps only the museums within the radius.
+    Returns the page of suggestions and the cursor of the next page.
+    """
+    limit = min(limit or Config.SUGGEST_LIMIT, Config.MAX_RESULTS_LIMIT)
+    cursor = max(0, cursor)
+    normalized_prefix = normalize_prefix(prefix)
+    if not normalized_prefix:
+        return [], cursor
+
+    configs = get_search_configs(type_filter)
+    allowed = None
+    if near is not None:
+        # Only museums have coordinates
+        configs = [config for config in configs if config['table'] == 'museums']
+    indexes = [(rank, config, get_suggest_index(config['table'])) for rank, config in enumerate(configs)]
+    index_by_rank = {rank: index.search_index for rank, _, index in indexes}
+    if near is not None and indexes:
+        search_index = indexes[0][2].search_index
+        with read_connection() as conn:
+            allowed = {search_index.rowid_positions.get(rowid) for rowid in rowids_near(conn.cursor(), *near)}
+
+    # Whole-name prefix matches first, then matches on a later word, each merged across types
+    matches = []
+    seen = set()
+    wanted = cursor + limit
+    for whole_names in (True, False):
+        merged = heapq.merge(*[index.iter_prefix(normalized_prefix, whole_names, rank)
+                               for rank, _, index in indexes])
+        for _, rank, entity_id, position in merged:
+            if entity_id in seen or (allowed is not None and position not in allowed):
+                continue
+            seen.add(entity_id)
+            matches.append((rank, position))
+            if len(matches) >= wanted:
+                break
+        if len(matches) >= wanted:
+            break
+
+    page = matches[cursor:wanted]
+    suggestions = []
+    for rank, position in page:
+        config = configs[rank]
+        search_index = index_by_rank[rank]
+        suggestions.append({
+            "id": search_index.ids[position],
+            "name": search_index.names[position],
+            "description": search_index.descriptions[position],
+            "type": [{"id": config['type'], "name": config['type_name']}]
+        })
+
+    return suggestions, cursor + len(page)
\ No newline at end of file
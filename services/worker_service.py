@@ -0,0 +1,21 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, Optional
+from config.settings import Config
+
+def worker_settings() -> Dict[str, Any]:
+    """Snapshot of this process's settings, for worker processes started with spawn"""
+    return {name: getattr(Config, name) for name in dir(Config) if name.isupper()}
+
+def init_worker(settings: Dict[str, Any], initializer: Optional[Callable] = None):
+    """Apply the parent's settings in a pool process, then run the pool's own initializer"""
+    for name, value in settings.items():
+        setattr(Config, name, value)
+    if initializer is not None:
+        initializer()
+
+def create_process_pool(max_workers: int, initializer: Optional[Callable] = None) -> ProcessPoolExecutor:
+    """Process pool whose workers start with the calling process's settings"""
+    return ProcessPoolExecutor(max_workers=max_workers,
+                               mp_context=multiprocessing.get_context(Config.WORKER_START_METHOD),
+                               initializer=init_worker, initargs=(worker_settings(), initializer))
\ No newline at end of file
@@ -0,0 +1,40 @@
+import os
+import sys
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from config.settings import Config
+
+# Small CSV files shipped with the repository
+SAMPLE_CSV_FILES = {
+    'museums': os.path.join(ROOT, 'data', 'museums_20.csv'),
+    'artists': os.path.join(ROOT, 'data', 'artists_20.csv'),
+    'artifacts': os.path.join(ROOT, 'data', 'artworks_20.csv')
+}
+
+def reset_process_state():
+    """Drop pooled connections, loaded indexes and cached results left by another database"""
+    from services.connection_service import reset_connection_pool
+    from services.index_service import reset_search_indexes
+    from services.cache_service import clear_result_cache
+    
+    reset_connection_pool()
+    reset_search_indexes()
+    clear_result_cache()
+
+@pytest.fixture
+def database(tmp_path, monkeypatch):
+    """A database built from the sample CSV files in a temporary directory"""
+    from services.database_service import init_db
+    
+    monkeypatch.setattr(Config, 'DATABASE_PATH', str(tmp_path / 'test.db'))
+    monkeypatch.setattr(Config, 'INDEX_SNAPSHOT_PATH', None)
+    monkeypatch.setattr(Config, 'CSV_FILES', dict(SAMPLE_CSV_FILES))
+    monkeypatch.setattr(Config, 'RESULT_CACHE_ENABLED', False)
+    reset_process_state()
+    init_db()
+    yield Config.DATABASE_PATH
+    reset_process_state()
@@ -0,0 +1,52 @@
+import sqlite3
+import pytest
+from config.settings import Config
+from services.blocking_service import BLOCKING_TABLE, VERSION_KEY
+from services.search_service import search_entities
+from utils.phonetic_utils import double_metaphone
+
+# Codes of the reference Double Metaphone (max length 4)
+REFERENCE_CODES = [
+    ('Thompson', ('TMPS', 'TMPS')),
+    ('Picasso', ('PKS', 'PKS')),
+    ('Smith', ('SM0', 'XMT')),
+    ('Schmidt', ('XMT', 'SMT')),
+    ('Bach', ('PK', 'PK')),
+    ('Machado', ('MKT', 'MKT')),
+    ('Michael', ('MKL', 'MXL')),
+    ('Chianti', ('KNT', 'KNT')),
+    ('Caesar', ('SSR', 'SSR')),
+    ('Witzel', ('ATSL', 'FFXL')),
+    ('Wojciech', ('AJSK', 'FJXK')),
+    ('Jose', ('HS', 'HS')),
+    ('Dürer', ('TRR', 'TRR')),
+    ('Xavier', ('SF', 'SFR')),
+]
+
+@pytest.mark.parametrize('word, codes', REFERENCE_CODES)
+def test_double_metaphone_matches_reference(word, codes):
+    assert double_metaphone(word) == codes
+
+@pytest.mark.parametrize('query', ['Robert Arneson', 'arnesen', 'Arnoldi, Per', 'durer', 'picasso'])
+def test_blocking_only_adds_candidates(database, monkeypatch, query):
+    blocked = search_entities(query, 5, 'person')
+    monkeypatch.setattr(Config, 'BLOCKING_ENABLED', False)
+    plain = search_entities(query, 5, 'person')
+    # Block rows join the n-gram candidates, so no match found without blocking is lost
+    assert len(blocked) >= len(plain)
+    assert all(with_block['score'] >= without['score'] for with_block, without in zip(blocked, plain))
+
+def test_stale_blocking_keys_are_rederived(database):
+    from services.database_service import migrate_db
+
+    conn = sqlite3.connect(database)
+    conn.execute(f'DELETE FROM {BLOCKING_TABLE} WHERE key = ?', (VERSION_KEY,))
+    conn.execute(f"DELETE FROM {BLOCKING_TABLE} WHERE key LIKE 'p:%'")
+    conn.commit()
+
+    migrate_db()
+    versions = conn.execute(f'SELECT table_name FROM {BLOCKING_TABLE} WHERE key = ?', (VERSION_KEY,)).fetchall()
+    phonetic = conn.execute(f"SELECT COUNT(*) FROM {BLOCKING_TABLE} WHERE key LIKE 'p:%'").fetchone()[0]
+    conn.close()
+    assert {row[0] for row in versions} == {'artists', 'artifacts'}
+    assert phonetic > 0
@@ -0,0 +1,23 @@
+import sqlite3
+from services.geo_service import GEO_TABLE
+
+def data_version(path):
+    conn = sqlite3.connect(path)
+    version = conn.execute('PRAGMA user_version').fetchone()[0]
+    conn.close()
+    return version
+
+def test_empty_geo_index_is_not_rebuilt_on_every_start(database):
+    from services.database_service import migrate_db
+
+    # Coordinates the R*Tree skips, in a database built before it existed
+    conn = sqlite3.connect(database)
+    conn.execute('UPDATE museums SET latitude = 0, longitude = 0')
+    conn.execute(f'DROP TABLE {GEO_TABLE}')
+    conn.commit()
+    conn.close()
+
+    assert migrate_db() == 1
+    version = data_version(database)
+    assert migrate_db() == 0
+    assert data_version(database) == version
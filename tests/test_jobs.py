@@ -0,0 +1,93 @@
+import os
+import time
+import sqlite3
+import subprocess
+import sys
+from concurrent.futures import Future
+import pytest
+from config.settings import Config
+from services import job_service
+
+QUERY_NAMES = ['Robert Arneson', 'Doroteo Arnaiz', 'Bill Arnold', 'Charles Arnoldi']
+
+@pytest.fixture
+def jobs(database, tmp_path, monkeypatch):
+    monkeypatch.setattr(Config, 'JOBS_DATABASE_PATH', str(tmp_path / 'jobs.db'))
+    monkeypatch.setattr(Config, 'JOB_WORKERS', 1)
+    monkeypatch.setattr(Config, 'JOB_CHUNK_SIZE', 5)
+    monkeypatch.setattr(Config, 'JOB_BATCH_SIZE', 2)
+    yield job_service
+    job_service.shutdown_job_executor()
+
+def wait_for_job(job_id, timeout=60):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = job_service.get_job(job_id)
+        if job['status'] in job_service.FINAL_STATES:
+            return job
+        time.sleep(0.05)
+    raise AssertionError(f"Job {job_id} did not finish: {job_service.get_job(job_id)}")
+
+def dead_pid():
+    process = subprocess.Popen([sys.executable, '-c', 'pass'])
+    process.wait()
+    return process.pid
+
+def test_job_runs_to_completion_with_results_in_query_order(jobs):
+    queries = {f'q{i}': {'query': QUERY_NAMES[i % len(QUERY_NAMES)], 'type': 'person', 'limit': 2}
+               for i in range(12)}
+    job = jobs.create_job(queries)
+    
+    job = wait_for_job(job['id'])
+    assert job['status'] == jobs.JOB_COMPLETED
+    assert job['completed'] == 12 and job['error'] is None
+    
+    first = jobs.get_job_results(job['id'], 0, 10)
+    rest = jobs.get_job_results(job['id'], first['next_cursor'], 10)
+    query_ids = [result['query_id'] for result in first['results'] + rest['results']]
+    assert query_ids == [f'q{i}' for i in range(12)]
+    assert first['results'][0]['result'][0]['name'] == 'Robert Arneson'
+
+def test_invalid_query_is_rejected_at_submission(jobs):
+    queries = {f'q{i}': {'query': 'Bill Arnold'} for i in range(12)}
+    queries['q7']['limit'] = 'oops'
+    with pytest.raises(ValueError, match='q7'):
+        jobs.create_job(queries)
+
+def insert_job(job_id, status, owner, query_count=0):
+    conn = jobs_connection()
+    conn.execute('INSERT INTO jobs (id, status, total, created_at, owner) VALUES (?, ?, ?, ?, ?)',
+                 (job_id, status, query_count, time.time(), owner))
+    conn.executemany('INSERT INTO job_queries (job_id, position, query_id, query) VALUES (?, ?, ?, ?)',
+                     [(job_id, i, f'q{i}', '{"query": "Bill Arnold"}') for i in range(query_count)])
+    conn.commit()
+    conn.close()
+
+def jobs_connection():
+    job_service.init_jobs_db()
+    return sqlite3.connect(Config.JOBS_DATABASE_PATH)
+
+def test_error_of_an_earlier_chunk_fails_the_job(jobs):
+    insert_job('failing', jobs.JOB_RUNNING, os.getpid(), 12)
+    failed, succeeded = Future(), Future()
+    jobs._job_futures['failing'] = {failed, succeeded}
+    
+    failed.set_exception(RuntimeError('boom'))
+    jobs.chunk_done('failing', failed)
+    succeeded.set_result(5)
+    jobs.chunk_done('failing', succeeded)
+    
+    job = jobs.get_job('failing')
+    assert job['status'] == jobs.JOB_FAILED
+    assert job['error'] == 'boom'
+
+def test_resume_claims_only_jobs_of_dead_owners(jobs):
+    insert_job('orphaned', jobs.JOB_RUNNING, dead_pid(), 3)
+    insert_job('owned', jobs.JOB_RUNNING, os.getppid(), 3)
+    
+    assert jobs.resume_jobs() == ['orphaned']
+    # Another worker starting now finds the job claimed by a live process
+    assert jobs.resume_jobs() == []
+    
+    assert wait_for_job('orphaned')['status'] == jobs.JOB_COMPLETED
+    assert jobs.get_job('owned')['status'] == jobs.JOB_RUNNING
@@ -0,0 +1,62 @@
+import csv
+import sqlite3
+import pytest
+from config.settings import Config
+from conftest import SAMPLE_CSV_FILES, reset_process_state
+from services.relation_service import parse_constituent_ids, constituent_artist_ids
+from services.property_service import constituent_key
+
+@pytest.fixture
+def linked_database(tmp_path, monkeypatch):
+    """Sample database whose first artworks credit sample artists: by id, by name, and partly"""
+    from services.database_service import init_db
+
+    with open(SAMPLE_CSV_FILES['artifacts'], newline='', encoding='utf-8-sig') as f:
+        reader = csv.DictReader(f)
+        fieldnames, rows = reader.fieldnames, list(reader)
+    rows[0].update({'Artist': 'Bill Arnold, Robert Arneson', 'ConstituentID': '3, 1'})
+    rows[1].update({'Artist': 'Ruth Asawa', 'ConstituentID': ''})
+    rows[2].update({'Artist': 'Ruth Asawa, Nobody Known', 'ConstituentID': ''})
+    artifacts = tmp_path / 'artworks.csv'
+    with open(artifacts, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames)
+        writer.writeheader()
+        writer.writerows(rows)
+
+    monkeypatch.setattr(Config, 'DATABASE_PATH', str(tmp_path / 'test.db'))
+    monkeypatch.setattr(Config, 'INDEX_SNAPSHOT_PATH', None)
+    monkeypatch.setattr(Config, 'CSV_FILES', dict(SAMPLE_CSV_FILES, artifacts=str(artifacts)))
+    monkeypatch.setattr(Config, 'RESULT_CACHE_ENABLED', False)
+    reset_process_state()
+    init_db()
+    conn = sqlite3.connect(Config.DATABASE_PATH)
+    yield [row[0] for row in conn.execute('SELECT id FROM artifacts ORDER BY rowid LIMIT 3')]
+    conn.close()
+    reset_process_state()
+
+def test_constituent_ids_are_parsed_once_for_every_caller():
+    assert parse_constituent_ids('0012, 7, x, ,ARTIST_000003') == ['12', '7', '3']
+    assert parse_constituent_ids('1905, ARTIST_12', bare_numbers=False) == ['12']
+    assert constituent_artist_ids('12,7') == ['ARTIST_000012', 'ARTIST_000007']
+
+@pytest.mark.parametrize('value, key', [
+    ({'id': 'ARTIST_000012', 'name': 'Someone'}, '12'),
+    ({'id': '12'}, '12'),
+    ('ARTIST_000012', '12'),
+    ('1905', None),
+    ('Otto Wagner', None),
+    ({'id': 'ARTIST_1,ARTIST_2'}, None),
+])
+def test_bare_numbers_are_only_ids_inside_entities(value, key):
+    assert constituent_key(value) == key
+
+def test_extension_reads_creator_links(linked_database):
+    from services.extension_service import extend_entities
+
+    by_id, by_name, partly = linked_database
+    rows = extend_entities([by_id, by_name, partly], ['creator'])['rows']
+    assert rows[by_id]['creator'] == [{'id': 'ARTIST_000003', 'name': 'Bill Arnold'},
+                                      {'id': 'ARTIST_000001', 'name': 'Robert Arneson'}]
+    assert rows[by_name]['creator'] == [{'id': 'ARTIST_000021', 'name': 'Ruth Asawa'}]
+    # One of two credited artists is unknown, so the credit stays as written
+    assert rows[partly]['creator'] == [{'str': 'Ruth Asawa, Nobody Known'}]
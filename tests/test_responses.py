@@ -0,0 +1,41 @@
+import json
+import pytest
+from flask import Flask
+from config.settings import Config
+import routes.main_routes as main_routes
+
+QUERIES = json.dumps({f'q{i}': {'query': f'name {i}'} for i in range(3)})
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(Config, 'RESPONSE_CHUNK_BYTES', 1)
+    app = Flask(__name__)
+    app.register_blueprint(main_routes.main_bp)
+    return app.test_client()
+
+def failing_results(after: int):
+    def results(requests, query_ids, chunk_size=None):
+        for position, ids in enumerate(query_ids):
+            if position == after:
+                raise RuntimeError('search failed')
+            for query_id in ids:
+                yield query_id, {'result': []}
+    return results
+
+def test_reconcile_streams_all_results(client, monkeypatch):
+    monkeypatch.setattr(main_routes, 'iter_reconciliation_results', failing_results(after=None))
+    response = client.post('/', data={'queries': QUERIES})
+    assert response.status_code == 200
+    assert response.get_json() == {f'q{i}': {'result': []} for i in range(3)}
+
+def test_failure_before_streaming_is_a_500(client, monkeypatch):
+    monkeypatch.setattr(main_routes, 'iter_reconciliation_results', failing_results(after=0))
+    response = client.post('/', data={'queries': QUERIES})
+    assert response.status_code == 500
+    assert response.get_json() == {'error': 'Internal server error'}
+
+def test_failure_while_streaming_aborts_the_response(client, monkeypatch):
+    monkeypatch.setattr(main_routes, 'iter_reconciliation_results', failing_results(after=2))
+    # The error reaches the server instead of ending a truncated body as a complete response
+    with pytest.raises(RuntimeError):
+        client.post('/', data={'queries': QUERIES}).get_data()
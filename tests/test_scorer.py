@@ -0,0 +1,37 @@
+import pytest
+from fuzzywuzzy import fuzz
+from utils.text_utils import normalize_text
+from services.search_service import FuzzyWuzzyScorer, RapidFuzzScorer, rapid_process
+
+pytestmark = pytest.mark.skipif(rapid_process is None, reason="rapidfuzz is not installed")
+
+NAMES = [
+    'Pablo Picasso', 'Paul Klee', 'Pierre Bonnard', 'Piet Mondrian', 'Vincent van Gogh',
+    'Albrecht Dürer', 'J. M. W. Turner', 'Frida Kahlo', 'Diego Rivera', 'Henri Matisse',
+    'Marc Chagall', 'Joan Miró', 'Salvador Dalí', 'René Magritte', 'Otto Wagner',
+    'Bernard Tschumi', 'Emil Hoppe', 'Christian de Portzamparc', 'Robert Arneson', 'Zaha Hadid',
+    'Le Corbusier', 'Ludwig Mies van der Rohe', 'Frank Lloyd Wright', 'Alvar Aalto', ''
+]
+
+QUERIES = ['picasso', 'pablo picaso', 'durer', 'van gog', 'frank loyd wright', 'mies', 'hadid zaha',
+           'x', 'turner', 'corbusier le', '']
+
+CHOICES = [normalize_text(name) for name in NAMES]
+
+def ranking(scores):
+    """Choice positions by descending score, ties in choice order as the search keeps them"""
+    return sorted(range(len(scores)), key=lambda position: (-scores[position], position))
+
+@pytest.mark.parametrize('query', QUERIES)
+def test_scores_equal_fuzz_ratio(query):
+    expected = [fuzz.ratio(query, choice) for choice in CHOICES]
+    assert RapidFuzzScorer().score_many(query, CHOICES) == expected
+    assert FuzzyWuzzyScorer().score_many(query, CHOICES) == expected
+
+@pytest.mark.parametrize('query', QUERIES)
+def test_rankings_identical(query):
+    assert ranking(RapidFuzzScorer().score_many(query, CHOICES)) == \
+        ranking(FuzzyWuzzyScorer().score_many(query, CHOICES))
+
+def test_no_choices():
+    assert RapidFuzzScorer().score_many('picasso', []) == []
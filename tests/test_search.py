@@ -0,0 +1,68 @@
+import pytest
+from config.settings import Config
+from services.search_service import search_entities
+
+def test_results_are_limited_and_sorted_by_blended_score(database):
+    # "american" matches many nationalities exactly; the date property re-scores those matches
+    for query, type_filter, properties in [
+        ('american', None, None),
+        ('american', 'person', {'date': '1930'}),
+        ('Robert Arneson', 'person', {'nationality': 'Spanish', 'date': '1936'}),
+    ]:
+        results = search_entities(query, 3, type_filter, properties)
+        scores = [result['score'] for result in results]
+        assert len(results) <= 3
+        assert scores == sorted(scores, reverse=True)
+
+def test_cached_results_are_not_shared_with_callers(database, monkeypatch):
+    monkeypatch.setattr(Config, 'RESULT_CACHE_ENABLED', True)
+    first = search_entities('Robert Arneson', 3, 'person', {'nationality': 'American'})
+    first[0]['type'][0]['id'] = 'changed'
+    first[0]['features'].append({'id': 'changed', 'value': 0})
+    
+    second = search_entities('Robert Arneson', 3, 'person', {'nationality': 'American'})
+    assert second[0]['type'][0]['id'] == 'person'
+    assert all(feature['id'] != 'changed' for feature in second[0]['features'])
+
+@pytest.mark.parametrize('workers, expected', [(1, 'batch'), (2, 'parallel')])
+def test_streamed_chunks_reach_the_search_pool(database, monkeypatch, workers, expected):
+    import json
+    import services.search_service as search_service
+    from services.reconciliation_service import plan_reconciliation_queries, iter_reconciliation_results
+    
+    ran = []
+    def fake_search(kind):
+        def search(*args):
+            requests, partial_flags = args[-3], args[-1]
+            ran.append((kind, len(requests)))
+            partial_flags[:] = [False] * len(requests)
+            return [[] for _ in requests]
+        return search
+    monkeypatch.setattr(search_service, 'execute_search_batch', fake_search('batch'))
+    monkeypatch.setattr(search_service, 'execute_search_parallel', fake_search('parallel'))
+    monkeypatch.setattr(Config, 'SEARCH_WORKERS', workers)
+    
+    size = Config.PARALLEL_SEARCH_MIN_BATCH
+    queries = json.dumps({f'q{i}': {'query': f'name {i}'} for i in range(size)})
+    results = dict(iter_reconciliation_results(*plan_reconciliation_queries(queries)))
+    assert len(results) == size
+    assert {kind for kind, _ in ran} == {expected}
+
+@pytest.mark.parametrize('query', ['Arp', 'Jüri', 'Artko', 'Bill Aron', 'Per Arnoldy', 'Ruth Asawaa', 'Ashbe', 'Aronsen'])
+def test_capped_candidates_keep_the_full_scan_results(database, monkeypatch, query):
+    # Short and misspelled names must not lose their best matches to long rows sharing more n-grams
+    full = [(result['id'], result['score']) for result in search_entities(query, 3, 'person')]
+    monkeypatch.setattr(Config, 'INDEX_MAX_CANDIDATES', 8)
+    capped = [(result['id'], result['score']) for result in search_entities(query, 3, 'person')]
+    assert [score for _, score in capped] == [score for _, score in full]
+    assert capped[0] == full[0]
+
+def test_candidate_cap_ranks_by_normalized_overlap():
+    from services.index_service import SearchIndex
+    
+    index = SearchIndex('artists', ['name', 'artist_bio'])
+    index.add('ARTIST_000001', ('oliver payne', 'british born 1977 payne and sons'))
+    index.add('ARTIST_000002', ('payn', ''))
+    # The long row shares every n-gram of the query, the short one is the closer match
+    assert index.candidates('payne', max_candidates=1) == [1]
+    assert index.candidates('payne', max_candidates=2) == [0, 1]
@@ -0,0 +1,63 @@
+import os
+import sqlite3
+import pytest
+from services.index_service import (SEARCHABLE_FIELDS, MappedSearchIndex, load_index_snapshot, snapshot_data_version,
+                                    snapshot_path, load_search_indexes, build_search_index, ensure_index_snapshot,
+                                    write_index_snapshot, SNAPSHOT_MAGIC)
+from services.connection_service import get_data_version
+
+def test_snapshot_is_mapped_only_for_its_data_version(database):
+    version = get_data_version()
+    assert snapshot_data_version() == version
+    
+    indexes = load_index_snapshot(version)
+    assert set(indexes) == set(SEARCHABLE_FIELDS)
+    assert all(isinstance(index, MappedSearchIndex) for index in indexes.values())
+    assert load_index_snapshot(version + 1) is None
+
+def test_stale_snapshot_is_rebuilt_from_the_database(database):
+    conn = sqlite3.connect(database)
+    conn.execute("UPDATE artists SET name = 'Roberta Arnesonova', name_norm = 'roberta arnesonova' "
+                 "WHERE id = 'ARTIST_000001'")
+    conn.execute(f'PRAGMA user_version = {get_data_version() + 1}')
+    conn.commit()
+    conn.close()
+    
+    indexes = load_search_indexes()
+    assert not isinstance(indexes['artists'], MappedSearchIndex)
+    assert 'roberta arnesonova' in [values[0] for values in indexes['artists'].values]
+
+def stale_version(path, version):
+    write_index_snapshot({table: build_search_index(table) for table in SEARCHABLE_FIELDS}, version - 1, path)
+
+def bad_magic(path, version):
+    with open(path, 'r+b') as f:
+        f.write(b'X' * len(SNAPSHOT_MAGIC))
+
+@pytest.mark.parametrize('damage', [stale_version, bad_magic])
+def test_unusable_snapshot_is_rejected_and_rewritten(database, damage):
+    version = get_data_version()
+    path = snapshot_path()
+    damage(path, version)
+    assert load_index_snapshot(version) is None
+    assert not isinstance(load_search_indexes()['artists'], MappedSearchIndex)
+    
+    assert ensure_index_snapshot() == path
+    assert snapshot_data_version(path) == version
+    assert all(isinstance(index, MappedSearchIndex) for index in load_search_indexes().values())
+
+def test_build_database_replaces_database_and_snapshot_under_a_new_version(database):
+    from services.database_service import build_database
+    
+    previous = get_data_version()
+    report = build_database()
+    
+    assert report['data_version'] > previous
+    assert not os.path.exists(f"{database}.build")
+    assert snapshot_data_version(snapshot_path()) == report['data_version'] == get_data_version()
+    
+    indexes = load_search_indexes()
+    assert all(isinstance(index, MappedSearchIndex) for index in indexes.values())
+    # The suggest keys travel in the snapshot, so workers do not sort names at startup
+    assert indexes['artists'].suggest_keys is not None
+    assert 'robert arneson' in list(indexes['artists'].suggest_keys['name_keys'])
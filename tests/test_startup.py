@@ -0,0 +1,40 @@
+import sqlite3
+import pytest
+from config.settings import Config
+from conftest import SAMPLE_CSV_FILES, reset_process_state
+
+@pytest.fixture
+def empty_database(tmp_path, monkeypatch):
+    """An empty database file, as left by a failed build or a stray checkout"""
+    path = tmp_path / 'test.db'
+    path.write_bytes(b'')
+    monkeypatch.setattr(Config, 'DATABASE_PATH', str(path))
+    monkeypatch.setattr(Config, 'INDEX_SNAPSHOT_PATH', None)
+    monkeypatch.setattr(Config, 'CSV_FILES', dict(SAMPLE_CSV_FILES))
+    monkeypatch.setattr(Config, 'RESULT_CACHE_ENABLED', False)
+    monkeypatch.setattr(Config, 'JOBS_ENABLED', False)
+    reset_process_state()
+    yield str(path)
+    reset_process_state()
+
+def test_migrate_skips_structures_without_data_tables(empty_database):
+    from services.database_service import migrate_db, has_data_tables
+
+    assert not has_data_tables(empty_database)
+    assert migrate_db() == 0
+
+def test_app_builds_an_empty_database_file(empty_database):
+    from app import create_app
+
+    client = create_app().test_client()
+    assert client.get('/stats').status_code == 200
+    conn = sqlite3.connect(empty_database)
+    assert conn.execute('SELECT COUNT(*) FROM artists').fetchone()[0] > 0
+    conn.close()
+
+def test_app_without_startup_builds_rejects_an_empty_database_file(empty_database, monkeypatch):
+    from app import create_app
+
+    monkeypatch.setattr(Config, 'BUILD_DB_ON_STARTUP', False)
+    with pytest.raises(FileNotFoundError):
+        create_app()
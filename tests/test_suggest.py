@@ -0,0 +1,25 @@
+import pytest
+from utils.text_utils import normalize_prefix
+from services.suggest_service import suggest_entities
+
+@pytest.mark.parametrize('prefix, normalized', [
+    ('a', 'a'),
+    ('An', 'an'),
+    ('The', 'the'),
+    ('Andy War', 'andy war'),
+    ('the mus', 'mus'),
+    ('Museum of a C', 'museum of c'),
+    ('Pablo P.', 'pablo p'),
+    ('the ', ''),
+])
+def test_prefix_keeps_the_word_being_typed(prefix, normalized):
+    assert normalize_prefix(prefix) == normalized
+
+@pytest.mark.parametrize('prefix, expected', [
+    ('a', 'ALASKA AVIATION HERITAGE MUSEUM'),
+    ('An', 'ALASKA MASONIC LIBRARY AND MUSEUM FOUNDATION'),
+    ('the alas', 'ALASKA AVIATION HERITAGE MUSEUM'),
+])
+def test_article_prefixes_keep_suggesting(database, prefix, expected):
+    suggestions, _ = suggest_entities(prefix)
+    assert expected in [suggestion['name'] for suggestion in suggestions]
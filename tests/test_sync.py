@@ -0,0 +1,81 @@
+import csv
+import shutil
+import sqlite3
+import pytest
+from config.settings import Config
+from conftest import SAMPLE_CSV_FILES, reset_process_state
+
+@pytest.fixture
+def editable_database(tmp_path, monkeypatch):
+    """A database built from copies of the sample CSV files that a test may edit"""
+    from services.database_service import init_db
+    
+    csv_files = {}
+    for name, path in SAMPLE_CSV_FILES.items():
+        csv_files[name] = str(tmp_path / f'{name}.csv')
+        shutil.copy(path, csv_files[name])
+    monkeypatch.setattr(Config, 'DATABASE_PATH', str(tmp_path / 'test.db'))
+    monkeypatch.setattr(Config, 'INDEX_SNAPSHOT_PATH', None)
+    monkeypatch.setattr(Config, 'CSV_FILES', csv_files)
+    monkeypatch.setattr(Config, 'RESULT_CACHE_ENABLED', False)
+    reset_process_state()
+    init_db()
+    yield csv_files
+    reset_process_state()
+
+def read_rows(path):
+    with open(path, newline='', encoding='utf-8-sig') as f:
+        reader = csv.DictReader(f)
+        return reader.fieldnames, list(reader)
+
+def write_rows(path, fieldnames, rows):
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames)
+        writer.writeheader()
+        writer.writerows(rows)
+
+def artist_names():
+    conn = sqlite3.connect(Config.DATABASE_PATH)
+    names = dict(conn.execute('SELECT id, name FROM artists'))
+    conn.close()
+    return names
+
+def data_version():
+    conn = sqlite3.connect(Config.DATABASE_PATH)
+    version = conn.execute('PRAGMA user_version').fetchone()[0]
+    conn.close()
+    return version
+
+def test_unchanged_files_are_skipped(editable_database):
+    from services.database_service import sync_db
+    
+    version = data_version()
+    report = sync_db()
+    assert all(table_report == {"unchanged": True} for table_report in report.values())
+    assert data_version() == version
+
+def test_sync_applies_inserts_updates_and_deletes(editable_database):
+    from services.database_service import sync_db
+    from services.search_service import search_entities
+    
+    fieldnames, rows = read_rows(editable_database['artists'])
+    updated_id, deleted_id = rows[0]['id'], rows[1]['id']
+    rows[0]['name'] = 'Roberta Arnesonova'
+    del rows[1]
+    rows.append(dict(rows[2], id='99999', name='Zelda Quintanilla'))
+    write_rows(editable_database['artists'], fieldnames, rows)
+    version = data_version()
+    
+    report = sync_db()
+    
+    assert report['artists'] == {"inserted": 1, "updated": 1, "deleted": 1}
+    assert report['museums'] == {"unchanged": True}
+    names = artist_names()
+    assert names[f'ARTIST_{int(updated_id):06d}'] == 'Roberta Arnesonova'
+    assert f'ARTIST_{int(deleted_id):06d}' not in names
+    assert names['ARTIST_099999'] == 'Zelda Quintanilla'
+    assert data_version() > version
+    
+    # The candidate indexes were rebuilt from the synced rows
+    assert search_entities('Zelda Quintanilla', 3, 'person')[0]['id'] == 'ARTIST_099999'
+    assert search_entities('Roberta Arnesonova', 3, 'person')[0]['id'] == f'ARTIST_{int(updated_id):06d}'
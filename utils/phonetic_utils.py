@@ -0,0 +1,321 @@
+from typing import Tuple
+from utils.text_utils import fold_ascii
+
+VOWELS = frozenset('AEIOUY')
+
+# Letters that mark a Slavic or Germanic spelling, which changes a few of the rules below
+SLAVO_GERMANIC_MARKERS = ('W', 'K', 'CZ', 'WITZ')
+
+def double_metaphone(word: str, max_length: int = 4) -> Tuple[str, str]:
+    """Primary and alternate Double Metaphone codes of a single word
+
+    Follows Lawrence Philips' rules for the consonant clusters common in Western European
+    names (CH, GH, GN, PH, SCH, TH, ...). Diacritics are folded first, so Ç and Ñ code as
+    C and N. Changing a code here means bumping BLOCKING_KEYS_VERSION in blocking_service.
+    """
+    word = ''.join(ch for ch in fold_ascii(word).upper() if 'A' <= ch <= 'Z')
+    length = len(word)
+    primary = []
+    alternate = []
+
+    def add(main: str, other: str = None):
+        primary.append(main)
+        alternate.append(main if other is None else other)
+
+    def at(position: int, *options: str) -> bool:
+        return position >= 0 and any(word.startswith(option, position) for option in options)
+
+    def vowel(position: int) -> bool:
+        return 0 <= position < length and word[position] in VOWELS
+
+    slavo_germanic = any(marker in word for marker in SLAVO_GERMANIC_MARKERS)
+    germanic_start = at(0, 'VAN', 'VON', 'SCH')
+
+    i = 1 if at(0, 'GN', 'KN', 'PN', 'WR', 'PS') else 0
+    if at(0, 'X'):
+        add('S')
+        i = 1
+
+    while i < length and (len(''.join(primary)) < max_length or len(''.join(alternate)) < max_length):
+        ch = word[i]
+
+        if ch in VOWELS:
+            if i == 0:
+                add('A')
+            i += 1
+
+        elif ch == 'B':
+            add('P')
+            i += 2 if at(i + 1, 'B') else 1
+
+        elif ch == 'C':
+            if (i > 1 and not vowel(i - 2) and at(i - 1, 'ACH') and not at(i + 2, 'I')
+                    and (not at(i + 2, 'E') or at(i - 2, 'BACHER', 'MACHER'))):
+                # Germanic, e.g. 'bacher', 'macher'
+                add('K')
+                i += 2
+            elif i == 0 and at(i, 'CAESAR'):
+                add('S')
+                i += 2
+            elif at(i, 'CHIA'):
+                # Italian, e.g. 'chianti'
+                add('K')
+                i += 2
+            elif at(i, 'CH'):
+                if i > 0 and at(i, 'CHAE'):
+                    add('K', 'X')
+                elif i == 0 and at(i + 2, 'ARAC', 'ARIS', 'OR', 'YM', 'IA', 'EM') and not at(0, 'CHORE'):
+                    add('K')
+                elif (germanic_start or at(i - 2, 'ORCHES', 'ARCHIT', 'ORCHID') or at(i + 2, 'T', 'S')
+                      or ((i == 0 or at(i - 1, 'A', 'O', 'U', 'E'))
+                          and (i + 2 >= length or at(i + 2, 'L', 'R', 'N', 'M', 'B', 'H', 'F', 'V', 'W')))):
+                    add('K')
+                elif i > 0 and at(0, 'MC'):
+                    add('K')
+                elif i > 0:
+                    add('X', 'K')
+                else:
+                    add('X')
+                i += 2
+            elif at(i, 'CZ') and not at(i - 2, 'WICZ'):
+                add('S', 'X')
+                i += 2
+            elif at(i + 1, 'CIA'):
+                add('X')
+                i += 3
+            elif at(i, 'CC') and not (i == 1 and word[0] == 'M'):
+                if at(i + 2, 'I', 'E', 'H') and not at(i + 2, 'HU'):
+                    if (i == 1 and word[0] == 'A') or at(i - 1, 'UCCEE', 'UCCES'):
+                        add('KS')
+                    else:
+                        add('X')
+                    i += 3
+                else:
+                    add('K')
+                    i += 2
+            elif at(i, 'CK', 'CG', 'CQ'):
+                add('K')
+                i += 2
+            elif at(i, 'CIO', 'CIE', 'CIA'):
+                add('S', 'X')
+                i += 2
+            elif at(i, 'CI', 'CE', 'CY'):
+                add('S')
+                i += 2
+            else:
+                add('K')
+                i += 2 if at(i + 1, 'C', 'K', 'Q') and not at(i + 1, 'CE', 'CI') else 1
+
+        elif ch == 'D':
+            if at(i, 'DG'):
+                if at(i + 2, 'I', 'E', 'Y'):
+                    add('J')
+                    i += 3
+                else:
+                    add('TK')
+                    i += 2
+            else:
+                add('T')
+                i += 2 if at(i + 1, 'T', 'D') else 1
+
+        elif ch == 'G':
+            if at(i + 1, 'H'):
+                if i > 0 and not vowel(i - 1):
+                    add('K')
+                elif i == 0 and at(i + 2, 'I'):
+                    add('J')
+                elif i == 0:
+                    add('K')
+                elif at(i - 2, 'B', 'H', 'D') or at(i - 3, 'B', 'H', 'D') or at(i - 4, 'B', 'H'):
+                    pass
+                elif i > 2 and at(i - 1, 'U') and at(i - 3, 'C', 'G', 'L', 'R', 'T'):
+                    add('F')
+                elif word[i - 1] != 'I':
+                    add('K')
+                i += 2
+            elif at(i + 1, 'N'):
+                if i == 1 and vowel(0) and not slavo_germanic:
+                    add('KN', 'N')
+                elif not at(i + 2, 'EY') and not at(i + 1, 'Y') and not slavo_germanic:
+                    add('N', 'KN')
+                else:
+                    add('KN')
+                i += 2
+            elif at(i + 1, 'LI') and not slavo_germanic:
+                add('KL', 'L')
+                i += 2
+            elif i == 0 and (at(1, 'Y') or at(1, 'ES', 'EP', 'EB', 'EL', 'EY', 'IB', 'IL', 'IN', 'IE', 'EI', 'ER')):
+                add('K', 'J')
+                i += 2
+            elif ((at(i + 1, 'ER') or at(i + 1, 'Y')) and not at(0, 'DANGER', 'RANGER', 'MANGER')
+                  and not at(i - 1, 'E', 'I') and not at(i - 1, 'RGY', 'OGY')):
+                add('K', 'J')
+                i += 2
+            elif at(i + 1, 'E', 'I', 'Y') or at(i - 1, 'AGGI', 'OGGI'):
+                if germanic_start or at(i + 1, 'ET'):
+                    add('K')
+                elif at(i + 1, 'IER'):
+                    add('J')
+                else:
+                    add('J', 'K')
+                i += 2
+            else:
+                add('K')
+                i += 2 if at(i + 1, 'G') else 1
+
+        elif ch == 'H':
+            # Only sounded between vowels or at the start before a vowel
+            if (i == 0 or vowel(i - 1)) and vowel(i + 1):
+                add('H')
+                i += 2
+            else:
+                i += 1
+
+        elif ch == 'J':
+            if at(i, 'JOSE') and i == 0 and length == 4:
+                add('H')
+            elif at(i, 'JOSE'):
+                add('J', 'H')
+            elif i == 0:
+                add('J', 'A')
+            elif vowel(i - 1) and not slavo_germanic and at(i + 1, 'A', 'O'):
+                add('J', 'H')
+            elif i == length - 1:
+                add('J', '')
+            elif not at(i + 1, 'L', 'T', 'K', 'S', 'N', 'M', 'B', 'Z') and not at(i - 1, 'S', 'K', 'L'):
+                add('J')
+            i += 2 if at(i + 1, 'J') else 1
+
+        elif ch == 'L':
+            if at(i + 1, 'L'):
+                if ((i == length - 3 and at(i - 1, 'ILLO', 'ILLA', 'ALLE'))
+                        or ((at(length - 2, 'AS', 'OS') or at(length - 1, 'A', 'O')) and at(i - 1, 'ALLE'))):
+                    add('L', '')
+                else:
+                    add('L')
+                i += 2
+            else:
+                add('L')
+                i += 1
+
+        elif ch == 'M':
+            add('M')
+            i += 2 if (at(i - 1, 'UMB') and (i + 1 == length - 1 or at(i + 2, 'ER'))) or at(i + 1, 'M') else 1
+
+        elif ch == 'P':
+            if at(i + 1, 'H'):
+                add('F')
+                i += 2
+            else:
+                add('P')
+                i += 2 if at(i + 1, 'P', 'B') else 1
+
+        elif ch == 'R':
+            if i == length - 1 and not slavo_germanic and at(i - 2, 'IE') and not at(i - 4, 'ME', 'MA'):
+                add('', 'R')
+            else:
+                add('R')
+            i += 2 if at(i + 1, 'R') else 1
+
+        elif ch == 'S':
+            if at(i - 1, 'ISL', 'YSL'):
+                i += 1
+            elif i == 0 and at(i, 'SUGAR'):
+                add('X', 'S')
+                i += 1
+            elif at(i, 'SH'):
+                # Germanic compounds, e.g. 'holmsheim'
+                if at(i + 1, 'HEIM', 'HOEK', 'HOLM', 'HOLZ'):
+                    add('S')
+                else:
+                    add('X')
+                i += 2
+            elif at(i, 'SIO', 'SIA'):
+                if slavo_germanic:
+                    add('S')
+                else:
+                    add('S', 'X')
+                i += 3
+            elif (i == 0 and at(i + 1, 'M', 'N', 'L', 'W')) or at(i + 1, 'Z'):
+                add('S', 'X')
+                i += 2 if at(i + 1, 'Z') else 1
+            elif at(i, 'SC'):
+                if at(i + 2, 'H'):
+                    if at(i + 3, 'ER', 'EN'):
+                        add('X', 'SK')
+                    elif at(i + 3, 'OO', 'UY', 'ED', 'EM'):
+                        add('SK')
+                    elif i == 0 and not vowel(3) and not at(3, 'W'):
+                        add('X', 'S')
+                    else:
+                        add('X')
+                elif at(i + 2, 'I', 'E', 'Y'):
+                    add('S')
+                else:
+                    add('SK')
+                i += 3
+            else:
+                # French, e.g. 'resnais'
+                if i == length - 1 and at(i - 2, 'AI', 'OI'):
+                    add('', 'S')
+                else:
+                    add('S')
+                i += 2 if at(i + 1, 'S', 'Z') else 1
+
+        elif ch == 'T':
+            if at(i, 'TION', 'TIA', 'TCH'):
+                add('X')
+                i += 3
+            elif at(i, 'TH', 'TTH'):
+                # 'thomas', 'thames' and Germanic names keep a hard T
+                if at(i + 2, 'OM', 'AM') or germanic_start:
+                    add('T')
+                else:
+                    add('0', 'T')
+                i += 2
+            else:
+                add('T')
+                i += 2 if at(i + 1, 'T', 'D') else 1
+
+        elif ch == 'W':
+            if at(i, 'WR'):
+                add('R')
+                i += 2
+                continue
+            # An initial W codes as a vowel, and as F for 'Wasserman' matching 'Vasserman'
+            if i == 0 and vowel(1):
+                add('A', 'F')
+            elif i == 0 and at(i, 'WH'):
+                add('A')
+            if ((i == length - 1 and vowel(i - 1)) or at(i - 1, 'EWSKI', 'EWSKY', 'OWSKI', 'OWSKY')
+                    or at(0, 'SCH')):
+                add('', 'F')
+                i += 1
+            elif at(i, 'WICZ', 'WITZ'):
+                add('TS', 'FX')
+                i += 4
+            else:
+                i += 1
+
+        elif ch == 'X':
+            if not (i == length - 1 and (at(i - 3, 'IAU', 'EAU') or at(i - 2, 'AU', 'OU'))):
+                add('KS')
+            i += 2 if at(i + 1, 'C', 'X') else 1
+
+        elif ch == 'Z':
+            if at(i + 1, 'H'):
+                add('J')
+                i += 2
+            else:
+                if at(i + 1, 'ZO', 'ZI', 'ZA') or (slavo_germanic and i > 0 and word[i - 1] != 'T'):
+                    add('S', 'TS')
+                else:
+                    add('S')
+                i += 2 if at(i + 1, 'Z') else 1
+
+        else:
+            # F, K, N, Q and V code as themselves (V as F), doubled letters once
+            add({'V': 'F', 'Q': 'K'}.get(ch, ch))
+            i += 2 if at(i + 1, ch) else 1
+
+    return ''.join(primary)[:max_length], ''.join(alternate)[:max_length]
@@ -1,5 +1,6 @@
 import re
-import pandas as pd
+import math
+import unicodedata
 
 def normalize_text(text: str) -> str:
     """Normalize text for better matching"""
@@ -15,9 +16,35 @@ def normalize_text(text: str) -> str:
     text = re.sub(r'\s+', ' ', text).strip()
     return text
 
+def normalize_prefix(text: str) -> str:
+    """Normalize a type-ahead prefix like normalize_text, but keep the word still being typed
+
+    Only complete words lose their articles: a trailing "a", "an" or "the" is how "Andy" or
+    "Theodore" start, while "the mus" still finds names stored without the article.
+    """
+    text = str(text or '').lower().lstrip()
+    if not text or text[-1].isspace():
+        return normalize_text(text)
+    complete, _, last = text.rpartition(' ')
+    last = re.sub(r'[^\w\s]', ' ', last)
+    return re.sub(r'\s+', ' ', f"{normalize_text(complete)} {last}").strip()
+
+def fold_ascii(text: str) -> str:
+    """Strip diacritics so "Dürer" and "Durer" compare equal (characters without an ASCII base are dropped)"""
+    if not text:
+        return ""
+    decomposed = unicodedata.normalize('NFKD', str(text))
+    return decomposed.encode('ascii', 'ignore').decode('ascii')
+
+def is_missing(value) -> bool:
+    """None, an empty string or NaN (how pandas fills blank CSV cells)"""
+    if value is None or value == '':
+        return True
+    return isinstance(value, float) and math.isnan(value)
+
 def clean_float_value(value):
     """Clean and convert a value to float, return None if invalid"""
-    if value is None or value == '' or pd.isna(value):
+    if is_missing(value):
         return None
     try:
         return float(value)
@@ -26,7 +53,7 @@ def clean_float_value(value):
 
 def clean_numeric_value(value):
     """Clean and convert a value to integer, return None if invalid"""
-    if value is None or value == '' or pd.isna(value):
+    if is_missing(value):
         return None
     try:
         # Handle string values that might have commas or other formatting